@@ -0,0 +1,120 @@
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from config.database import criar_engines
+from models import Base, Parte, Processo
+from utils.upsert import upsert_processos
+
+TOTAL_PARTES = 200
+PROCESSOS_POR_PARTE = 100
+LEITORES = 8
+ESCRITORES = 2
+DURACAO_SEGUNDOS = 5
+
+
+def gerar(parte_idx: int, rodada: int):
+    return [
+        {
+            "numero_processo": f"{parte_idx:05d}{n:05d}-11.2024.8.13.0024",
+            "autor": f"AUTOR {parte_idx}",
+            "reu": f"RÉU {n}",
+            "assunto": "Contratos Bancários",
+            "ultimo_evento": f"Evento da rodada {rodada}" if n % 10 == rodada % 10 else "Distribuído",
+            "link_processo": f"https://eproc/{parte_idx}/{n}"
+        }
+        for n in range(PROCESSOS_POR_PARTE)
+    ]
+
+
+def preparar(escrita):
+    Base.metadata.create_all(escrita)
+    db = sessionmaker(bind=escrita)()
+    partes = [Parte(nome=f"PARTE {i}") for i in range(TOTAL_PARTES)]
+    db.add_all(partes)
+    db.commit()
+    parte_ids = [p.id for p in partes]
+    for idx, parte_id in enumerate(parte_ids):
+        upsert_processos(db, parte_id, gerar(idx, 0))
+        db.commit()
+    db.close()
+    return parte_ids
+
+
+def executar(descricao, escrita, leitura, parte_ids):
+    EscritaSession = sessionmaker(bind=escrita)
+    LeituraSession = sessionmaker(bind=leitura)
+    parar = threading.Event()
+    latencias_leitura = []
+    escritas = []
+    erros = []
+
+    def leitor():
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            db = LeituraSession()
+            try:
+                db.query(Processo).filter(Processo.parte_id == random.choice(parte_ids)).all()
+            except Exception as e:
+                erros.append(e)
+            finally:
+                db.close()
+            latencias_leitura.append(time.perf_counter() - inicio)
+
+    def escritor():
+        rodada = 1
+        while not parar.is_set():
+            idx = random.randrange(len(parte_ids))
+            db = EscritaSession()
+            try:
+                upsert_processos(db, parte_ids[idx], gerar(idx, rodada))
+                db.commit()
+                escritas.append(1)
+            except Exception as e:
+                db.rollback()
+                erros.append(e)
+            finally:
+                db.close()
+            rodada += 1
+
+    threads = [threading.Thread(target=leitor) for _ in range(LEITORES)]
+    threads += [threading.Thread(target=escritor) for _ in range(ESCRITORES)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURACAO_SEGUNDOS)
+    parar.set()
+    for thread in threads:
+        thread.join()
+
+    latencias = sorted(latencias_leitura)
+    p95 = latencias[int(len(latencias) * 0.95)] * 1000 if latencias else 0
+    print(
+        f"{descricao:<32} leituras/s {len(latencias) / DURACAO_SEGUNDOS:>8,.0f}  "
+        f"p50 {statistics.median(latencias) * 1000 if latencias else 0:>6.2f}ms  p95 {p95:>6.2f}ms  "
+        f"escritas/s {len(escritas) / DURACAO_SEGUNDOS:>6,.0f}  erros {len(erros)}"
+    )
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as diretorio:
+        url = f"sqlite:///{diretorio}/static.db"
+        static = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        parte_ids = preparar(static)
+        executar("StaticPool (conexão única)", static, static, parte_ids)
+        static.dispose()
+
+        escrita, leitura = criar_engines(f"sqlite:///{diretorio}/perfil.db")
+        parte_ids = preparar(escrita)
+        executar("WAL, 1 escritor + leitores", escrita, leitura, parte_ids)
+        escrita.dispose()
+        leitura.dispose()
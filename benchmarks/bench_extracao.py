@@ -0,0 +1,43 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.eproc_parser import extrair_processos
+
+LINHA = """
+      <tr class="infraTrClara">
+        <td><a href="externo_controlador.php?acao=processo_seleciona_publica&amp;num_processo={n:020d}">{n:07d}-11.2024.8.13.0024</a></td>
+        <td>AUTOR {n}</td>
+        <td>RÉU {n}</td>
+        <td>Contratos Bancários</td>
+        <td>Conclusos para decisão<br>12/03/2024 10:15</td>
+      </tr>"""
+
+
+def gerar_tabela(linhas: int) -> str:
+    corpo = "".join(LINHA.format(n=n) for n in range(linhas))
+    return (
+        '<div id="divInfraAreaTabela"><table class="infraTable">'
+        "<tr><th>Número</th><th>Autor</th><th>Réu</th><th>Assunto</th><th>Último Evento</th></tr>"
+        f"{corpo}</table></div>"
+    )
+
+
+def medir(linhas: int, repeticoes: int) -> float:
+    html = gerar_tabela(linhas)
+    assert len(extrair_processos(html)) == linhas
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        extrair_processos(html)
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+if __name__ == "__main__":
+    print(f"{'linhas':>8} {'bytes':>10} {'parse (ms)':>12} {'µs/linha':>10} {'round trips':>12}")
+    for linhas, repeticoes in ((10, 500), (100, 100), (1000, 10)):
+        tempo = medir(linhas, repeticoes)
+        tamanho = len(gerar_tabela(linhas).encode("utf-8"))
+        print(f"{linhas:>8} {tamanho:>10} {tempo * 1000:>12.3f} {tempo / linhas * 1e6:>10.2f} {1:>12}")
@@ -0,0 +1,63 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.orm import sessionmaker
+
+from config.database import criar_engines
+from models import Base, Parte, Processo
+from utils.paginacao import paginar
+from utils.upsert import upsert_processos
+
+TAMANHOS = (10, 1_000, 100_000)
+LIMITE = 50
+REPETICOES = 200
+
+
+def gerar(parte_idx: int, total: int):
+    return [
+        {
+            "numero_processo": f"{parte_idx:03d}{n:07d}-11.2024.8.13.0024",
+            "autor": f"AUTOR {parte_idx}",
+            "reu": f"RÉU {n}",
+            "assunto": "Contratos Bancários",
+            "ultimo_evento": "Distribuído",
+            "link_processo": f"https://eproc/{parte_idx}/{n}"
+        }
+        for n in range(total)
+    ]
+
+
+def medir_pagina(db, parte_id: int, cursor=None):
+    query = db.query(Processo).filter(Processo.parte_id == parte_id)
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        pagina = paginar(query, [Processo.atualizado_em, Processo.id], cursor, LIMITE)
+    return (time.perf_counter() - inicio) / REPETICOES * 1000, pagina
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as diretorio:
+        escrita, leitura = criar_engines(f"sqlite:///{diretorio}/paginacao.db")
+        Base.metadata.create_all(escrita)
+
+        db = sessionmaker(bind=escrita)()
+        partes = [Parte(nome=f"PARTE {total}") for total in TAMANHOS]
+        db.add_all(partes)
+        db.commit()
+        for idx, (parte, total) in enumerate(zip(partes, TAMANHOS)):
+            upsert_processos(db, parte.id, gerar(idx, total))
+            db.commit()
+        parte_ids = [parte.id for parte in partes]
+        db.close()
+
+        db = sessionmaker(bind=leitura)()
+        print(f"{'processos na parte':>20} {'1ª página':>12} {'página seguinte':>16}")
+        for parte_id, total in zip(parte_ids, TAMANHOS):
+            primeira, pagina = medir_pagina(db, parte_id)
+            seguinte, _ = medir_pagina(db, parte_id, pagina.proximo_cursor) if pagina.proximo_cursor else (0.0, None)
+            print(f"{total:>20,} {primeira:>10.2f}ms {seguinte:>14.2f}ms")
+        db.close()
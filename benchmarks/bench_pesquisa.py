@@ -0,0 +1,105 @@
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from models import Base
+from utils.pesquisa import pesquisar_processos
+
+TOTAL_PROCESSOS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+PROCESSOS_POR_PARTE = 100
+LOTE = 10_000
+REPETICOES = 20
+
+ASSUNTOS = [
+    "Indenização por Dano Moral", "Contratos Bancários", "Execução Fiscal", "IPTU",
+    "Rescisão do Contrato e Devolução do Dinheiro", "Usucapião Extraordinária", "Alimentos",
+    "Guarda de Família", "Acidente de Trânsito", "Cobrança de Aluguéis", "Despejo por Falta de Pagamento",
+    "Inventário e Partilha", "Obrigação de Fazer", "Fornecimento de Medicamentos",
+]
+EVENTOS = [
+    "Conclusos para decisão", "Audiência de conciliação designada", "Sentença com resolução de mérito",
+    "Juntada de petição", "Expedição de mandado", "Remessa ao Tribunal de Justiça", "Distribuído",
+    "Publicação no Diário da Justiça Eletrônico", "Trânsito em julgado", "Citação realizada",
+]
+NOMES = ["MARIA", "JOSÉ", "JOÃO", "ANA", "ANTÔNIO", "FRANCISCO", "CONCEIÇÃO", "SEBASTIÃO", "LÚCIA", "PAULO"]
+SOBRENOMES = ["SILVA", "SANTOS", "OLIVEIRA", "SOUZA", "PEREIRA", "COSTA", "RODRIGUES", "ALMEIDA", "GONÇALVES"]
+CONSULTAS = ["usucapiao", "conciliacao designada", "medicamentos", "sebastiao goncalves", "despejo pagamento"]
+
+
+def nome(rng):
+    return f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+
+
+def popular(engine):
+    rng = random.Random(42)
+    agora = datetime.utcnow()
+    total_partes = TOTAL_PROCESSOS // PROCESSOS_POR_PARTE
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO partes (id, nome) VALUES (:id, :nome)"),
+            [{"id": i + 1, "nome": f"{nome(rng)} {i}"} for i in range(total_partes)]
+        )
+
+    inserir = text(
+        "INSERT INTO processos (numero_processo, autor, reu, assunto, ultimo_evento, parte_id, criado_em, atualizado_em) "
+        "VALUES (:numero, :autor, :reu, :assunto, :evento, :parte_id, :agora, :agora)"
+    )
+    for inicio in range(0, TOTAL_PROCESSOS, LOTE):
+        with engine.begin() as conn:
+            conn.execute(inserir, [
+                {
+                    "numero": f"{n:07d}-11.2024.8.13.0024",
+                    "autor": nome(rng),
+                    "reu": nome(rng),
+                    "assunto": rng.choice(ASSUNTOS),
+                    "evento": rng.choice(EVENTOS),
+                    "parte_id": n // PROCESSOS_POR_PARTE + 1,
+                    "agora": agora
+                }
+                for n in range(inicio, min(inicio + LOTE, TOTAL_PROCESSOS))
+            ])
+
+
+def cronometrar(fn):
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        resultado = fn()
+    return (time.perf_counter() - inicio) / REPETICOES * 1000, resultado
+
+
+def like(db, consulta):
+    condicoes = " AND ".join(
+        f"(assunto LIKE :t{i} OR ultimo_evento LIKE :t{i} OR autor LIKE :t{i} OR reu LIKE :t{i})"
+        for i in range(len(consulta.split()))
+    )
+    return db.execute(
+        text(f"SELECT id FROM processos WHERE {condicoes} LIMIT 20"),
+        {f"t{i}": f"%{termo}%" for i, termo in enumerate(consulta.split())}
+    ).all()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as diretorio:
+        engine = create_engine(f"sqlite:///{diretorio}/pesquisa.db")
+        Base.metadata.create_all(engine)
+
+        inicio = time.perf_counter()
+        popular(engine)
+        print(f"{TOTAL_PROCESSOS:,} processos inseridos com índice FTS5 em {time.perf_counter() - inicio:.1f}s")
+
+        db = sessionmaker(bind=engine)()
+        print(f"{'consulta':<26} {'LIKE (sem acento)':>18} {'FTS5 + bm25':>14} {'resultados':>11}")
+        for consulta in CONSULTAS:
+            tempo_like, linhas_like = cronometrar(lambda: like(db, consulta))
+            tempo_fts, linhas_fts = cronometrar(lambda: pesquisar_processos(db, consulta, limite=20))
+            print(f"{consulta:<26} {tempo_like:>16.2f}ms {tempo_fts:>12.2f}ms {len(linhas_fts):>5} / {len(linhas_like)}")
+        db.close()
@@ -0,0 +1,99 @@
+import gzip
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+DIRETORIO = tempfile.mkdtemp(prefix="bench-serializacao-")
+os.environ["DATABASE_URL"] = f"sqlite:///{DIRETORIO}/serializacao.db"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import text
+
+from config.database import SessionLocal, engine
+from models import Base, Busca, Parte
+from routes.processos import _formatar_resposta
+from schemas import ConsultaProcessosSchema
+from utils.cache import consultar_cache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TOTAL = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+REPETICOES = 5
+NIVEIS_GZIP = (1, 6, 9)
+
+
+def popular(total: int):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    agora = datetime.utcnow()
+    parte = Parte(nome="PARTE", ultima_coleta_em=agora)
+    db.add(parte)
+    db.flush()
+    db.execute(
+        text(
+            "INSERT INTO processos (numero_processo, autor, reu, assunto, ultimo_evento, link_processo, "
+            "parte_id, criado_em, atualizado_em) VALUES (:numero, 'AUTOR DA SILVA', 'BANCO DO BRASIL S/A', "
+            "'Contratos Bancários', 'Conclusos para decisão', :link, :parte_id, :agora, :agora)"
+        ),
+        [{"numero": f"{n:07d}-11.2024.8.13.0024", "parte_id": parte.id, "agora": agora,
+          "link": f"https://eproc1g.tjmg.jus.br/eproc/controlador.php?acao=processo_selecionar&num_processo={n}"}
+         for n in range(total)]
+    )
+    busca = Busca(nome="PARTE", status=Busca.CONCLUIDA, finalizado_em=agora)
+    busca.resultados = [{"nome_parte": "PARTE", "cpf_cnpj": "", "link": None, "processos": []}]
+    db.add(busca)
+    db.commit()
+    db.close()
+
+
+def carregar():
+    db = SessionLocal()
+    cache = consultar_cache(db, "PARTE")
+    db.close()
+    return _formatar_resposta("PARTE", cache.resultados)
+
+
+def medir(funcao):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000, resultado
+
+
+if __name__ == "__main__":
+    popular(TOTAL)
+    corpo = carregar()
+
+    variantes = (
+        ("jsonable_encoder + json (antes)", lambda: JSONResponse(jsonable_encoder(corpo)).body),
+        ("response_model + orjson", lambda: ORJSONResponse(
+            ConsultaProcessosSchema.model_validate(corpo).model_dump(mode="json")
+        ).body),
+        ("ORJSONResponse direto", lambda: ORJSONResponse(corpo).body),
+    )
+
+    print(f"Serialização de {TOTAL:,} processos")
+    for descricao, funcao in variantes:
+        ms, bruto = medir(funcao)
+        print(f"  {descricao:<34} {ms:>8.1f}ms  {len(bruto) / 1024:>8,.0f} KiB")
+
+    print("Bytes na rede")
+    print(f"  {'sem compressão':<34} {'':>8}    {len(bruto) / 1024:>8,.0f} KiB")
+    for nivel in NIVEIS_GZIP:
+        ms, comprimido = medir(lambda: gzip.compress(bruto, compresslevel=nivel))
+        print(f"  {f'gzip nível {nivel}':<34} {ms:>8.1f}ms  {len(comprimido) / 1024:>8,.0f} KiB")
+    if brotli is not None:
+        ms, comprimido = medir(lambda: brotli.compress(bruto, quality=4))
+        print(f"  {'brotli qualidade 4':<34} {ms:>8.1f}ms  {len(comprimido) / 1024:>8,.0f} KiB")
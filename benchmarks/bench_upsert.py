@@ -0,0 +1,76 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Parte, Processo
+from utils.upsert import upsert_processos
+
+TOTAL_PROCESSOS = 100_000
+PROCESSOS_POR_PARTE = 100
+
+
+def gerar(parte_idx: int, rodada: int = 0):
+    return [
+        {
+            "numero_processo": f"{parte_idx:05d}{n:05d}-11.2024.8.13.0024",
+            "autor": f"AUTOR {parte_idx}",
+            "reu": f"RÉU {n}",
+            "assunto": "Contratos Bancários",
+            "ultimo_evento": f"Evento da rodada {rodada}" if n % 10 == 0 else "Distribuído",
+            "link_processo": f"https://eproc/{parte_idx}/{n}"
+        }
+        for n in range(PROCESSOS_POR_PARTE)
+    ]
+
+
+def preparar(diretorio: str, nome: str):
+    engine = create_engine(f"sqlite:///{diretorio}/{nome}.db")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    partes = [Parte(nome=f"PARTE {i}") for i in range(TOTAL_PROCESSOS // PROCESSOS_POR_PARTE)]
+    db.add_all(partes)
+    db.commit()
+    return db, [p.id for p in partes]
+
+
+def orm_por_objeto(db, parte_ids):
+    for idx, parte_id in enumerate(parte_ids):
+        for dados in gerar(idx):
+            db.add(Processo(parte_id=parte_id, **dados))
+        db.commit()
+
+
+def upsert_em_lote(db, parte_ids, rodada=0):
+    afetados = 0
+    for idx, parte_id in enumerate(parte_ids):
+        afetados += upsert_processos(db, parte_id, gerar(idx, rodada)).escritos
+        db.commit()
+    return afetados
+
+
+def cronometrar(descricao, fn, *args):
+    inicio = time.perf_counter()
+    resultado = fn(*args)
+    duracao = time.perf_counter() - inicio
+    print(f"{descricao:<42} {duracao:>8.2f}s {TOTAL_PROCESSOS / duracao:>12,.0f} proc/s  linhas escritas: {resultado}")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as diretorio:
+        db, parte_ids = preparar(diretorio, "orm")
+        cronometrar("ORM, um objeto por processo (carga)", orm_por_objeto, db, parte_ids)
+        db.close()
+
+        db, parte_ids = preparar(diretorio, "upsert")
+        cronometrar("Upsert em lote (carga)", upsert_em_lote, db, parte_ids)
+        cronometrar("Upsert em lote (reconsulta sem mudanças)", upsert_em_lote, db, parte_ids)
+        cronometrar("Upsert em lote (10% alterados)", upsert_em_lote, db, parte_ids, 1)
+        print(f"Total de linhas após 3 rodadas: {db.query(Processo).count()}")
+        db.close()
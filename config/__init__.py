@@ -1,3 +1,3 @@
-from config.database import engine, SessionLocal, get_db, init_db
+from config.database import engine, read_engine, SessionLocal, ReadSessionLocal, get_db, get_read_db, init_db
 
-__all__ = ["engine", "SessionLocal", "get_db", "init_db"]
+__all__ = ["engine", "read_engine", "SessionLocal", "ReadSessionLocal", "get_db", "get_read_db", "init_db"]
@@ -1,23 +1,95 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
+from typing import Tuple
+import logging
 import os
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 DATABASE_DIR = Path("data")
 DATABASE_DIR.mkdir(exist_ok=True)
 
 DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
+    "DATABASE_URL",
     f"sqlite:///{DATABASE_DIR}/eproc.db"
 )
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    poolclass=StaticPool if "sqlite" in DATABASE_URL else None,
-    echo=False
-)
+SQLITE_LEITORES = int(os.getenv("SQLITE_LEITORES", "4"))
+SQLITE_CACHE_KB = int(os.getenv("SQLITE_CACHE_KB", "65536"))
+SQLITE_MMAP_BYTES = int(os.getenv("SQLITE_MMAP_BYTES", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_ESCRITA_TIMEOUT = float(os.getenv("SQLITE_ESCRITA_TIMEOUT", "30"))
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+
+def _aplicar_pragmas(engine: Engine, somente_leitura: bool = False):
+    @event.listens_for(engine, "connect")
+    def _ao_conectar(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_BYTES}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        if somente_leitura:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def criar_engines(url: str = DATABASE_URL) -> Tuple[Engine, Engine]:
+    if not url.startswith("sqlite"):
+        engine = create_engine(
+            url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_pre_ping=DB_POOL_PRE_PING,
+            pool_recycle=DB_POOL_RECYCLE,
+            echo=False
+        )
+        return engine, engine
+
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            echo=False
+        )
+        return engine, engine
+
+    escrita = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=SQLITE_ESCRITA_TIMEOUT,
+        echo=False
+    )
+    _aplicar_pragmas(escrita)
+
+    leitura = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=SQLITE_LEITORES,
+        max_overflow=0,
+        pool_timeout=SQLITE_ESCRITA_TIMEOUT,
+        echo=False
+    )
+    _aplicar_pragmas(leitura, somente_leitura=True)
+
+    return escrita, leitura
+
+
+engine, read_engine = criar_engines(DATABASE_URL)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -25,6 +97,12 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine
+)
+
 
 def get_db():
     db = SessionLocal()
@@ -34,18 +112,28 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def init_db():
     from models.base import Base
-    
-    print("🔧 Criando tabelas no banco de dados...")
+    from config.migrations import aplicar_migracoes
+
+    logger.info("Criando tabelas no banco de dados")
     Base.metadata.create_all(bind=engine)
-    print("✅ Banco de dados inicializado!")
-    
+    aplicar_migracoes(engine)
+    logger.info("Banco de dados inicializado")
+
     from sqlalchemy import inspect
     inspector = inspect(engine)
     tables = inspector.get_table_names()
-    
+
     if tables:
-        print(f"📊 Tabelas criadas: {', '.join(tables)}")
+        logger.info("Tabelas: %s", ", ".join(tables))
     else:
-        print("⚠️ Nenhuma tabela foi criada!")
\ No newline at end of file
+        logger.warning("Nenhuma tabela foi criada")
\ No newline at end of file
@@ -0,0 +1,161 @@
+import logging
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+
+def _adicionar_coluna(conn: Connection, tabela: str, coluna: str, tipo: str):
+    colunas = {c["name"] for c in inspect(conn).get_columns(tabela)}
+    if coluna not in colunas:
+        conn.execute(text(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}"))
+
+
+def _parte_ultima_coleta(conn: Connection):
+    _adicionar_coluna(conn, "partes", "ultima_coleta_em", "TIMESTAMP")
+
+
+def _processos_unicos_por_parte(conn: Connection):
+    removidos = conn.execute(text(
+        "DELETE FROM processos WHERE id NOT IN ("
+        "SELECT MAX(id) FROM processos GROUP BY parte_id, numero_processo)"
+    )).rowcount
+    if removidos:
+        logger.info("%d processo(s) duplicado(s) removido(s)", removidos)
+
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_processos_parte_numero "
+        "ON processos (parte_id, numero_processo)"
+    ))
+
+
+def _processo_hash_conteudo(conn: Connection):
+    from models.processo import Processo
+
+    _adicionar_coluna(conn, "processos", "hash_conteudo", "VARCHAR(16)")
+
+    colunas = ", ".join(Processo.CAMPOS_COLETADOS)
+    linhas = conn.execute(text(
+        f"SELECT id, {colunas} FROM processos WHERE hash_conteudo IS NULL"
+    )).mappings().all()
+
+    if linhas:
+        conn.execute(
+            text("UPDATE processos SET hash_conteudo = :hash WHERE id = :id"),
+            [{"id": linha["id"], "hash": Processo.calcular_hash(linha)} for linha in linhas]
+        )
+
+
+INDICES_PAGINACAO = {
+    "ix_processos_parte_atualizado": "processos (parte_id, atualizado_em, id)",
+    "ix_processos_numero_atualizado": "processos (numero_processo, atualizado_em, id)",
+    "ix_processos_assunto_atualizado": "processos (assunto, atualizado_em, id)",
+    "ix_processos_atualizado": "processos (atualizado_em, id)",
+}
+
+
+def _indices_paginacao(conn: Connection):
+    for nome, definicao in INDICES_PAGINACAO.items():
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {nome} ON {definicao}"))
+
+
+def _indices_textuais(conn: Connection):
+    from models.indice_textual import criar_indices_textuais
+
+    criar_indices_textuais(conn, reconstruir=True, indices=("processos_fts", "partes_fts"))
+
+
+def _chaves_normalizadas(conn: Connection):
+    from utils.normalizacao import chave_nome
+
+    for tabela, origem, destino in (("partes", "nome", "nome_normalizado"), ("buscas", "nome", "chave")):
+        if not inspect(conn).has_table(tabela):
+            continue
+
+        _adicionar_coluna(conn, tabela, destino, "VARCHAR")
+        linhas = conn.execute(text(f"SELECT id, {origem} FROM {tabela} WHERE {destino} IS NULL")).all()
+        if linhas:
+            conn.execute(
+                text(f"UPDATE {tabela} SET {destino} = :chave WHERE id = :id"),
+                [{"id": linha.id, "chave": chave_nome(linha[1])} for linha in linhas]
+            )
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{tabela}_{destino} ON {tabela} ({destino})"))
+
+
+def _indice_trigrama(conn: Connection):
+    from models.indice_textual import criar_indices_textuais
+
+    criar_indices_textuais(conn, reconstruir=True, indices=("partes_trigrama",))
+
+
+def _processo_atualizado_em_obrigatorio(conn: Connection):
+    conn.execute(text(
+        "UPDATE processos SET atualizado_em = COALESCE(criado_em, CURRENT_TIMESTAMP) "
+        "WHERE atualizado_em IS NULL"
+    ))
+
+    if conn.dialect.name != "sqlite":
+        conn.execute(text("ALTER TABLE processos ALTER COLUMN atualizado_em SET NOT NULL"))
+        return
+
+    for evento in ("INSERT", "UPDATE OF atualizado_em"):
+        nome = evento.split()[0].lower()
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS processos_atualizado_em_{nome} BEFORE {evento} ON processos "
+            "WHEN new.atualizado_em IS NULL "
+            "BEGIN SELECT RAISE(ABORT, 'NOT NULL constraint failed: processos.atualizado_em'); END"
+        ))
+
+
+def _resultados_das_buscas_em_partes(conn: Connection):
+    inspetor = inspect(conn)
+    if not (inspetor.has_table("buscas") and inspetor.has_table("buscas_partes")):
+        return
+
+    conn.execute(text(
+        "UPDATE buscas SET resultado = NULL WHERE resultado IS NOT NULL "
+        "AND EXISTS (SELECT 1 FROM buscas_partes p WHERE p.busca_id = buscas.id) "
+        "AND NOT EXISTS (SELECT 1 FROM buscas_partes p WHERE p.busca_id = buscas.id AND p.resultado IS NULL)"
+    ))
+
+
+MIGRACOES: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "partes.ultima_coleta_em", _parte_ultima_coleta),
+    (2, "processos únicos por (parte_id, numero_processo)", _processos_unicos_por_parte),
+    (3, "processos.hash_conteudo", _processo_hash_conteudo),
+    (4, "índices de paginação de processos", _indices_paginacao),
+    (5, "índices FTS5 de processos e partes", _indices_textuais),
+    (6, "partes.nome_normalizado e buscas.chave", _chaves_normalizadas),
+    (7, "índice trigrama de partes.nome_normalizado", _indice_trigrama),
+    (8, "processos.atualizado_em obrigatório", _processo_atualizado_em_obrigatorio),
+    (9, "resultados das buscas só em buscas_partes", _resultados_das_buscas_em_partes),
+]
+
+
+def aplicar_migracoes(engine: Engine) -> List[int]:
+    aplicadas = []
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migracoes ("
+            "versao INTEGER PRIMARY KEY, descricao VARCHAR NOT NULL, aplicada_em TIMESTAMP NOT NULL)"
+        ))
+        existentes = {row[0] for row in conn.execute(text("SELECT versao FROM schema_migracoes"))}
+
+    for versao, descricao, migrar in MIGRACOES:
+        if versao in existentes:
+            continue
+
+        with engine.begin() as conn:
+            migrar(conn)
+            conn.execute(
+                text("INSERT INTO schema_migracoes (versao, descricao, aplicada_em) VALUES (:v, :d, :a)"),
+                {"v": versao, "d": descricao, "a": datetime.utcnow()}
+            )
+        aplicadas.append(versao)
+        logger.info("Migração %s aplicada: %s", versao, descricao)
+
+    return aplicadas
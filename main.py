@@ -1,29 +1,56 @@
-from fastapi import FastAPI
+import logging
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from config.database import init_db
+from utils.arquivo_bruto import start_arquivo_bruto, stop_arquivo_bruto
+from utils.compressao import CompressaoMiddleware
+from utils.driver_pool import init_driver_pool, close_driver_pool
+from utils.job_queue import start_job_queue, stop_job_queue
+from utils.logs import RequestIdMiddleware, configurar_logs
+from utils.metricas import MetricasMiddleware
+from utils.monitoramento import start_agendador, stop_agendador
+from utils.paginacao import CursorInvalidoError
+from utils.respostas import RespostaJSON
 
 from routes.processos import router as processos_router
 from routes.health import router as health_router
+from routes.buscas import router as buscas_router
+from routes.partes import router as partes_router
+from routes.pesquisa import router as pesquisa_router
+from routes.metricas import router as metricas_router
+from routes.monitorados import router as monitorados_router
+
+configurar_logs()
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("🚀 Iniciando EPROC Scraper API...")
+    logger.info("Iniciando EPROC Scraper API")
     
     init_db()
+    init_driver_pool()
+    start_arquivo_bruto()
+    start_job_queue()
+    start_agendador()
     
-    print("📊 Models carregados: Parte, Processo")
-    print("📝 Documentação: http://localhost:8000/docs")
+    logger.info("Documentação em http://localhost:8000/docs, métricas em /metrics")
     
     yield
     
-    print("👋 Encerrando EPROC Scraper API...")
+    logger.info("Encerrando EPROC Scraper API")
+    stop_agendador()
+    stop_job_queue()
+    stop_arquivo_bruto()
+    close_driver_pool()
 
 app = FastAPI(
     title="EPROC Scraper - TJMG",
     description="API para consulta de processos judiciais do TJMG",
     version="1.0.0",
+    default_response_class=RespostaJSON,
     lifespan=lifespan
 )
 
@@ -35,8 +62,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressaoMiddleware)
+app.add_middleware(MetricasMiddleware)
+app.add_middleware(RequestIdMiddleware)
+
+
+@app.exception_handler(CursorInvalidoError)
+async def cursor_invalido_handler(request: Request, exc: CursorInvalidoError):
+    return RespostaJSON(status_code=400, content={"detail": str(exc)})
+
+
 app.include_router(health_router)
 app.include_router(processos_router)
+app.include_router(buscas_router)
+app.include_router(partes_router)
+app.include_router(pesquisa_router)
+app.include_router(monitorados_router)
+app.include_router(metricas_router)
 
 if __name__ == "__main__":
     import uvicorn
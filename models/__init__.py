@@ -1,5 +1,11 @@
 from models.base import Base
 from models.parte import Parte
 from models.processo import Processo
+from models.busca import Busca
+from models.busca_parte import BuscaParte
+from models.lease import Lease
+from models.limite_taxa import LimiteTaxa
+from models.monitorado import Monitorado, Verificacao
+from models.indice_textual import criar_indices_textuais
 
-__all__ = ["Base", "Parte", "Processo"]
\ No newline at end of file
+__all__ = ["Base", "Parte", "Processo", "Busca", "BuscaParte", "Lease", "LimiteTaxa", "Monitorado", "Verificacao", "criar_indices_textuais"]
@@ -0,0 +1,84 @@
+import orjson
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.orm import relationship, validates
+from datetime import datetime
+from models import Base
+from utils.normalizacao import chave_nome
+
+
+class Busca(Base):
+    __tablename__ = "buscas"
+
+    PENDENTE = "pendente"
+    EXECUTANDO = "executando"
+    CONCLUIDA = "concluida"
+    FALHOU = "falhou"
+    FINALIZADOS = (CONCLUIDA, FALHOU)
+
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String, index=True, nullable=False)
+    chave = Column(String, index=True)
+    status = Column(String, index=True, nullable=False, default=PENDENTE)
+    total_partes = Column(Integer)
+    partes_concluidas = Column(Integer, nullable=False, default=0)
+    resultado = Column(Text)
+    erro = Column(Text)
+
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+    iniciado_em = Column(DateTime)
+    finalizado_em = Column(DateTime)
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    partes = relationship(
+        "BuscaParte",
+        back_populates="busca",
+        cascade="all, delete-orphan",
+        order_by="BuscaParte.ordem",
+        lazy="dynamic"
+    )
+
+    @validates("nome")
+    def _normalizar_nome(self, chave, nome):
+        self.chave = chave_nome(nome)
+        return nome
+
+    def __repr__(self):
+        return f"<Busca(id={self.id}, nome='{self.nome}', status='{self.status}')>"
+
+    @property
+    def resultados(self):
+        if self.resultado:
+            return orjson.loads(self.resultado)
+        return [
+            {"ordem": parte.ordem, **parte.resultado_coletado}
+            for parte in self.partes
+            if parte.resultado
+        ]
+
+    @resultados.setter
+    def resultados(self, valor):
+        self.resultado = orjson.dumps(valor).decode("utf-8")
+
+    def total_alteracoes(self, resultados=None):
+        totais = {"inseridos": 0, "atualizados": 0, "inalterados": 0}
+        for resultado in self.resultados if resultados is None else resultados:
+            alteracoes = resultado.get("alteracoes") or {}
+            for chave in totais:
+                totais[chave] += alteracoes.get(chave, 0)
+        return totais
+
+    def to_dict(self):
+        resultados = self.resultados
+        return {
+            "id": self.id,
+            "nome": self.nome,
+            "status": self.status,
+            "total_partes": self.total_partes,
+            "partes_concluidas": self.partes_concluidas,
+            "erro": self.erro,
+            "alteracoes": self.total_alteracoes(resultados),
+            "resultados": resultados,
+            "criado_em": self.criado_em,
+            "iniciado_em": self.iniciado_em,
+            "finalizado_em": self.finalizado_em
+        }
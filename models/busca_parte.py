@@ -0,0 +1,55 @@
+import orjson
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from models import Base
+
+
+class BuscaParte(Base):
+    __tablename__ = "buscas_partes"
+    __table_args__ = (
+        UniqueConstraint("busca_id", "ordem", name="uq_buscas_partes_ordem"),
+    )
+
+    PENDENTE = "pendente"
+    CONCLUIDA = "concluida"
+    FALHOU = "falhou"
+
+    id = Column(Integer, primary_key=True, index=True)
+    busca_id = Column(Integer, ForeignKey("buscas.id", ondelete="CASCADE"), index=True, nullable=False)
+    ordem = Column(Integer, nullable=False)
+    nome = Column(String, nullable=False)
+    cpf_cnpj = Column(String)
+    link = Column(Text)
+    status = Column(String, nullable=False, default=PENDENTE)
+    tentativas = Column(Integer, nullable=False, default=0)
+    erro = Column(Text)
+    resultado = Column(Text)
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    busca = relationship("Busca", back_populates="partes")
+
+    def __repr__(self):
+        return f"<BuscaParte(busca_id={self.busca_id}, ordem={self.ordem}, status='{self.status}')>"
+
+    @property
+    def resultado_coletado(self):
+        return orjson.loads(self.resultado) if self.resultado else None
+
+    @resultado_coletado.setter
+    def resultado_coletado(self, valor):
+        self.resultado = orjson.dumps(valor).decode("utf-8") if valor is not None else None
+
+    def info(self):
+        return {"nome": self.nome, "cpf_cnpj": self.cpf_cnpj or "", "link": self.link}
+
+    def to_dict(self):
+        return {
+            "ordem": self.ordem,
+            "nome": self.nome,
+            "cpf_cnpj": self.cpf_cnpj,
+            "status": self.status,
+            "tentativas": self.tentativas,
+            "erro": self.erro,
+            "atualizado_em": self.atualizado_em
+        }
@@ -0,0 +1,80 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection
+
+from models.base import Base
+
+TOKENIZADOR = "unicode61 remove_diacritics 2"
+TOKENIZADOR_TRIGRAMA = "trigram"
+
+INDICES_TEXTUAIS: Dict[str, Tuple[str, Tuple[str, ...], str]] = {
+    "processos_fts": ("processos", ("autor", "reu", "assunto", "ultimo_evento"), TOKENIZADOR),
+    "partes_fts": ("partes", ("nome",), TOKENIZADOR),
+    "partes_trigrama": ("partes", ("nome_normalizado",), TOKENIZADOR_TRIGRAMA),
+}
+
+
+def _ddl(indice: str, tabela: str, colunas: Tuple[str, ...], tokenizador: str):
+    lista = ", ".join(colunas)
+    novos = ", ".join(f"new.{c}" for c in colunas)
+    antigos = ", ".join(f"old.{c}" for c in colunas)
+
+    yield (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {indice} USING fts5("
+        f"{lista}, content='{tabela}', content_rowid='id', tokenize='{tokenizador}')"
+    )
+    yield (
+        f"CREATE TRIGGER IF NOT EXISTS {indice}_ai AFTER INSERT ON {tabela} BEGIN "
+        f"INSERT INTO {indice}(rowid, {lista}) VALUES (new.id, {novos}); END"
+    )
+    yield (
+        f"CREATE TRIGGER IF NOT EXISTS {indice}_ad AFTER DELETE ON {tabela} BEGIN "
+        f"INSERT INTO {indice}({indice}, rowid, {lista}) VALUES ('delete', old.id, {antigos}); END"
+    )
+    yield (
+        f"CREATE TRIGGER IF NOT EXISTS {indice}_au AFTER UPDATE OF {lista} ON {tabela} BEGIN "
+        f"INSERT INTO {indice}({indice}, rowid, {lista}) VALUES ('delete', old.id, {antigos}); "
+        f"INSERT INTO {indice}(rowid, {lista}) VALUES (new.id, {novos}); END"
+    )
+
+
+def suportado(conn: Connection) -> bool:
+    return conn.dialect.name == "sqlite"
+
+
+def _colunas_existem(conn: Connection, tabela: str, colunas: Tuple[str, ...]) -> bool:
+    existentes = {c["name"] for c in inspect(conn).get_columns(tabela)}
+    return set(colunas) <= existentes
+
+
+def criar_indices_textuais(conn: Connection, reconstruir: bool = False, indices: Optional[Iterable[str]] = None):
+    if not suportado(conn):
+        return
+
+    for indice in indices or INDICES_TEXTUAIS:
+        tabela, colunas, tokenizador = INDICES_TEXTUAIS[indice]
+        if not _colunas_existem(conn, tabela, colunas):
+            continue
+        for comando in _ddl(indice, tabela, colunas, tokenizador):
+            conn.execute(text(comando))
+        if reconstruir:
+            conn.execute(text(f"INSERT INTO {indice}({indice}) VALUES ('rebuild')"))
+
+
+def remover_indices_textuais(conn: Connection):
+    if not suportado(conn):
+        return
+
+    for indice in INDICES_TEXTUAIS:
+        conn.execute(text(f"DROP TABLE IF EXISTS {indice}"))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _apos_criar(target, connection, **kw):
+    criar_indices_textuais(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _antes_de_remover(target, connection, **kw):
+    remover_indices_textuais(connection)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from models import Base
+
+
+class Lease(Base):
+    __tablename__ = "leases"
+
+    chave = Column(String, primary_key=True)
+    dono = Column(String, nullable=False)
+    expira_em = Column(DateTime, nullable=False, index=True)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<Lease(chave='{self.chave}', dono='{self.dono}')>"
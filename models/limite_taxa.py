@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Float, String
+from models import Base
+
+
+class LimiteTaxa(Base):
+    __tablename__ = "limites_taxa"
+
+    chave = Column(String, primary_key=True)
+    fichas = Column(Float, nullable=False)
+    atualizado_em = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<LimiteTaxa(chave='{self.chave}', fichas={self.fichas})>"
@@ -0,0 +1,107 @@
+import orjson
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import relationship, validates
+from datetime import datetime
+from models import Base
+from utils.normalizacao import chave_nome
+
+
+class Monitorado(Base):
+    __tablename__ = "monitorados"
+
+    id = Column(Integer, primary_key=True, index=True)
+    nome = Column(String, nullable=False)
+    chave = Column(String, unique=True, index=True, nullable=False)
+    intervalo_segundos = Column(Integer, nullable=False)
+    prioridade = Column(Integer, nullable=False, default=0)
+    ativo = Column(Boolean, nullable=False, default=True, index=True)
+
+    proxima_em = Column(DateTime, index=True, nullable=False)
+    ultima_verificacao_em = Column(DateTime)
+    ultima_alteracao_em = Column(DateTime)
+    verificacoes = Column(Integer, nullable=False, default=0)
+    verificacoes_com_alteracao = Column(Integer, nullable=False, default=0)
+    falhas_consecutivas = Column(Integer, nullable=False, default=0)
+    custo_estimado = Column(Integer, nullable=False, default=1)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    historico = relationship(
+        "Verificacao",
+        back_populates="monitorado",
+        cascade="all, delete-orphan",
+        order_by="Verificacao.id.desc()",
+        lazy="dynamic"
+    )
+
+    @validates("nome")
+    def _normalizar_nome(self, chave, nome):
+        self.chave = chave_nome(nome)
+        return nome
+
+    def __repr__(self):
+        return f"<Monitorado(id={self.id}, nome='{self.nome}')>"
+
+    @property
+    def taxa_alteracao(self) -> float:
+        return self.verificacoes_com_alteracao / self.verificacoes if self.verificacoes else 0.0
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "nome": self.nome,
+            "intervalo_segundos": self.intervalo_segundos,
+            "prioridade": self.prioridade,
+            "ativo": self.ativo,
+            "proxima_em": self.proxima_em,
+            "ultima_verificacao_em": self.ultima_verificacao_em,
+            "ultima_alteracao_em": self.ultima_alteracao_em,
+            "verificacoes": self.verificacoes,
+            "taxa_alteracao": round(self.taxa_alteracao, 3),
+            "falhas_consecutivas": self.falhas_consecutivas
+        }
+
+
+class Verificacao(Base):
+    __tablename__ = "verificacoes"
+
+    CONCLUIDA = "concluida"
+    FALHOU = "falhou"
+
+    id = Column(Integer, primary_key=True, index=True)
+    monitorado_id = Column(Integer, ForeignKey("monitorados.id", ondelete="CASCADE"), index=True, nullable=False)
+    status = Column(String, nullable=False)
+    inseridos = Column(Integer, nullable=False, default=0)
+    atualizados = Column(Integer, nullable=False, default=0)
+    inalterados = Column(Integer, nullable=False, default=0)
+    diferencas = Column(Text)
+    erro = Column(Text)
+    duracao_segundos = Column(Float)
+    iniciado_em = Column(DateTime, nullable=False)
+    finalizado_em = Column(DateTime)
+
+    monitorado = relationship("Monitorado", back_populates="historico")
+
+    def __repr__(self):
+        return f"<Verificacao(id={self.id}, monitorado_id={self.monitorado_id}, status='{self.status}')>"
+
+    @property
+    def partes_alteradas(self):
+        return orjson.loads(self.diferencas) if self.diferencas else []
+
+    @partes_alteradas.setter
+    def partes_alteradas(self, valor):
+        self.diferencas = orjson.dumps(valor).decode("utf-8")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "inseridos": self.inseridos,
+            "atualizados": self.atualizados,
+            "inalterados": self.inalterados,
+            "partes_alteradas": self.partes_alteradas,
+            "erro": self.erro,
+            "duracao_segundos": self.duracao_segundos,
+            "iniciado_em": self.iniciado_em,
+            "finalizado_em": self.finalizado_em
+        }
@@ -1,20 +1,28 @@
-from sqlalchemy import Column, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.orm import relationship, validates
 from models import Base
+from utils.normalizacao import chave_nome
 
 class Parte(Base):
     __tablename__ = "partes"
 
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String, index=True, unique=True, nullable=False)
+    nome_normalizado = Column(String, index=True)
+    ultima_coleta_em = Column(DateTime)
     
     processos = relationship(
         "Processo", 
         back_populates="parte", 
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
 
+    @validates("nome")
+    def _normalizar_nome(self, chave, nome):
+        self.nome_normalizado = chave_nome(nome)
+        return nome
+
     def __repr__(self):
         return f"<Parte(id={self.id}, nome='{self.nome}')>"
     
@@ -22,5 +30,6 @@ class Parte(Base):
         return {
             "id": self.id,
             "nome": self.nome,
-            "total_processos": len(self.processos) if self.processos else 0
+            "total_processos": self.total_processos or 0,
+            "ultima_coleta_em": self.ultima_coleta_em
         }
@@ -1,11 +1,23 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime
-from sqlalchemy.orm import relationship
+import hashlib
+from typing import Dict
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Index, func, select
+from sqlalchemy.orm import column_property, relationship
 from datetime import datetime
 from models import Base
+from models.parte import Parte
 
 
 class Processo(Base):
     __tablename__ = "processos"
+    __table_args__ = (
+        Index("uq_processos_parte_numero", "parte_id", "numero_processo", unique=True),
+        Index("ix_processos_parte_atualizado", "parte_id", "atualizado_em", "id"),
+        Index("ix_processos_numero_atualizado", "numero_processo", "atualizado_em", "id"),
+        Index("ix_processos_assunto_atualizado", "assunto", "atualizado_em", "id"),
+        Index("ix_processos_atualizado", "atualizado_em", "id"),
+    )
+
+    CAMPOS_COLETADOS = ("autor", "reu", "assunto", "ultimo_evento", "link_processo")
 
     id = Column(Integer, primary_key=True, index=True)
     numero_processo = Column(String, index=True, nullable=False)
@@ -14,13 +26,19 @@ class Processo(Base):
     assunto = Column(Text)
     ultimo_evento = Column(Text)
     link_processo = Column(Text)
+    hash_conteudo = Column(String(16))
     
     criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
-    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    atualizado_em = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     parte_id = Column(Integer, ForeignKey("partes.id", ondelete="CASCADE"), nullable=False)
     parte = relationship("Parte", back_populates="processos")
 
+    @classmethod
+    def calcular_hash(cls, dados: Dict) -> str:
+        conteudo = "\x1f".join(dados.get(campo) or "" for campo in cls.CAMPOS_COLETADOS)
+        return hashlib.blake2b(conteudo.encode("utf-8"), digest_size=8).hexdigest()
+
     def __repr__(self):
         return f"<Processo(id={self.id}, numero='{self.numero_processo}')>"
     
@@ -34,6 +52,15 @@ class Processo(Base):
             "ultimo_evento": self.ultimo_evento,
             "link_processo": self.link_processo,
             "parte_id": self.parte_id,
-            "criado_em": self.criado_em.isoformat() if self.criado_em else None,
-            "atualizado_em": self.atualizado_em.isoformat() if self.atualizado_em else None
+            "criado_em": self.criado_em,
+            "atualizado_em": self.atualizado_em
         }
+
+
+Parte.total_processos = column_property(
+    select(func.count(Processo.id))
+    .where(Processo.parte_id == Parte.id)
+    .correlate_except(Processo)
+    .scalar_subquery(),
+    deferred=True
+)
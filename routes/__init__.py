@@ -1,4 +1,5 @@
 from .processos import router as processos_router
 from .health import router as health_router
+from .buscas import router as buscas_router
 
-__all__ = ["processos_router", "health_router"]
+__all__ = ["processos_router", "health_router", "buscas_router"]
@@ -0,0 +1,141 @@
+import asyncio
+from collections import Counter
+from typing import Dict
+
+import orjson
+
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from config.database import ReadSessionLocal
+from models import Busca, BuscaParte
+from schemas import BuscaCriadaSchema, BuscaSchema, PartesBuscaSchema
+from utils.job_queue import get_job_queue
+from utils.normalizacao import normalizar_nome
+
+SSE_INTERVALO = 0.5
+
+router = APIRouter(
+    prefix="/buscas",
+    tags=["Buscas"]
+)
+
+
+class BuscaRequest(BaseModel):
+    nome: str = Field(..., min_length=1)
+
+
+def _carregar_busca(busca_id: int) -> Dict:
+    db = ReadSessionLocal()
+    try:
+        busca = db.get(Busca, busca_id)
+        if busca is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Busca {busca_id} não encontrada"
+            )
+        return busca.to_dict()
+    finally:
+        db.close()
+
+
+@router.post("", status_code=202, response_model=BuscaCriadaSchema)
+def criar_busca(payload: BuscaRequest):
+    nome = normalizar_nome(payload.nome)
+    busca = get_job_queue().enfileirar_se_ausente(nome)
+
+    return {
+        "id": busca.id,
+        "nome": busca.nome,
+        "status": busca.status,
+        "links": {
+            "status": f"/buscas/{busca.id}",
+            "eventos": f"/buscas/{busca.id}/eventos",
+            "partes": f"/buscas/{busca.id}/partes"
+        }
+    }
+
+
+@router.get("/{busca_id}", response_model=BuscaSchema)
+def consultar_busca(busca_id: int):
+    return _carregar_busca(busca_id)
+
+
+@router.get("/{busca_id}/partes", response_model=PartesBuscaSchema)
+def partes_busca(busca_id: int):
+    busca = _carregar_busca(busca_id)
+
+    db = ReadSessionLocal()
+    try:
+        partes = (
+            db.query(BuscaParte)
+            .filter(BuscaParte.busca_id == busca_id)
+            .order_by(BuscaParte.ordem)
+            .all()
+        )
+        return {
+            "busca_id": busca_id,
+            "status": busca["status"],
+            "resumo": dict(Counter(parte.status for parte in partes)),
+            "partes": [parte.to_dict() for parte in partes]
+        }
+    finally:
+        db.close()
+
+
+@router.post("/{busca_id}/retomar", status_code=202, response_model=BuscaSchema)
+def retomar_busca(busca_id: int):
+    busca = _carregar_busca(busca_id)
+
+    if not get_job_queue().retomar(busca_id):
+        detalhe = (
+            f"Busca {busca_id} ainda está em andamento"
+            if busca["status"] not in Busca.FINALIZADOS
+            else f"Busca {busca_id} não tem partes pendentes"
+        )
+        raise HTTPException(status_code=409, detail=detalhe)
+
+    return _carregar_busca(busca_id)
+
+
+def _evento_sse(evento: str, dados) -> str:
+    return f"event: {evento}\ndata: {orjson.dumps(dados).decode('utf-8')}\n\n"
+
+
+@router.get("/{busca_id}/eventos")
+async def eventos_busca(busca_id: int):
+    busca = await run_in_threadpool(_carregar_busca, busca_id)
+
+    async def gerar():
+        enviados = set()
+        status = None
+        atual = busca
+
+        while True:
+            for resultado in atual["resultados"]:
+                if resultado["ordem"] not in enviados:
+                    enviados.add(resultado["ordem"])
+                    yield _evento_sse("parte", resultado)
+
+            if atual["status"] != status:
+                status = atual["status"]
+                yield _evento_sse("status", {
+                    "status": status,
+                    "total_partes": atual["total_partes"],
+                    "partes_concluidas": atual["partes_concluidas"],
+                    "erro": atual["erro"]
+                })
+
+            if status in Busca.FINALIZADOS:
+                break
+
+            await asyncio.sleep(SSE_INTERVALO)
+            atual = await run_in_threadpool(_carregar_busca, busca_id)
+
+    return StreamingResponse(
+        gerar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 from datetime import datetime
-from config.database import SessionLocal
+from config.database import ReadSessionLocal, engine, read_engine
 from sqlalchemy import text
+from utils.disjuntor import ABERTO, get_disjuntor
+from utils.driver_pool import get_driver_pool
 
 router = APIRouter(
     tags=["Health"]
@@ -17,7 +19,25 @@ def root():
         "endpoints": {
             "GET /": "Informações da API",
             "GET /health": "Status de saúde da aplicação",
-            "GET /processos/{nome}": "Consulta processos por nome da parte"
+            "GET /metrics": "Métricas no formato de exposição do Prometheus",
+            "GET /processos/{nome}": "Consulta processos por nome da parte",
+            "POST /processos/lote": "Consulta vários nomes em uma chamada, com resultados em NDJSON",
+            "POST /processos/atualizar": "Atualiza o último evento de processos conhecidos direto pelo link de cada processo",
+            "GET /processos": "Processos armazenados, filtrados por numero, assunto e desde (paginado)",
+            "GET /partes": "Partes armazenadas (paginado)",
+            "GET /partes/{id}/processos": "Processos armazenados de uma parte (paginado)",
+            "GET /pesquisa/processos?q=": "Pesquisa textual em autor, réu, assunto e último evento",
+            "GET /pesquisa/partes?q=": "Pesquisa textual no nome das partes",
+            "GET /pesquisa/sugestoes?q=": "Autocompletar nomes de partes por prefixo ou trecho",
+            "POST /buscas": "Enfileira uma busca assíncrona",
+            "GET /buscas/{id}": "Status e resultados parciais de uma busca",
+            "GET /buscas/{id}/eventos": "Stream SSE com as partes concluídas",
+            "GET /buscas/{id}/partes": "Checkpoint de cada parte da busca: pendente, concluída ou falhou",
+            "POST /buscas/{id}/retomar": "Reenfileira uma busca interrompida ou com falhas, coletando só as partes pendentes",
+            "POST /monitorados": "Inclui um nome na lista de atualização agendada",
+            "GET /monitorados": "Nomes monitorados, com cadência e próxima verificação (paginado)",
+            "GET /monitorados/{id}/verificacoes": "Histórico de verificações com os processos novos e alterados",
+            "DELETE /monitorados/{id}": "Remove um nome do monitoramento"
         }
     }
 
@@ -25,7 +45,7 @@ def root():
 @router.get("/health")
 def health_check():
     
-    db = SessionLocal()
+    db = ReadSessionLocal()
     
     try:
         db.execute(text("SELECT 1"))
@@ -37,13 +57,20 @@ def health_check():
     finally:
         db.close()
     
+    pool_stats = get_driver_pool().stats()
+    disjuntor_stats = get_disjuntor().stats()
+    
     return {
-        "status": "healthy" if db_status == "healthy" else "degraded",
+        "status": "healthy" if db_status == "healthy" and disjuntor_stats["estado"] != ABERTO else "degraded",
         "timestamp": datetime.now().isoformat(),
         "checks": {
             "database": {
                 "status": db_status,
-                "message": db_message
-            }
+                "message": db_message,
+                "pool_escrita": engine.pool.status(),
+                "pool_leitura": read_engine.pool.status()
+            },
+            "driver_pool": pool_stats,
+            "portal": disjuntor_stats
         }
     }
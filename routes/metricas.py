@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from utils.driver_pool import get_driver_pool
+from utils.metricas import DRIVERS, REGISTRO
+
+router = APIRouter(
+    tags=["Health"]
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metricas():
+    stats = get_driver_pool().stats()
+    for estado in ("em_uso", "livres", "aguardando"):
+        DRIVERS.labels(estado=estado).set(stats[estado])
+    return Response(generate_latest(REGISTRO), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,83 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from config.database import get_db, get_read_db
+from models import Monitorado, Verificacao
+from schemas import HistoricoVerificacoesSchema, MonitoradoSchema, PaginaMonitoradosSchema
+from utils.monitoramento import MONITORAMENTO_INTERVALO_MINIMO, MONITORAMENTO_INTERVALO_PADRAO, monitorar
+from utils.normalizacao import normalizar_nome
+from utils.paginacao import LIMITE_MAXIMO, LIMITE_PADRAO, paginar
+
+router = APIRouter(
+    prefix="/monitorados",
+    tags=["Monitoramento"]
+)
+
+
+class MonitoradoRequest(BaseModel):
+    nome: str = Field(..., min_length=1)
+    intervalo_segundos: int = Field(MONITORAMENTO_INTERVALO_PADRAO, ge=MONITORAMENTO_INTERVALO_MINIMO)
+    prioridade: int = Field(0, ge=0, le=10)
+
+
+def _carregar(db: Session, monitorado_id: int) -> Monitorado:
+    monitorado = db.get(Monitorado, monitorado_id)
+    if monitorado is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Monitorado {monitorado_id} não encontrado"
+        )
+    return monitorado
+
+
+@router.post("", status_code=201, response_model=MonitoradoSchema)
+def criar_monitorado(payload: MonitoradoRequest, db: Session = Depends(get_db)):
+    monitorado = monitorar(db, normalizar_nome(payload.nome), payload.intervalo_segundos, payload.prioridade)
+    return monitorado.to_dict()
+
+
+@router.get("", response_model=PaginaMonitoradosSchema)
+def listar_monitorados(
+    cursor: Optional[str] = None,
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    db: Session = Depends(get_read_db)
+):
+    pagina = paginar(db.query(Monitorado), [Monitorado.id], cursor, limite)
+
+    return {
+        "monitorados": [monitorado.to_dict() for monitorado in pagina.itens],
+        "limite": limite,
+        "proximo_cursor": pagina.proximo_cursor
+    }
+
+
+@router.get("/{monitorado_id}", response_model=MonitoradoSchema)
+def consultar_monitorado(monitorado_id: int, db: Session = Depends(get_read_db)):
+    return _carregar(db, monitorado_id).to_dict()
+
+
+@router.get("/{monitorado_id}/verificacoes", response_model=HistoricoVerificacoesSchema)
+def listar_verificacoes(
+    monitorado_id: int,
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    somente_alteracoes: bool = False,
+    db: Session = Depends(get_read_db)
+):
+    query = _carregar(db, monitorado_id).historico
+    if somente_alteracoes:
+        query = query.filter((Verificacao.inseridos > 0) | (Verificacao.atualizados > 0))
+
+    return {
+        "monitorado_id": monitorado_id,
+        "verificacoes": [verificacao.to_dict() for verificacao in query.limit(limite)]
+    }
+
+
+@router.delete("/{monitorado_id}", status_code=204)
+def remover_monitorado(monitorado_id: int, db: Session = Depends(get_db)):
+    db.delete(_carregar(db, monitorado_id))
+    db.commit()
+    return Response(status_code=204)
@@ -0,0 +1,64 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session, raiseload, undefer
+
+from config.database import get_read_db
+from models import Parte, Processo
+from schemas import PaginaPartesSchema, PaginaProcessosDaParteSchema
+from utils.ndjson import RESPOSTA_NDJSON, aceita_ndjson, resposta_ndjson, transmitir_consulta
+from utils.paginacao import LIMITE_MAXIMO, LIMITE_PADRAO, decodificar_cursor, paginar
+
+router = APIRouter(
+    prefix="/partes",
+    tags=["Partes"]
+)
+
+
+@router.get("", response_model=PaginaPartesSchema)
+def listar_partes(
+    cursor: Optional[str] = None,
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    db: Session = Depends(get_read_db)
+):
+    query = db.query(Parte).options(raiseload(Parte.processos), undefer(Parte.total_processos))
+    pagina = paginar(query, [Parte.id], cursor, limite)
+
+    return {
+        "partes": [parte.to_dict() for parte in pagina.itens],
+        "limite": limite,
+        "proximo_cursor": pagina.proximo_cursor
+    }
+
+
+@router.get("/{parte_id}/processos", response_model=PaginaProcessosDaParteSchema, responses=RESPOSTA_NDJSON)
+def listar_processos_da_parte(
+    parte_id: int,
+    request: Request,
+    cursor: Optional[str] = None,
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    db: Session = Depends(get_read_db)
+):
+    if db.query(Parte.id).filter(Parte.id == parte_id).first() is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Parte {parte_id} não encontrada"
+        )
+
+    chave = [Processo.atualizado_em, Processo.id]
+
+    if aceita_ndjson(request):
+        if cursor:
+            decodificar_cursor(cursor, chave)
+        return resposta_ndjson(transmitir_consulta(
+            lambda sessao: sessao.query(Processo).filter(Processo.parte_id == parte_id), chave, cursor
+        ))
+
+    pagina = paginar(db.query(Processo).filter(Processo.parte_id == parte_id), chave, cursor, limite)
+
+    return {
+        "parte_id": parte_id,
+        "processos": [processo.to_dict() for processo in pagina.itens],
+        "limite": limite,
+        "proximo_cursor": pagina.proximo_cursor
+    }
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from config.database import get_read_db
+from models.indice_textual import suportado
+from schemas import PesquisaPartesSchema, PesquisaProcessosSchema, SugestoesSchema
+from utils.pesquisa import ConsultaInvalidaError, pesquisar_partes, pesquisar_processos, sugerir_partes
+
+LIMITE_PESQUISA = 20
+LIMITE_PESQUISA_MAXIMO = 100
+LIMITE_SUGESTOES = 10
+LIMITE_SUGESTOES_MAXIMO = 50
+
+router = APIRouter(
+    prefix="/pesquisa",
+    tags=["Pesquisa"]
+)
+
+
+def _pesquisar(pesquisa, db: Session, q: str, limite: int, offset: int):
+    if not suportado(db.connection()):
+        raise HTTPException(
+            status_code=501,
+            detail="Pesquisa textual disponível apenas com SQLite (FTS5)"
+        )
+
+    try:
+        resultados = pesquisa(db, q, limite, offset)
+    except ConsultaInvalidaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "consulta": q,
+        "total": len(resultados),
+        "limite": limite,
+        "offset": offset,
+        "resultados": resultados
+    }
+
+
+@router.get("/processos", response_model=PesquisaProcessosSchema)
+def pesquisar_em_processos(
+    q: str = Query(..., min_length=1),
+    limite: int = Query(LIMITE_PESQUISA, ge=1, le=LIMITE_PESQUISA_MAXIMO),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db)
+):
+    return _pesquisar(pesquisar_processos, db, q, limite, offset)
+
+
+@router.get("/partes", response_model=PesquisaPartesSchema)
+def pesquisar_em_partes(
+    q: str = Query(..., min_length=1),
+    limite: int = Query(LIMITE_PESQUISA, ge=1, le=LIMITE_PESQUISA_MAXIMO),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db)
+):
+    return _pesquisar(pesquisar_partes, db, q, limite, offset)
+
+
+@router.get("/sugestoes", response_model=SugestoesSchema)
+def sugerir_nomes(
+    q: str = Query(..., min_length=1),
+    limite: int = Query(LIMITE_SUGESTOES, ge=1, le=LIMITE_SUGESTOES_MAXIMO),
+    db: Session = Depends(get_read_db)
+):
+    try:
+        sugestoes = sugerir_partes(db, q, limite)
+    except ConsultaInvalidaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "consulta": q,
+        "sugestoes": sugestoes
+    }
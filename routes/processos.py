@@ -1,52 +1,392 @@
-from fastapi import APIRouter, HTTPException
-from utils.eproc_scraper import EProcService
+import contextvars
+import logging
+import math
+import queue
+import threading
+import os
+import time
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from config.database import ReadSessionLocal, get_read_db
+from models import Processo
+from schemas import AtualizacaoProcessosSchema, ConsultaProcessosSchema, PaginaProcessosSchema
+from utils.cache import (
+    CACHE_TTL_SEGUNDOS,
+    HIT,
+    MISS,
+    STALE,
+    carregar_processos,
+    consultar_cache,
+    versao_resultados
+)
+from utils.condicional import Versao, cabecalhos_validacao, nao_modificado
+from utils.disjuntor import CircuitoAbertoError, get_disjuntor
+from utils.driver_pool import PoolEsgotadoError
+from utils.eproc_scraper import ColetaFalhouError, EProcService
+from utils.job_queue import get_job_queue
+from utils.lote import (
+    CONCLUIDO,
+    FALHOU,
+    LOTE_MAXIMO_NOMES,
+    LOTE_PRAZO_MAXIMO,
+    LOTE_PRAZO_SEGUNDOS,
+    NAO_ENCONTRADO,
+    PRAZO_ESGOTADO,
+    ItemLote,
+    deduplicar,
+    processar_lote
+)
+from utils.metricas import CACHE, registrar_erro
+from utils.ndjson import NDJSON_MEDIA_TYPE, RESPOSTA_NDJSON, aceita_ndjson, resposta_ndjson, transmitir_consulta
+from utils.normalizacao import normalizar_nome
+from utils.paginacao import LIMITE_MAXIMO, LIMITE_PADRAO, LOTE_STREAMING, decodificar_cursor, paginar
+from utils.respostas import RespostaJSON
+
+ATUALIZACAO_MAXIMO_PROCESSOS = int(os.getenv("ATUALIZACAO_MAXIMO_PROCESSOS", "200"))
 
 router = APIRouter(
     prefix="/processos",
     tags=["Processos"]
 )
 
-@router.get("/{nome}")
-def consultar_processos(nome: str):
-    nome = nome.upper().strip()
-    print(f"🔎 Consultando processos para: {nome}")
-    
-    service = EProcService()
-    
+logger = logging.getLogger(__name__)
+
+
+class AtualizacaoRequest(BaseModel):
+    numeros: List[str] = Field(..., min_length=1, max_length=ATUALIZACAO_MAXIMO_PROCESSOS)
+
+
+class LoteRequest(BaseModel):
+    nomes: List[str] = Field(..., min_length=1, max_length=LOTE_MAXIMO_NOMES)
+    prazo_segundos: float = Field(LOTE_PRAZO_SEGUNDOS, gt=0, le=LOTE_PRAZO_MAXIMO)
+    force_refresh: bool = False
+
+
+def _formatar_processo(processo, resultado):
+    return {
+        **processo,
+        "parte": resultado['nome_parte'],
+        "cpf_cnpj": resultado['cpf_cnpj']
+    }
+
+
+def _formatar_resposta(nome, resultados):
+    processos_formatados = [
+        _formatar_processo(processo, resultado)
+        for resultado in resultados
+        for processo in resultado['processos']
+    ]
+
+    return {
+        "nome_consultado": nome,
+        "total_partes": len(resultados),
+        "total_processos": len(processos_formatados),
+        "processos": processos_formatados,
+        "partes_com_falha": [
+            {"nome_parte": r["nome_parte"], "cpf_cnpj": r["cpf_cnpj"], "erro": r["erro"]}
+            for r in resultados if r.get("erro")
+        ]
+    }
+
+
+def _buscar_no_cache(nome: str, request: Request, formato: str):
+    db = ReadSessionLocal()
+    try:
+        cache = consultar_cache(db, nome, carregar_processos=False)
+        if cache is None or not cache.resultados:
+            return cache, None
+        if cache.estado == MISS and not get_disjuntor().aberto:
+            return cache, None
+
+        versao = versao_resultados(db, nome, cache.resultados, formato)
+        if formato != NDJSON_MEDIA_TYPE and not nao_modificado(request, versao):
+            carregar_processos(db, cache.resultados)
+        return cache, versao
+    finally:
+        db.close()
+
+
+def _versao_coletada(nome: str, formato: str) -> Optional[Versao]:
+    db = ReadSessionLocal()
+    try:
+        cache = consultar_cache(db, nome, carregar_processos=False)
+        if cache is None or not cache.resultados:
+            return None
+        return versao_resultados(db, nome, cache.resultados, formato)
+    finally:
+        db.close()
+
+
+def _filtrar_processos(db: Session, numero: Optional[str], assunto: Optional[str], desde: Optional[datetime]):
+    query = db.query(Processo)
+    if numero:
+        query = query.filter(Processo.numero_processo == numero.strip())
+    if assunto:
+        query = query.filter(Processo.assunto == assunto)
+    if desde:
+        query = query.filter(Processo.atualizado_em >= desde)
+    return query
+
+
+@router.get("", response_model=PaginaProcessosSchema, responses=RESPOSTA_NDJSON)
+def listar_processos(
+    request: Request,
+    numero: Optional[str] = None,
+    assunto: Optional[str] = None,
+    desde: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    db: Session = Depends(get_read_db)
+):
+    chave = [Processo.atualizado_em, Processo.id]
+
+    if aceita_ndjson(request):
+        if cursor:
+            decodificar_cursor(cursor, chave)
+        return resposta_ndjson(transmitir_consulta(
+            lambda sessao: _filtrar_processos(sessao, numero, assunto, desde), chave, cursor
+        ))
+
+    pagina = paginar(_filtrar_processos(db, numero, assunto, desde), chave, cursor, limite)
+
+    return {
+        "processos": [processo.to_dict() for processo in pagina.itens],
+        "limite": limite,
+        "proximo_cursor": pagina.proximo_cursor
+    }
+
+
+@router.post("/lote", response_class=StreamingResponse, responses=RESPOSTA_NDJSON)
+def consultar_lote(payload: LoteRequest):
+    nomes = deduplicar(payload.nomes)
+    logger.info("Lote com %d nome(s), %d único(s)", len(payload.nomes), len(nomes))
+
+    itens = processar_lote(
+        nomes,
+        prazo=payload.prazo_segundos,
+        service_factory=EProcService,
+        force_refresh=payload.force_refresh
+    )
+    return resposta_ndjson(_linhas_lote(itens, len(payload.nomes), len(nomes)))
+
+
+@router.post("/atualizar", response_model=AtualizacaoProcessosSchema)
+def atualizar_processos(payload: AtualizacaoRequest):
+    try:
+        processos = EProcService().atualizar_processos(payload.numeros)
+    except PoolEsgotadoError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Serviço sobrecarregado: {str(e)}"
+        )
+    except CircuitoAbertoError as e:
+        raise _portal_indisponivel(e)
+
+    return {
+        "processos": processos,
+        "resumo": dict(Counter(processo["status"] for processo in processos))
+    }
+
+
+def _formatar_item_lote(item: ItemLote):
+    linha = {"nome_consultado": item.nome, "status": item.status}
+    if item.origem:
+        linha["origem"] = item.origem
+        linha["cache"] = item.cache
+    if item.erro:
+        linha["erro"] = item.erro
+    if item.status == CONCLUIDO:
+        linha.update(_formatar_resposta(item.nome, item.resultados))
+    return linha
+
+
+def _linhas_lote(itens, recebidos: int, unicos: int):
+    inicio = time.perf_counter()
+    totais = {status: 0 for status in (CONCLUIDO, NAO_ENCONTRADO, FALHOU, PRAZO_ESGOTADO)}
+
+    for item in itens:
+        totais[item.status] += 1
+        yield _formatar_item_lote(item)
+
+    yield {"resumo": {
+        "recebidos": recebidos,
+        "unicos": unicos,
+        **totais,
+        "duracao_ms": round((time.perf_counter() - inicio) * 1000, 1)
+    }}
+
+
+@router.get("/{nome}", response_model=ConsultaProcessosSchema, responses=RESPOSTA_NDJSON)
+def consultar_processos(nome: str, request: Request, response: Response, force_refresh: bool = False):
+    nome = normalizar_nome(nome)
+    streaming = aceita_ndjson(request)
+    formato = NDJSON_MEDIA_TYPE if streaming else RespostaJSON.media_type
+    logger.info("Consultando processos para: %s", nome)
+
+    cache, versao = (None, None) if force_refresh else _buscar_no_cache(nome, request, formato)
+    estado = cache.estado if cache else MISS
+    portal_indisponivel = estado == MISS and versao is not None
+    if portal_indisponivel:
+        estado = STALE
+    CACHE.labels(estado=estado).inc()
+
+    if estado == STALE and not portal_indisponivel:
+        get_job_queue().enfileirar_se_ausente(nome)
+
+    if estado in (HIT, STALE):
+        return _responder_do_banco(nome, request, response, cache, versao, estado, portal_indisponivel, formato)
+
+    cabecalhos = {"X-Cache": MISS, "X-Data-Source": "scraper", "Age": "0"}
+    if streaming:
+        return resposta_ndjson(_processos_do_scraping(nome), cabecalhos)
+
+    try:
+        resultados = _executar_scraping(nome, response)
+    except CircuitoAbertoError as e:
+        cache, versao = _buscar_no_cache(nome, request, formato)
+        if versao is None:
+            raise _portal_indisponivel(e)
+        estado = HIT if cache.estado == HIT else STALE
+        return _responder_do_banco(nome, request, response, cache, versao, estado, True, formato)
+
+    return _responder(nome, request, response, resultados, cabecalhos, None, formato)
+
+
+def _responder_do_banco(nome, request, response, cache, versao, estado, portal_indisponivel, formato):
+    logger.info("Cache %s para %s (%ss)", estado, nome, cache.idade)
+    cabecalhos = {"X-Cache": estado, "X-Data-Source": "database", "Age": str(cache.idade)}
+    if portal_indisponivel:
+        cabecalhos["X-Portal"] = "indisponivel"
+    if versao:
+        cabecalhos.update(cabecalhos_validacao(versao, cache.max_age))
+        if nao_modificado(request, versao):
+            return Response(status_code=304, headers=cabecalhos)
+    if formato == NDJSON_MEDIA_TYPE and cache.resultados:
+        return resposta_ndjson(_processos_do_banco(cache.resultados), cabecalhos)
+    return _responder(nome, request, response, cache.resultados, cabecalhos, versao, formato)
+
+
+def _responder(nome, request, response, resultados, cabecalhos, versao, formato):
+    response.headers.update(cabecalhos)
+
+    if not resultados:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Nenhum processo encontrado para '{nome}'",
+            headers=cabecalhos
+        )
+
+    if versao is None:
+        versao = _versao_coletada(nome, formato)
+        if versao is not None:
+            response.headers.update(cabecalhos_validacao(versao, CACHE_TTL_SEGUNDOS))
+            if nao_modificado(request, versao):
+                return Response(status_code=304, headers=dict(response.headers))
+
+    resposta = RespostaJSON(_formatar_resposta(nome, resultados))
+
+    resposta.headers.update(response.headers)
+    return resposta
+
+
+def _processos_do_banco(resultados):
+    db = ReadSessionLocal()
     try:
-        resultados = service.buscar_e_salvar(nome)
-        
-        if not resultados:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Nenhum processo encontrado para '{nome}'"
-            )
-        
-        processos_formatados = []
         for resultado in resultados:
-            for processo in resultado['processos']:
-                processos_formatados.append({
-                    **processo,
-                    "parte": resultado['nome_parte'],
-                    "cpf_cnpj": resultado['cpf_cnpj']
-                })
-        
-        return {
-            "nome_consultado": nome,
-            "total_partes": len(resultados),
-            "total_processos": len(processos_formatados),
-            "processos": processos_formatados
-        }
-        
-    except HTTPException:
+            processos = (
+                db.query(Processo)
+                .filter(Processo.parte_id == resultado['parte_id'])
+                .order_by(Processo.id)
+                .yield_per(LOTE_STREAMING)
+            )
+            for processo in processos:
+                yield _formatar_processo(processo.to_dict(), resultado)
+    finally:
+        db.close()
+
+
+def _processos_do_scraping(nome: str):
+    fila = queue.Queue()
+
+    def executar():
+        try:
+            resultados = get_job_queue().executar_agora(
+                nome,
+                service=EProcService(),
+                ao_concluir_parte=lambda idx, total, resultado: fila.put((idx, resultado))
+            )
+            for idx, resultado in enumerate(resultados):
+                fila.put((idx, resultado))
+            fila.put(None)
+        except Exception as e:
+            logger.error("Erro ao processar %s: %s", nome, e)
+            registrar_erro("consultar_processos", e)
+            fila.put(e)
+
+    contexto = contextvars.copy_context()
+    threading.Thread(target=contexto.run, args=(executar,), name=f"ndjson-{nome}", daemon=True).start()
+
+    enviados = set()
+    while True:
+        item = fila.get()
+        if item is None:
+            return
+        if isinstance(item, Exception):
+            yield {"erro": f"Erro ao processar: {str(item)}"}
+            return
+
+        idx, resultado = item
+        if idx in enviados:
+            continue
+        enviados.add(idx)
+        if resultado.get("erro"):
+            yield {"parte": resultado['nome_parte'], "cpf_cnpj": resultado['cpf_cnpj'], "erro": resultado['erro']}
+        for processo in resultado['processos']:
+            yield _formatar_processo(processo, resultado)
+
+
+def _executar_scraping(nome: str, response: Response):
+    service = EProcService()
+
+    try:
+        resultados = get_job_queue().executar_agora(nome, service=service)
+        response.headers["Server-Timing"] = service.cronometro.server_timing()
+        return resultados
+
+    except PoolEsgotadoError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Serviço sobrecarregado: {str(e)}"
+        )
+
+    except CircuitoAbertoError:
         raise
-        
+
+    except ColetaFalhouError as e:
+        raise HTTPException(
+            status_code=502,
+            detail=str(e)
+        )
+
     except Exception as e:
-        print(f"❌ Erro ao processar: {e}")
+        logger.error("Erro ao processar %s: %s", nome, e)
+        registrar_erro("consultar_processos", e)
         raise HTTPException(
-            status_code=500, 
+            status_code=500,
             detail=f"Erro ao processar: {str(e)}"
         )
-    
-    finally:
-        service.close()
+
+
+def _portal_indisponivel(erro: CircuitoAbertoError) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=str(erro),
+        headers={"Retry-After": str(max(1, math.ceil(erro.tentar_em)))}
+    )
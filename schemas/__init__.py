@@ -0,0 +1,42 @@
+from schemas.processo import (
+    ProcessoSchema,
+    ProcessoConsultadoSchema,
+    ParteComFalhaSchema,
+    ConsultaProcessosSchema,
+    PaginaProcessosSchema,
+    PaginaProcessosDaParteSchema,
+    ProcessoAtualizadoSchema,
+    AtualizacaoProcessosSchema
+)
+from schemas.parte import ParteSchema, PaginaPartesSchema
+from schemas.busca import BuscaSchema, BuscaCriadaSchema, PartesBuscaSchema
+from schemas.monitorado import (
+    MonitoradoSchema,
+    PaginaMonitoradosSchema,
+    VerificacaoSchema,
+    HistoricoVerificacoesSchema
+)
+from schemas.pesquisa import PesquisaProcessosSchema, PesquisaPartesSchema, SugestoesSchema
+
+__all__ = [
+    "ProcessoSchema",
+    "ProcessoConsultadoSchema",
+    "ParteComFalhaSchema",
+    "ConsultaProcessosSchema",
+    "PaginaProcessosSchema",
+    "PaginaProcessosDaParteSchema",
+    "ProcessoAtualizadoSchema",
+    "AtualizacaoProcessosSchema",
+    "ParteSchema",
+    "PaginaPartesSchema",
+    "BuscaSchema",
+    "BuscaCriadaSchema",
+    "PartesBuscaSchema",
+    "PesquisaProcessosSchema",
+    "PesquisaPartesSchema",
+    "SugestoesSchema",
+    "MonitoradoSchema",
+    "PaginaMonitoradosSchema",
+    "VerificacaoSchema",
+    "HistoricoVerificacoesSchema"
+]
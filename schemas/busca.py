@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class AlteracoesSchema(BaseModel):
+    inseridos: int = 0
+    atualizados: int = 0
+    inalterados: int = 0
+
+
+class BuscaSchema(BaseModel):
+    id: int
+    nome: str
+    status: str
+    total_partes: Optional[int] = None
+    partes_concluidas: int = 0
+    erro: Optional[str] = None
+    alteracoes: AlteracoesSchema
+    resultados: List[Dict[str, Any]]
+    criado_em: Optional[datetime] = None
+    iniciado_em: Optional[datetime] = None
+    finalizado_em: Optional[datetime] = None
+
+
+class ParteBuscaSchema(BaseModel):
+    ordem: int
+    nome: str
+    cpf_cnpj: Optional[str] = None
+    status: str
+    tentativas: int = 0
+    erro: Optional[str] = None
+    atualizado_em: Optional[datetime] = None
+
+
+class PartesBuscaSchema(BaseModel):
+    busca_id: int
+    status: str
+    resumo: Dict[str, int]
+    partes: List[ParteBuscaSchema]
+
+
+class LinksBuscaSchema(BaseModel):
+    status: str
+    eventos: str
+    partes: str
+
+
+class BuscaCriadaSchema(BaseModel):
+    id: int
+    nome: str
+    status: str
+    links: LinksBuscaSchema
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class MonitoradoSchema(BaseModel):
+    id: int
+    nome: str
+    intervalo_segundos: int
+    prioridade: int
+    ativo: bool
+    proxima_em: datetime
+    ultima_verificacao_em: Optional[datetime] = None
+    ultima_alteracao_em: Optional[datetime] = None
+    verificacoes: int
+    taxa_alteracao: float
+    falhas_consecutivas: int
+
+
+class PaginaMonitoradosSchema(BaseModel):
+    monitorados: List[MonitoradoSchema]
+    limite: int
+    proximo_cursor: Optional[str] = None
+
+
+class ProcessoAlteradoSchema(BaseModel):
+    numero_processo: str
+    ultimo_evento: Optional[str] = None
+
+
+class ParteAlteradaSchema(BaseModel):
+    nome_parte: str
+    inseridos: List[str]
+    atualizados: List[ProcessoAlteradoSchema]
+
+
+class VerificacaoSchema(BaseModel):
+    id: int
+    status: str
+    inseridos: int
+    atualizados: int
+    inalterados: int
+    partes_alteradas: List[ParteAlteradaSchema]
+    erro: Optional[str] = None
+    duracao_segundos: Optional[float] = None
+    iniciado_em: datetime
+    finalizado_em: Optional[datetime] = None
+
+
+class HistoricoVerificacoesSchema(BaseModel):
+    monitorado_id: int
+    verificacoes: List[VerificacaoSchema]
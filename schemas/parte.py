@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ParteSchema(BaseModel):
+    id: int
+    nome: str
+    total_processos: int = 0
+    ultima_coleta_em: Optional[datetime] = None
+
+
+class PaginaPartesSchema(BaseModel):
+    partes: List[ParteSchema]
+    limite: int
+    proximo_cursor: Optional[str] = None
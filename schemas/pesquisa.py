@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ProcessoEncontradoSchema(BaseModel):
+    id: int
+    numero_processo: str
+    autor: Optional[str] = None
+    reu: Optional[str] = None
+    assunto: Optional[str] = None
+    ultimo_evento: Optional[str] = None
+    link_processo: Optional[str] = None
+    parte_id: int
+    atualizado_em: Optional[datetime] = None
+    trecho: Optional[str] = None
+    relevancia: float
+
+
+class ParteEncontradaSchema(BaseModel):
+    id: int
+    nome: str
+    ultima_coleta_em: Optional[datetime] = None
+    trecho: Optional[str] = None
+    relevancia: float
+
+
+class PesquisaProcessosSchema(BaseModel):
+    consulta: str
+    total: int
+    limite: int
+    offset: int
+    resultados: List[ProcessoEncontradoSchema]
+
+
+class PesquisaPartesSchema(BaseModel):
+    consulta: str
+    total: int
+    limite: int
+    offset: int
+    resultados: List[ParteEncontradaSchema]
+
+
+class SugestaoSchema(BaseModel):
+    id: int
+    nome: str
+    correspondencia: str
+
+
+class SugestoesSchema(BaseModel):
+    consulta: str
+    sugestoes: List[SugestaoSchema]
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class ProcessoSchema(BaseModel):
+    id: int
+    numero_processo: str
+    autor: Optional[str] = None
+    reu: Optional[str] = None
+    assunto: Optional[str] = None
+    ultimo_evento: Optional[str] = None
+    link_processo: Optional[str] = None
+    parte_id: int
+    criado_em: Optional[datetime] = None
+    atualizado_em: Optional[datetime] = None
+
+
+class ProcessoConsultadoSchema(BaseModel):
+    id: Optional[int] = None
+    numero_processo: str
+    autor: Optional[str] = None
+    reu: Optional[str] = None
+    assunto: Optional[str] = None
+    ultimo_evento: Optional[str] = None
+    link_processo: Optional[str] = None
+    parte_id: Optional[int] = None
+    criado_em: Optional[datetime] = None
+    atualizado_em: Optional[datetime] = None
+    parte: str
+    cpf_cnpj: Optional[str] = None
+
+
+class ParteComFalhaSchema(BaseModel):
+    nome_parte: str
+    cpf_cnpj: Optional[str] = None
+    erro: str
+
+
+class ConsultaProcessosSchema(BaseModel):
+    nome_consultado: str
+    total_partes: int
+    total_processos: int
+    processos: List[ProcessoConsultadoSchema]
+    partes_com_falha: List[ParteComFalhaSchema] = []
+
+
+class PaginaProcessosSchema(BaseModel):
+    processos: List[ProcessoSchema]
+    limite: int
+    proximo_cursor: Optional[str] = None
+
+
+class PaginaProcessosDaParteSchema(PaginaProcessosSchema):
+    parte_id: int
+
+
+class ProcessoAtualizadoSchema(BaseModel):
+    numero_processo: str
+    status: str
+    ultimo_evento: Optional[str] = None
+    eventos: Optional[int] = None
+    erro: Optional[str] = None
+
+
+class AtualizacaoProcessosSchema(BaseModel):
+    processos: List[ProcessoAtualizadoSchema]
+    resumo: Dict[str, int]
@@ -1,5 +1,14 @@
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='eproc-tests-')}/eproc.db"
+
+import threading
+import time
+from contextlib import contextmanager
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from models.base import Base
 from models.parte import Parte
@@ -48,4 +57,190 @@ def processo_factory(session):
         session.commit()
         session.refresh(processo)
         return processo
-    return _create_processo
\ No newline at end of file
+    return _create_processo
+
+@pytest.fixture(autouse=True)
+def sem_rate_limit(monkeypatch):
+    from utils.rate_limiter import get_rate_limiter
+    monkeypatch.setattr(get_rate_limiter(), "intervalo_minimo", 0)
+
+
+@pytest.fixture(autouse=True)
+def sem_backoff(monkeypatch):
+    import utils.eproc_scraper
+    monkeypatch.setattr(utils.eproc_scraper, "BUSCA_BACKOFF_SEGUNDOS", 0)
+
+
+@pytest.fixture(autouse=True)
+def disjuntor(monkeypatch):
+    import utils.disjuntor
+    novo = utils.disjuntor.Disjuntor()
+    monkeypatch.setattr(utils.disjuntor, "_disjuntor", novo)
+    return novo
+
+
+@pytest.fixture
+def app_db():
+    from config.database import SessionLocal, engine as app_engine
+    Base.metadata.create_all(bind=app_engine)
+    yield SessionLocal
+    Base.metadata.drop_all(bind=app_engine)
+
+
+@pytest.fixture
+def contar_sql():
+    @contextmanager
+    def _contar(engine):
+        comandos = []
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            comandos.append(statement)
+
+        event.listen(engine, "before_cursor_execute", registrar)
+        try:
+            yield comandos
+        finally:
+            event.remove(engine, "before_cursor_execute", registrar)
+
+    return _contar
+
+
+class FakeService:
+    partes = 1
+    processos = 1
+    erro = None
+    parte_com_erro = 0
+    falhas = set()
+    lentos = set()
+    liberar = threading.Event()
+    instancias = 0
+    chamadas = 0
+    coletados = []
+
+    def __init__(self):
+        from utils.timing import Cronometro
+        type(self).instancias += 1
+        self.cronometro = Cronometro()
+
+    def buscar_e_salvar(self, nome, ao_concluir_parte=None, checkpoint=None):
+        servico = type(self)
+        servico.chamadas += 1
+        if nome in servico.lentos:
+            servico.liberar.wait(5)
+        if nome in servico.falhas:
+            raise RuntimeError(f"falha em {nome}")
+        servico.coletados.append(nome)
+
+        nomes = [nome if servico.partes == 1 else f"{nome} {idx}" for idx in range(servico.partes)]
+        if checkpoint:
+            checkpoint.registrar_partes([{"nome": nome_parte, "cpf_cnpj": "", "link": None} for nome_parte in nomes])
+
+        resultados = []
+        for idx, nome_parte in enumerate(nomes):
+            resultado = {
+                "nome_parte": nome_parte,
+                "cpf_cnpj": "",
+                "link": None,
+                "processos": [
+                    {"numero_processo": f"{idx}-{n}", "autor": "A", "reu": "B", "assunto": "C",
+                     "ultimo_evento": "D", "link_processo": None}
+                    for n in range(servico.processos)
+                ]
+            }
+            resultados.append(resultado)
+            if checkpoint:
+                checkpoint.concluir(idx, resultado)
+            if ao_concluir_parte:
+                ao_concluir_parte(idx, servico.partes, resultado)
+            if servico.erro and idx == servico.parte_com_erro:
+                raise RuntimeError(servico.erro)
+        return resultados
+
+
+class FakeScraper:
+    def __init__(self, partes=None, processos=None, atrasos=None, falhas=()):
+        self.partes = partes
+        self.processos = processos or {}
+        self.atrasos = atrasos or {}
+        self.falhas = falhas
+        self.fora_do_ar = False
+        self.buscas = 0
+        self.chamadas = []
+        self.request_ids = []
+        self.eventos = {}
+
+    def buscar_partes(self, nome):
+        self.buscas += 1
+        if self.fora_do_ar:
+            raise RuntimeError("eproc fora do ar")
+        if self.partes is None:
+            return [{"nome": nome, "cpf_cnpj": "", "link": "link-0"}]
+        return self.partes
+
+    def coletar_processos_da_parte(self, link):
+        from utils.logs import request_id
+        self.chamadas.append(link)
+        self.request_ids.append(request_id.get())
+        time.sleep(self.atrasos.get(link, 0))
+        if link in self.falhas:
+            raise RuntimeError(f"falha em {link}")
+        return self.processos.get(link, [])
+
+    def coletar_eventos_do_processo(self, link):
+        if link in self.falhas:
+            raise RuntimeError(f"falha em {link}")
+        return self.eventos[link]
+
+
+class FakePool:
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self._lock = threading.Lock()
+        self.em_uso = 0
+        self.max_em_uso = 0
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        with self._lock:
+            self.em_uso += 1
+            self.max_em_uso = max(self.max_em_uso, self.em_uso)
+        try:
+            yield self.scraper
+        finally:
+            with self._lock:
+                self.em_uso -= 1
+
+
+@pytest.fixture
+def fake_service():
+    return type("FakeService", (FakeService,), {
+        "falhas": set(),
+        "lentos": set(),
+        "liberar": threading.Event(),
+        "coletados": []
+    })
+
+
+@pytest.fixture
+def fake_scraper():
+    return FakeScraper
+
+
+@pytest.fixture
+def fake_pool():
+    return FakePool
+
+
+@pytest.fixture
+def client(app_db, fake_service, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import routes.processos as rotas_processos
+    import utils.job_queue as job_queue
+    from main import app
+    from utils.job_queue import JobQueue
+
+    fila = JobQueue(workers=1, service_factory=fake_service, session_factory=app_db)
+    monkeypatch.setattr(job_queue, "_queue", fila)
+    monkeypatch.setattr(rotas_processos, "EProcService", fake_service)
+    return TestClient(app)
@@ -0,0 +1,120 @@
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.arquivo_bruto import ArquivoBruto
+
+
+def resultado(nome_parte, total=2):
+    return {
+        "nome_parte": nome_parte,
+        "cpf_cnpj": "",
+        "link": f"https://eproc/{nome_parte}",
+        "processos": [{"numero_processo": f"{nome_parte}-{n}", "autor": "AUTOR"} for n in range(total)]
+    }
+
+
+@pytest.fixture
+def arquivo(tmp_path):
+    arquivo = ArquivoBruto(diretorio=tmp_path, intervalo=0.05)
+    yield arquivo
+    arquivo.stop()
+
+
+class TestArquivoBruto:
+
+    def test_consulta_por_nome(self, arquivo):
+        arquivo.registrar("JOSÉ DA SILVA", [resultado("JOSE DA SILVA"), resultado("JOSE DA SILVA JUNIOR")])
+        arquivo.registrar("MARIA", [resultado("MARIA SOUZA")])
+        arquivo.aguardar()
+
+        registros = list(arquivo.consultar("jose da silva"))
+
+        assert [r["nome_parte"] for r in registros] == ["JOSE DA SILVA", "JOSE DA SILVA JUNIOR"]
+        assert registros[0]["consulta"] == "JOSÉ DA SILVA"
+        assert registros[0]["processos"][1]["numero_processo"] == "JOSE DA SILVA-1"
+
+    def test_consulta_pelo_nome_da_parte(self, arquivo):
+        arquivo.registrar("MARIA", [resultado("MARIA SOUZA"), resultado("MARIA LIMA")])
+        arquivo.aguardar()
+
+        assert [r["consulta"] for r in arquivo.consultar("Maria Lima")] == ["MARIA"]
+
+    def test_intervalo_de_tempo(self, arquivo):
+        arquivo.registrar("ANA", [resultado("ANA")])
+        arquivo.aguardar()
+        meio = datetime.utcnow()
+        arquivo.registrar("ANA", [resultado("ANA", total=5)])
+        arquivo.aguardar()
+
+        assert [len(r["processos"]) for r in arquivo.consultar("ANA")] == [2, 5]
+        assert [len(r["processos"]) for r in arquivo.consultar("ANA", desde=meio)] == [5]
+        assert [len(r["processos"]) for r in arquivo.consultar("ANA", ate=meio)] == [2]
+        assert list(arquivo.consultar("ANA", desde=meio + timedelta(hours=1))) == []
+
+    def test_segmentos_rotacionados(self, tmp_path):
+        arquivo = ArquivoBruto(diretorio=tmp_path, segmento_bytes=200, lote=1, intervalo=0.05)
+        for i in range(5):
+            arquivo.registrar(f"PARTE {i}", [resultado(f"PARTE {i}")])
+            arquivo.aguardar()
+        arquivo.stop()
+
+        segmentos = sorted(p.name for p in tmp_path.glob("*.jsonl.*"))
+        assert len(segmentos) == 5
+        assert segmentos[0] == "000001.jsonl.zst"
+        assert [r["nome_parte"] for r in arquivo.consultar("PARTE 3")] == ["PARTE 3"]
+
+    def test_reabre_o_ultimo_segmento(self, tmp_path):
+        primeiro = ArquivoBruto(diretorio=tmp_path, intervalo=0.05)
+        primeiro.registrar("ANA", [resultado("ANA")])
+        primeiro.aguardar()
+        primeiro.stop()
+
+        segundo = ArquivoBruto(diretorio=tmp_path, intervalo=0.05)
+        segundo.registrar("ANA", [resultado("ANA")])
+        segundo.aguardar()
+        segundo.stop()
+
+        assert len(list(tmp_path.glob("*.jsonl.zst"))) == 1
+        assert len(list(segundo.consultar("ANA"))) == 2
+
+    def test_processos_gravando_no_mesmo_segmento(self, tmp_path):
+        processos = [ArquivoBruto(diretorio=tmp_path, intervalo=0.05) for _ in range(2)]
+        for i in range(6):
+            arquivo = processos[i % 2]
+            arquivo.registrar(f"PARTE {i}", [resultado(f"PARTE {i}", total=i + 1)])
+            arquivo.aguardar()
+        for arquivo in processos:
+            arquivo.stop()
+
+        assert len(list(tmp_path.glob("*.jsonl.zst"))) == 1
+        for i in range(6):
+            registros = list(processos[0].consultar(f"PARTE {i}"))
+            assert [len(r["processos"]) for r in registros] == [i + 1]
+
+    def test_gzip(self, tmp_path):
+        arquivo = ArquivoBruto(diretorio=tmp_path, compressao="gzip", intervalo=0.05)
+        arquivo.registrar("ANA", [resultado("ANA")])
+        arquivo.aguardar()
+        arquivo.stop()
+
+        segmento = tmp_path / "000001.jsonl.gz"
+        assert b'"nome_parte":"ANA"' in gzip.decompress(segmento.read_bytes())
+        assert list(arquivo.consultar("ANA"))[0]["nome_parte"] == "ANA"
+
+    def test_stop_grava_pendentes(self, tmp_path):
+        arquivo = ArquivoBruto(diretorio=tmp_path, intervalo=0.05)
+        for i in range(20):
+            arquivo.registrar("ANA", [resultado(f"ANA {i}")])
+        arquivo.stop()
+
+        assert len(list(arquivo.consultar("ANA"))) == 20
+
+    def test_fila_cheia_descarta(self, tmp_path):
+        arquivo = ArquivoBruto(diretorio=tmp_path, fila_maxima=1)
+        arquivo.start = lambda: None
+
+        assert arquivo.registrar("ANA", [resultado("ANA")]) is True
+        assert arquivo.registrar("ANA", [resultado("ANA")]) is False
+        assert arquivo.descartadas == 1
@@ -0,0 +1,214 @@
+from datetime import datetime, timedelta
+
+from models import Busca, BuscaParte, Parte, Processo
+from utils.cache import (
+    CACHE_NEGATIVO_SEGUNDOS, CACHE_STALE_SEGUNDOS, CACHE_TTL_SEGUNDOS, HIT, MISS, STALE, consultar_cache
+)
+from utils.disjuntor import CircuitoAbertoError
+
+
+def registrar_busca(db, nome, partes, coletado_em):
+    for nome_parte in partes:
+        parte = Parte(nome=nome_parte, ultima_coleta_em=coletado_em)
+        db.add(parte)
+        db.flush()
+        db.add(Processo(parte_id=parte.id, numero_processo=f"{nome_parte}-1", autor="A"))
+
+    busca = Busca(nome=nome, status=Busca.CONCLUIDA, finalizado_em=coletado_em)
+    busca.resultados = [
+        {"ordem": i, "nome_parte": p, "cpf_cnpj": "", "link": None, "processos": []}
+        for i, p in enumerate(partes)
+    ]
+    db.add(busca)
+    db.commit()
+
+
+class TestConsultarCache:
+
+    def test_sem_busca_anterior(self, app_db):
+        db = app_db()
+        assert consultar_cache(db, "MARIA") is None
+        db.close()
+
+    def test_resultado_recente(self, app_db):
+        db = app_db()
+        registrar_busca(db, "MARIA", ["MARIA SILVA", "MARIA SOUZA"], datetime.utcnow())
+
+        cache = consultar_cache(db, "MARIA")
+        db.close()
+
+        assert cache.estado == HIT
+        assert [r["nome_parte"] for r in cache.resultados] == ["MARIA SILVA", "MARIA SOUZA"]
+        assert cache.resultados[0]["processos"][0]["numero_processo"] == "MARIA SILVA-1"
+
+    def test_resultado_antigo(self, app_db):
+        db = app_db()
+        antigo = datetime.utcnow() - timedelta(seconds=CACHE_TTL_SEGUNDOS + 60)
+        registrar_busca(db, "JOSE", ["JOSE LIMA"], antigo)
+
+        cache = consultar_cache(db, "JOSE")
+        db.close()
+
+        assert cache.estado == STALE
+        assert cache.idade >= CACHE_TTL_SEGUNDOS
+
+    def test_variacoes_do_nome_usam_a_mesma_chave(self, app_db):
+        db = app_db()
+        registrar_busca(db, "JOSÉ DA SILVA", ["JOSÉ DA SILVA"], datetime.utcnow())
+
+        cache = consultar_cache(db, "Jose  da Silva")
+        db.close()
+
+        assert cache.estado == HIT
+        assert cache.resultados[0]["nome_parte"] == "JOSÉ DA SILVA"
+
+    def test_parte_nunca_coletada_invalida_cache(self, app_db):
+        db = app_db()
+        registrar_busca(db, "ANA", ["ANA LIMA"], datetime.utcnow())
+        db.query(Parte).update({Parte.ultima_coleta_em: None})
+        db.commit()
+
+        assert consultar_cache(db, "ANA") is None
+        db.close()
+
+    def test_lista_de_partes_vem_de_buscas_partes(self, app_db):
+        db = app_db()
+        partes = ["MARIA SILVA", "MARIA SOUZA"]
+        registrar_busca(db, "MARIA", partes, datetime.utcnow())
+        busca = db.query(Busca).one()
+        busca.resultado = "{corrompido"
+        db.add_all([
+            BuscaParte(busca_id=busca.id, ordem=i, nome=nome, cpf_cnpj="1", link=f"link-{i}")
+            for i, nome in enumerate(partes)
+        ])
+        db.commit()
+
+        cache = consultar_cache(db, "MARIA", carregar_processos=False)
+        db.close()
+
+        assert [(r["nome_parte"], r["link"]) for r in cache.resultados] == [
+            ("MARIA SILVA", "link-0"), ("MARIA SOUZA", "link-1")
+        ]
+        assert "processos" not in cache.resultados[0]
+
+
+class TestRotaProcessosCache:
+
+    def test_miss_executa_scraping(self, client, fake_service):
+        resposta = client.get("/processos/carlos")
+
+        assert resposta.status_code == 200
+        assert resposta.headers["X-Cache"] == MISS
+        assert resposta.headers["X-Data-Source"] == "scraper"
+        assert resposta.json()["total_processos"] == 1
+        assert fake_service.chamadas == 1
+
+    def test_hit_responde_do_banco(self, client, app_db, fake_service):
+        db = app_db()
+        registrar_busca(db, "CARLOS", ["CARLOS"], datetime.utcnow())
+        db.close()
+
+        resposta = client.get("/processos/carlos")
+
+        assert resposta.status_code == 200
+        assert resposta.headers["X-Cache"] == HIT
+        assert resposta.headers["X-Data-Source"] == "database"
+        assert resposta.json()["processos"][0]["parte"] == "CARLOS"
+        assert fake_service.chamadas == 0
+
+    def test_stale_agenda_atualizacao(self, client, app_db):
+        db = app_db()
+        antigo = datetime.utcnow() - timedelta(seconds=CACHE_TTL_SEGUNDOS + 60)
+        registrar_busca(db, "CARLOS", ["CARLOS"], antigo)
+        db.close()
+
+        resposta = client.get("/processos/carlos")
+        client.get("/processos/carlos")
+
+        assert resposta.headers["X-Cache"] == STALE
+        assert int(resposta.headers["Age"]) >= CACHE_TTL_SEGUNDOS
+        db = app_db()
+        assert db.query(Busca).filter(Busca.status == Busca.PENDENTE).count() == 1
+        db.close()
+
+    def test_force_refresh_ignora_cache(self, client, app_db, fake_service):
+        db = app_db()
+        registrar_busca(db, "CARLOS", ["CARLOS"], datetime.utcnow())
+        db.close()
+
+        resposta = client.get("/processos/carlos", params={"force_refresh": True})
+
+        assert resposta.headers["X-Cache"] == MISS
+        assert fake_service.chamadas == 1
+
+    def test_portal_indisponivel_serve_cache_expirado(self, client, app_db, disjuntor, fake_service):
+        db = app_db()
+        expirado = datetime.utcnow() - timedelta(seconds=CACHE_TTL_SEGUNDOS + CACHE_STALE_SEGUNDOS + 60)
+        registrar_busca(db, "CARLOS", ["CARLOS"], expirado)
+        db.close()
+        for _ in range(disjuntor.limite_falhas):
+            disjuntor.registrar_falha()
+
+        resposta = client.get("/processos/carlos")
+
+        assert resposta.status_code == 200
+        assert resposta.headers["X-Cache"] == STALE
+        assert resposta.headers["X-Portal"] == "indisponivel"
+        assert resposta.json()["processos"][0]["parte"] == "CARLOS"
+        assert fake_service.chamadas == 0
+        db = app_db()
+        assert db.query(Busca).filter(Busca.status == Busca.PENDENTE).count() == 0
+        db.close()
+
+    def test_nome_sem_partes_expira_no_ttl_negativo(self, client, app_db, fake_service):
+        fake_service.partes = 0
+        vazia = client.get("/processos/carlos")
+        repetida = client.get("/processos/carlos")
+
+        assert (vazia.status_code, vazia.headers["X-Cache"]) == (404, MISS)
+        assert (repetida.status_code, repetida.headers["X-Cache"]) == (404, HIT)
+        assert fake_service.chamadas == 1
+
+        fake_service.partes = 1
+        db = app_db()
+        db.query(Busca).update({"finalizado_em": datetime.utcnow() - timedelta(seconds=CACHE_NEGATIVO_SEGUNDOS + 1)})
+        db.commit()
+        db.close()
+
+        resposta = client.get("/processos/carlos")
+
+        assert resposta.status_code == 200
+        assert resposta.headers["X-Cache"] == MISS
+        assert resposta.json()["total_processos"] == 1
+        assert fake_service.chamadas == 2
+
+    def test_disjuntor_abre_durante_a_coleta_serve_cache_expirado(self, client, app_db, disjuntor, monkeypatch, fake_service):
+        db = app_db()
+        expirado = datetime.utcnow() - timedelta(seconds=CACHE_TTL_SEGUNDOS + CACHE_STALE_SEGUNDOS + 60)
+        registrar_busca(db, "CARLOS", ["CARLOS"], expirado)
+        db.close()
+
+        def portal_caiu(self, nome, ao_concluir_parte=None, checkpoint=None):
+            for _ in range(disjuntor.limite_falhas):
+                disjuntor.registrar_falha()
+            raise CircuitoAbertoError(30)
+
+        monkeypatch.setattr(fake_service, "buscar_e_salvar", portal_caiu)
+
+        resposta = client.get("/processos/carlos")
+
+        assert resposta.status_code == 200
+        assert resposta.headers["X-Cache"] == STALE
+        assert resposta.headers["X-Portal"] == "indisponivel"
+        assert resposta.json()["processos"][0]["parte"] == "CARLOS"
+
+    def test_portal_indisponivel_sem_cache(self, client, monkeypatch, fake_service):
+        def recusar(self, nome, ao_concluir_parte=None, checkpoint=None):
+            raise CircuitoAbertoError(42.3)
+
+        monkeypatch.setattr(fake_service, "buscar_e_salvar", recusar)
+
+        resposta = client.get("/processos/carlos")
+
+        assert resposta.status_code == 503
+        assert resposta.headers["Retry-After"] == "43"
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+from sqlalchemy import update
+
+import routes.processos as rotas_processos
+from config.database import read_engine
+from models import Busca, Parte, Processo
+from utils.condicional import Versao, cabecalhos_validacao, nao_modificado
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+class FakeRequest:
+    def __init__(self, **headers):
+        self.headers = {nome.replace("_", "-"): valor for nome, valor in headers.items()}
+
+
+def popular(app_db, total=3):
+    db = app_db()
+    parte = Parte(nome="CARLOS", ultima_coleta_em=datetime.utcnow())
+    db.add(parte)
+    db.flush()
+    db.add_all([Processo(parte_id=parte.id, numero_processo=f"{n:03d}") for n in range(total)])
+    busca = Busca(nome="CARLOS", status=Busca.CONCLUIDA, finalizado_em=datetime.utcnow())
+    busca.resultados = [{"nome_parte": "CARLOS", "cpf_cnpj": "1", "link": None, "processos": []}]
+    db.add(busca)
+    db.commit()
+    parte_id = parte.id
+    db.close()
+    return parte_id
+
+
+class TestNaoModificado:
+
+    def test_lista_de_etags_e_etag_fraca(self):
+        versao = Versao(etag='"abc"')
+
+        assert nao_modificado(FakeRequest(if_none_match='"xyz", W/"abc"'), versao)
+        assert nao_modificado(FakeRequest(if_none_match="*"), versao)
+        assert not nao_modificado(FakeRequest(if_none_match='"xyz"'), versao)
+        assert not nao_modificado(FakeRequest(), versao)
+
+    def test_if_modified_since(self):
+        versao = Versao(etag='"abc"', ultima_modificacao=datetime(2024, 5, 1, 12, 0, 0, 500))
+        cabecalho = cabecalhos_validacao(versao, 60)["Last-Modified"]
+
+        assert cabecalho == "Wed, 01 May 2024 12:00:00 GMT"
+        assert nao_modificado(FakeRequest(if_modified_since=cabecalho), versao)
+        assert not nao_modificado(FakeRequest(if_modified_since="Wed, 01 May 2024 11:59:59 GMT"), versao)
+        assert not nao_modificado(FakeRequest(if_modified_since="ontem"), versao)
+
+    def test_if_none_match_tem_precedencia(self):
+        versao = Versao(etag='"abc"', ultima_modificacao=datetime(2024, 5, 1))
+        request = FakeRequest(if_none_match='"xyz"', if_modified_since="Thu, 02 May 2024 00:00:00 GMT")
+
+        assert not nao_modificado(request, versao)
+
+
+class TestRotaCondicional:
+
+    def test_hit_com_validadores(self, client, app_db):
+        popular(app_db)
+
+        resposta = client.get("/processos/carlos")
+
+        assert resposta.status_code == 200
+        assert resposta.headers["ETag"].startswith('"')
+        assert "Last-Modified" in resposta.headers
+        assert 0 < int(resposta.headers["Cache-Control"].split("=")[1]) <= rotas_processos.CACHE_TTL_SEGUNDOS
+
+    def test_304_sem_carregar_processos(self, client, app_db, contar_sql):
+        popular(app_db)
+        etag = client.get("/processos/carlos").headers["ETag"]
+
+        with contar_sql(read_engine) as comandos:
+            resposta = client.get("/processos/carlos", headers={"If-None-Match": etag})
+
+        assert resposta.status_code == 304
+        assert resposta.content == b""
+        assert resposta.headers["ETag"] == etag
+        assert resposta.headers["X-Cache"] == "HIT"
+        assert not any("processos.numero_processo" in comando for comando in comandos)
+
+    def test_etag_muda_quando_processo_muda(self, client, app_db):
+        parte_id = popular(app_db)
+        etag = client.get("/processos/carlos").headers["ETag"]
+
+        db = app_db()
+        db.execute(
+            update(Processo)
+            .where(Processo.parte_id == parte_id, Processo.numero_processo == "001")
+            .values(autor="NOVO", atualizado_em=datetime.utcnow() + timedelta(seconds=1))
+        )
+        db.commit()
+        db.close()
+
+        resposta = client.get("/processos/carlos", headers={"If-None-Match": etag})
+
+        assert resposta.status_code == 200
+        assert resposta.headers["ETag"] != etag
+
+    def test_etag_muda_quando_processo_e_removido(self, client, app_db):
+        parte_id = popular(app_db)
+        etag = client.get("/processos/carlos").headers["ETag"]
+
+        db = app_db()
+        db.query(Processo).filter(Processo.parte_id == parte_id, Processo.numero_processo == "000").delete()
+        db.commit()
+        db.close()
+
+        assert client.get("/processos/carlos", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_if_modified_since(self, client, app_db):
+        popular(app_db)
+        ultima = client.get("/processos/carlos").headers["Last-Modified"]
+
+        assert client.get("/processos/carlos", headers={"If-Modified-Since": ultima}).status_code == 304
+
+        antes = format_datetime(datetime(2000, 1, 1), usegmt=False)
+        assert client.get("/processos/carlos", headers={"If-Modified-Since": antes}).status_code == 200
+
+    def test_etag_por_representacao(self, client, app_db):
+        popular(app_db)
+        etag_json = client.get("/processos/carlos").headers["ETag"]
+
+        resposta = client.get("/processos/carlos", headers={**NDJSON, "If-None-Match": etag_json})
+
+        assert resposta.status_code == 200
+        assert resposta.headers["ETag"] != etag_json
+        assert client.get("/processos/carlos", headers={**NDJSON, "If-None-Match": resposta.headers["ETag"]}).status_code == 304
+
+    def test_miss_e_hit_tem_a_mesma_etag(self, client, app_db, fake_service):
+        popular(app_db)
+        primeira = client.get("/processos/carlos", params={"force_refresh": True})
+        etag = primeira.headers["ETag"]
+
+        segunda = client.get("/processos/carlos", params={"force_refresh": True}, headers={"If-None-Match": etag})
+        hit = client.get("/processos/carlos", headers={"If-None-Match": etag})
+
+        assert primeira.headers["X-Cache"] == "MISS"
+        assert primeira.headers["Cache-Control"] == f"max-age={rotas_processos.CACHE_TTL_SEGUNDOS}"
+        assert segunda.status_code == 304
+        assert hit.status_code == 304
+        assert hit.headers["ETag"] == etag
+        assert fake_service.chamadas == 2
+
+    def test_miss_sem_partes_gravadas_nao_tem_etag(self, client):
+        resposta = client.get("/processos/ana", params={"force_refresh": True})
+
+        assert resposta.headers["X-Cache"] == "MISS"
+        assert "ETag" not in resposta.headers
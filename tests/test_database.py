@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, TimeoutError
+
+from config import database
+from config.database import criar_engines
+
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "SQLITE_ESCRITA_TIMEOUT", 0.05)
+    escrita, leitura = criar_engines(f"sqlite:///{tmp_path}/perfil.db")
+    with escrita.begin() as conn:
+        conn.execute(text("CREATE TABLE itens (id INTEGER PRIMARY KEY, valor TEXT)"))
+        conn.execute(text("INSERT INTO itens (valor) VALUES ('a')"))
+    yield escrita, leitura
+    escrita.dispose()
+    leitura.dispose()
+
+
+class TestPerfilSqlite:
+
+    def test_pragmas_aplicados_na_conexao(self, engines):
+        escrita, _ = engines
+        with escrita.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+            assert conn.execute(text("PRAGMA cache_size")).scalar() < 0
+
+    def test_leitor_nao_escreve(self, engines):
+        _, leitura = engines
+        with leitura.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("INSERT INTO itens (valor) VALUES ('b')"))
+
+    def test_uma_unica_conexao_de_escrita(self, engines):
+        escrita, _ = engines
+
+        with escrita.connect():
+            with pytest.raises(TimeoutError):
+                escrita.connect()
+
+    def test_leitura_nao_bloqueia_durante_escrita(self, engines):
+        escrita, leitura = engines
+        lidos = []
+
+        with escrita.begin() as conn:
+            conn.execute(text("INSERT INTO itens (valor) VALUES ('b')"))
+
+            def ler():
+                with leitura.connect() as leitor:
+                    lidos.append(leitor.execute(text("SELECT COUNT(*) FROM itens")).scalar())
+
+            threads = [threading.Thread(target=ler) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(2)
+
+        assert lidos == [1, 1, 1, 1]
+        with leitura.connect() as leitor:
+            assert leitor.execute(text("SELECT COUNT(*) FROM itens")).scalar() == 2
+
+    def test_memoria_compartilha_conexao(self):
+        escrita, leitura = criar_engines("sqlite:///:memory:")
+        assert escrita is leitura
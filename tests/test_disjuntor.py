@@ -0,0 +1,159 @@
+import socket
+import time
+
+import pytest
+import requests
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException
+
+import utils.eproc_scraper
+from utils.disjuntor import ABERTO, FECHADO, MEIO_ABERTO, CircuitoAbertoError, Disjuntor
+from utils.eproc_scraper import EProcScraper
+from utils.http_scraper import EProcHttpScraper
+from utils.metricas import REGISTRO
+from utils.rate_limiter import RateLimiter
+from utils.timing import Cronometro
+
+
+def abrir(disjuntor):
+    for _ in range(disjuntor.limite_falhas):
+        disjuntor.registrar_falha()
+
+
+class TestDisjuntor:
+
+    def test_abre_apos_falhas_consecutivas(self):
+        disjuntor = Disjuntor(falhas=3, espera=60)
+
+        disjuntor.registrar_falha()
+        disjuntor.registrar_falha()
+        disjuntor.registrar_sucesso()
+        disjuntor.registrar_falha()
+        disjuntor.registrar_falha()
+        assert disjuntor.estado == FECHADO
+
+        disjuntor.registrar_falha()
+
+        assert disjuntor.estado == ABERTO
+        assert REGISTRO.get_sample_value("eproc_disjuntor_estado") == 2
+        with pytest.raises(CircuitoAbertoError) as erro:
+            disjuntor.permitir()
+        assert 59 < erro.value.tentar_em <= 60
+        assert disjuntor.stats()["rejeitadas"] == 1
+
+    def test_meio_aberto_libera_uma_sonda(self):
+        disjuntor = Disjuntor(falhas=1, espera=0.05)
+        abrir(disjuntor)
+        time.sleep(0.06)
+
+        assert disjuntor.estado == MEIO_ABERTO
+        disjuntor.permitir()
+        with pytest.raises(CircuitoAbertoError):
+            disjuntor.permitir()
+
+        disjuntor.registrar_sucesso()
+
+        assert disjuntor.estado == FECHADO
+        disjuntor.permitir()
+        disjuntor.permitir()
+
+    def test_sonda_com_falha_reabre(self):
+        disjuntor = Disjuntor(falhas=2, espera=0.05)
+        abrir(disjuntor)
+        time.sleep(0.06)
+
+        disjuntor.permitir()
+        disjuntor.registrar_falha()
+
+        assert disjuntor.estado == ABERTO
+        assert disjuntor.stats()["aberturas"] == 2
+        with pytest.raises(CircuitoAbertoError):
+            disjuntor.permitir()
+
+
+class TestDisjuntorNoScraper:
+
+    @pytest.fixture
+    def url_recusada(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            porta = sock.getsockname()[1]
+        return f"http://127.0.0.1:{porta}/eproc/externo_controlador.php?acao=processo_consulta_publica"
+
+    def test_falhas_de_conexao_abrem_o_circuito(self, url_recusada, disjuntor):
+        scraper = EProcHttpScraper(url=url_recusada, timeout=1)
+
+        for _ in range(disjuntor.limite_falhas):
+            with pytest.raises(requests.ConnectionError):
+                scraper.buscar_partes("MARIA")
+
+        with pytest.raises(CircuitoAbertoError):
+            scraper.buscar_partes("MARIA")
+        with pytest.raises(CircuitoAbertoError):
+            scraper.coletar_processos_da_parte(url_recusada)
+        scraper.close()
+
+        assert disjuntor.estado == ABERTO
+
+    def test_erros_do_navegador_ao_carregar_contam_como_falha(self, disjuntor):
+        class DriverRecusado:
+            def __init__(self, erro):
+                self.erro = erro
+
+            def get(self, url):
+                raise self.erro
+
+        scraper = EProcScraper.__new__(EProcScraper)
+        scraper.disjuntor = disjuntor
+        scraper.rate_limiter = RateLimiter(intervalo_minimo=0)
+        scraper.cronometro = Cronometro()
+
+        scraper.driver = DriverRecusado(WebDriverException("net::ERR_NAME_NOT_RESOLVED"))
+        with pytest.raises(WebDriverException):
+            scraper._carregar("https://eproc")
+        assert disjuntor.stats()["falhas_consecutivas"] == 1
+
+        scraper.driver = DriverRecusado(InvalidSessionIdException("invalid session id"))
+        with pytest.raises(InvalidSessionIdException):
+            scraper._carregar("https://eproc")
+        assert disjuntor.stats()["falhas_consecutivas"] == 1
+
+    @pytest.mark.parametrize("renderizada, falhas", [(True, 0), (False, 1)])
+    def test_timeout_nos_resultados_so_vira_lista_vazia_com_pagina_renderizada(
+        self, monkeypatch, disjuntor, renderizada, falhas
+    ):
+        class Campo:
+            def clear(self):
+                pass
+
+            def send_keys(self, valor):
+                pass
+
+            def click(self):
+                pass
+
+        class Navegador:
+            page_source = '<div id="divInfraAreaTela"></div>' if renderizada else "<html></html>"
+
+            def get(self, url):
+                pass
+
+            def find_element(self, *args):
+                return Campo()
+
+        def sem_tabela(driver, timeout):
+            raise TimeoutException("tabela não apareceu")
+
+        monkeypatch.setattr(utils.eproc_scraper, "aguardar_elemento", lambda driver, elemento: Campo())
+        monkeypatch.setattr(utils.eproc_scraper, "aguardar_tabela_estavel", sem_tabela)
+        scraper = EProcScraper.__new__(EProcScraper)
+        scraper.driver = Navegador()
+        scraper.disjuntor = disjuntor
+        scraper.rate_limiter = RateLimiter(intervalo_minimo=0)
+        scraper.cronometro = Cronometro()
+
+        if renderizada:
+            assert scraper.buscar_partes("MARIA") == []
+        else:
+            with pytest.raises(TimeoutException):
+                scraper.buscar_partes("MARIA")
+        assert disjuntor.stats()["falhas_consecutivas"] == falhas
@@ -0,0 +1,134 @@
+import threading
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException
+from utils.driver_pool import DriverPool, PoolEsgotadoError
+
+
+class FakeScraper:
+    def __init__(self):
+        self.fechado = False
+
+    def close(self):
+        self.fechado = True
+
+
+class FakeScraperAtivo(FakeScraper):
+    vivo = True
+
+    def ativo(self):
+        return self.vivo
+
+
+class TestDriverPool:
+
+    def test_prewarm_cria_drivers(self):
+        pool = DriverPool(factory=FakeScraper, max_size=3)
+        pool.prewarm(2)
+
+        stats = pool.stats()
+        assert stats["total"] == 2
+        assert stats["livres"] == 2
+        assert stats["em_uso"] == 0
+
+    def test_reutiliza_driver_devolvido(self):
+        pool = DriverPool(factory=FakeScraper, max_size=2)
+
+        with pool.acquire() as primeiro:
+            pass
+        with pool.acquire() as segundo:
+            pass
+
+        assert primeiro is segundo
+        assert pool.stats()["total"] == 1
+
+    def test_checkout_respeita_limite(self):
+        pool = DriverPool(factory=FakeScraper, max_size=1)
+        scraper = pool.checkout()
+
+        with pytest.raises(PoolEsgotadoError):
+            pool.checkout(timeout=0.05)
+
+        assert pool.stats()["timeouts"] == 1
+        assert pool.stats()["saturacao"] == 1.0
+        pool.checkin(scraper)
+
+    def test_checkout_aguarda_devolucao(self):
+        pool = DriverPool(factory=FakeScraper, max_size=1)
+        scraper = pool.checkout()
+
+        timer = threading.Timer(0.05, pool.checkin, args=(scraper,))
+        timer.start()
+
+        assert pool.checkout(timeout=2) is scraper
+        timer.join()
+
+    def test_recicla_apos_max_usos(self):
+        pool = DriverPool(factory=FakeScraper, max_size=1, max_usos=2)
+
+        with pool.acquire() as primeiro:
+            pass
+        with pool.acquire() as segundo:
+            pass
+        with pool.acquire() as terceiro:
+            pass
+
+        assert primeiro is segundo
+        assert primeiro.fechado
+        assert terceiro is not primeiro
+        assert pool.stats()["reciclados"] == 1
+
+    def test_descarta_driver_apos_falha(self):
+        pool = DriverPool(factory=FakeScraper, max_size=1)
+
+        with pytest.raises(WebDriverException):
+            with pool.acquire() as scraper:
+                raise WebDriverException("chrome not reachable")
+
+        assert scraper.fechado
+        assert pool.stats()["total"] == 0
+        assert pool.stats()["falhas"] == 1
+
+    def test_timeout_devolve_driver_ao_pool(self):
+        pool = DriverPool(factory=FakeScraperAtivo, max_size=1)
+
+        with pytest.raises(TimeoutException):
+            with pool.acquire() as scraper:
+                raise TimeoutException("tabela não estabilizou")
+
+        assert not scraper.fechado
+        assert pool.stats()["livres"] == 1
+        assert pool.stats()["reciclados"] == 0
+        assert pool.stats()["falhas"] == 0
+        with pool.acquire() as reutilizado:
+            assert reutilizado is scraper
+
+    def test_erro_com_driver_vivo_mantem_driver(self):
+        pool = DriverPool(factory=FakeScraperAtivo, max_size=1)
+
+        with pytest.raises(WebDriverException):
+            with pool.acquire() as scraper:
+                raise WebDriverException("net::ERR_CONNECTION_REFUSED")
+
+        assert not scraper.fechado
+        assert pool.stats()["falhas"] == 0
+
+    def test_sessao_invalida_descarta_driver(self):
+        pool = DriverPool(factory=FakeScraperAtivo, max_size=1)
+
+        with pytest.raises(InvalidSessionIdException):
+            with pool.acquire() as scraper:
+                raise InvalidSessionIdException("invalid session id")
+
+        assert scraper.fechado
+        assert pool.stats()["falhas"] == 1
+
+    def test_close_encerra_drivers_livres(self):
+        pool = DriverPool(factory=FakeScraper, max_size=2)
+        pool.prewarm(2)
+        scrapers = list(pool._livres)
+
+        pool.close()
+
+        assert all(entrada.scraper.fechado for entrada in scrapers)
+        with pytest.raises(PoolEsgotadoError):
+            pool.checkout(timeout=0)
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+from utils.eproc_parser import extrair_eventos, extrair_linhas_tabela, formatar_ultimo_evento
+from utils.eproc_scraper import EProcScraper
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+URL_PAGINA = "https://eproc-consulta-publica-1g.tjmg.jus.br/eproc/externo_controlador.php?acao=x"
+
+
+class FakeDriver:
+    def __init__(self, arquivo):
+        self.html = (FIXTURES_DIR / arquivo).read_text(encoding="utf-8")
+        self.scripts = 0
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        return [URL_PAGINA, self.html]
+
+
+def criar_scraper(driver):
+    scraper = EProcScraper.__new__(EProcScraper)
+    scraper.driver = driver
+    return scraper
+
+
+class TestExtracaoTabela:
+
+    def test_extrair_partes_em_uma_chamada(self):
+        driver = FakeDriver("consulta_partes.html")
+
+        partes = criar_scraper(driver)._extrair_partes_da_tabela()
+
+        assert driver.scripts == 1
+        assert [p["nome"] for p in partes] == ["ADILSON DA SILVA", "ADILSON DA SILVA SANTOS"]
+        assert partes[0]["link"].startswith("https://eproc-consulta-publica-1g.tjmg.jus.br/eproc/")
+
+    def test_extrair_processos_em_uma_chamada(self):
+        driver = FakeDriver("parte_processos.html")
+
+        processos = criar_scraper(driver)._extrair_processos_da_tabela()
+
+        assert driver.scripts == 1
+        assert len(processos) == 2
+        assert processos[1]["numero_processo"] == "5000002-22.2023.8.13.0024"
+        assert processos[1]["ultimo_evento"] == "Baixa definitiva"
+
+    def test_ignora_linhas_de_cabecalho_e_tabelas_externas(self):
+        html = """
+        <table class="infraTable"><tr><td>fora da área</td></tr></table>
+        <div id="divInfraAreaTabela">
+          <table class="infraTable">
+            <tr><th>Nome</th></tr>
+            <tr><td>  JOÃO
+                 SILVA </td><td>1</td></tr>
+          </table>
+          <table class="infraTable"><tr><td>segunda tabela</td></tr></table>
+        </div>
+        """
+
+        linhas = extrair_linhas_tabela(html)
+
+        assert len(linhas) == 1
+        assert linhas[0][0].texto == "JOÃO SILVA"
+        assert linhas[0][0].texto_link is None
+
+    def test_extrair_eventos_da_pagina_do_processo(self):
+        html = (FIXTURES_DIR / "processo_eventos.html").read_text(encoding="utf-8")
+
+        eventos = extrair_eventos(html)
+
+        assert [e["numero"] for e in eventos] == [15, 14, 12]
+        assert eventos[1]["descricao"] == "Juntada de Petição - Refer. ao Evento 12"
+        assert formatar_ultimo_evento(eventos) == "Conclusos para decisão\n05/04/2024 09:02"
+        assert formatar_ultimo_evento([]) is None
@@ -0,0 +1,362 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import routes.processos as rotas_processos
+from models import Busca, BuscaParte, Parte, Processo
+from utils.eproc_scraper import BUSCA_TENTATIVAS_PARTE, EProcService
+from utils.job_queue import JobQueue
+
+
+def processo(numero):
+    return {
+        "numero_processo": numero,
+        "autor": "AUTOR",
+        "reu": "RÉU",
+        "assunto": "Assunto",
+        "ultimo_evento": "Evento",
+        "link_processo": f"https://eproc/{numero}"
+    }
+
+
+@pytest.fixture
+def partes_info():
+    return [
+        {"nome": f"PARTE {i}", "cpf_cnpj": "", "link": f"link-{i}"}
+        for i in range(6)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def sem_arquivo(monkeypatch):
+    monkeypatch.setattr(EProcService, "_arquivar", lambda self, nome, dados: None)
+
+
+class TestEProcService:
+
+    def test_resultados_na_ordem_original(self, app_db, partes_info, fake_scraper, fake_pool):
+        atrasos = {"link-0": 0.05, "link-1": 0.03}
+        processos = {f"link-{i}": [processo(f"{i}-1")] for i in range(6)}
+        pool = fake_pool(fake_scraper(partes_info, processos, atrasos))
+
+        resultados = EProcService(pool=pool, workers=3).buscar_e_salvar("PARTE")
+
+        assert [r["nome_parte"] for r in resultados] == [p["nome"] for p in partes_info]
+        assert [r["processos"][0]["numero_processo"] for r in resultados] == [f"{i}-1" for i in range(6)]
+
+        db = app_db()
+        assert db.query(Parte).count() == 6
+        assert db.query(Processo).count() == 6
+        db.close()
+
+    def test_reutiliza_parte_com_nome_equivalente(self, app_db, fake_scraper, fake_pool):
+        db = app_db()
+        db.add(Parte(nome="JOSÉ DA SILVA"))
+        db.commit()
+        db.close()
+
+        partes = [{"nome": "JOSE DA SILVA", "cpf_cnpj": "", "link": "link-0"}]
+        pool = fake_pool(fake_scraper(partes, {"link-0": [processo("0-1")]}))
+        EProcService(pool=pool).buscar_e_salvar("JOSE DA SILVA")
+
+        db = app_db()
+        assert [p.nome for p in db.query(Parte)] == ["JOSÉ DA SILVA"]
+        assert db.query(Processo).count() == 1
+        db.close()
+
+    def test_reconsulta_reporta_alteracoes(self, app_db, partes_info, fake_scraper, fake_pool):
+        processos = {"link-0": [processo("0-1"), processo("0-2")]}
+        pool = fake_pool(fake_scraper(partes_info[:1], processos))
+        EProcService(pool=pool).buscar_e_salvar("PARTE")
+
+        processos["link-0"] = [processo("0-1"), {**processo("0-2"), "ultimo_evento": "Sentença"}, processo("0-3")]
+        resultados = EProcService(pool=pool).buscar_e_salvar("PARTE")
+
+        alteracoes = resultados[0]["alteracoes"]
+        assert (alteracoes["inseridos"], alteracoes["atualizados"], alteracoes["inalterados"]) == (1, 1, 1)
+        assert alteracoes["numeros_atualizados"] == ["0-2"]
+
+    def test_coleta_em_paralelo_respeita_limite(self, app_db, partes_info, fake_scraper, fake_pool):
+        atrasos = {p["link"]: 0.05 for p in partes_info}
+        pool = fake_pool(fake_scraper(partes_info, {}, atrasos))
+
+        inicio = time.monotonic()
+        EProcService(pool=pool, workers=3).buscar_e_salvar("PARTE")
+        duracao = time.monotonic() - inicio
+
+        assert pool.max_em_uso == 3
+        assert duracao < 6 * 0.05
+
+    def test_falha_isolada_por_parte(self, app_db, partes_info, fake_scraper, fake_pool):
+        processos = {f"link-{i}": [processo(f"{i}-1")] for i in range(6)}
+        pool = fake_pool(fake_scraper(partes_info, processos, falhas={"link-2"}))
+
+        resultados = EProcService(pool=pool, workers=2).buscar_e_salvar("PARTE")
+
+        assert len(resultados) == 6
+        assert resultados[2]["processos"] == []
+        assert "falha em link-2" in resultados[2]["erro"]
+        assert all("erro" not in r for i, r in enumerate(resultados) if i != 2)
+        assert pool.scraper.chamadas.count("link-2") == BUSCA_TENTATIVAS_PARTE
+        assert pool.scraper.chamadas.count("link-0") == 1
+
+    def test_repete_apenas_partes_com_falha(self, app_db, partes_info, fake_scraper, fake_pool):
+        processos = {f"link-{i}": [processo(f"{i}-1")] for i in range(6)}
+        scraper = fake_scraper(partes_info, processos)
+        falhar = {"link-2", "link-4"}
+        original = scraper.coletar_processos_da_parte
+
+        def instavel(link):
+            if link in falhar:
+                falhar.discard(link)
+                raise RuntimeError(f"timeout em {link}")
+            return original(link)
+
+        scraper.coletar_processos_da_parte = instavel
+        resultados = EProcService(pool=fake_pool(scraper), workers=2).buscar_e_salvar("PARTE")
+
+        assert all("erro" not in r for r in resultados)
+        assert [len(r["processos"]) for r in resultados] == [1] * 6
+        assert sorted(scraper.chamadas) == [f"link-{i}" for i in range(6)]
+
+
+class TestFalhasNaConsulta:
+
+    @pytest.fixture
+    def consultar(self, client, partes_info, fake_scraper, fake_pool, monkeypatch):
+        def _consultar(falhas):
+            processos = {f"link-{i}": [processo(f"{i}-1")] for i in range(2)}
+            scraper = fake_scraper(partes_info[:2], processos, falhas=falhas)
+            monkeypatch.setattr(rotas_processos, "EProcService", lambda: EProcService(pool=fake_pool(scraper)))
+            return client.get("/processos/parte")
+        return _consultar
+
+    def test_partes_com_falha_na_resposta(self, consultar):
+        resposta = consultar({"link-1"})
+
+        assert resposta.status_code == 200
+        corpo = resposta.json()
+        assert corpo["total_processos"] == 1
+        assert [(p["nome_parte"], "falha em link-1" in p["erro"]) for p in corpo["partes_com_falha"]] == [
+            ("PARTE 1", True)
+        ]
+
+    def test_todas_as_partes_falhando_nao_responde_200(self, consultar, app_db):
+        resposta = consultar({"link-0", "link-1"})
+
+        assert resposta.status_code == 502
+        assert "Nenhuma das 2 parte(s)" in resposta.json()["detail"]
+        db = app_db()
+        assert db.query(Busca).one().status == Busca.FALHOU
+        db.close()
+
+    def test_disjuntor_aberto_durante_a_coleta(self, client, partes_info, fake_scraper, fake_pool, disjuntor, monkeypatch):
+        scraper = fake_scraper(partes_info[:2], {})
+
+        def portal_caiu(link):
+            for _ in range(disjuntor.limite_falhas):
+                disjuntor.registrar_falha()
+            raise RuntimeError(f"timeout em {link}")
+
+        scraper.coletar_processos_da_parte = portal_caiu
+        monkeypatch.setattr(rotas_processos, "EProcService", lambda: EProcService(pool=fake_pool(scraper)))
+
+        resposta = client.get("/processos/parte")
+
+        assert resposta.status_code == 503
+        assert "Retry-After" in resposta.headers
+
+
+class TestAtualizacaoDireta:
+
+    @pytest.fixture
+    def scraper(self, app_db, fake_scraper, fake_pool):
+        partes = [{"nome": f"PARTE {i}", "cpf_cnpj": "", "link": f"link-{i}"} for i in range(2)]
+        compartilhado = {**processo("1"), "ultimo_evento": "Distribuído\n01/03/2024 10:00"}
+        processos = {
+            "link-0": [compartilhado, processo("2"), {**processo("3"), "link_processo": None}],
+            "link-1": [compartilhado]
+        }
+        scraper = fake_scraper(partes, processos)
+        EProcService(pool=fake_pool(scraper)).buscar_e_salvar("PARTE")
+        scraper.partes = []
+        scraper.eventos = {
+            "https://eproc/1": [{"numero": 7, "data_hora": "05/04/2024 09:02:33", "descricao": "Sentença"}],
+            "https://eproc/2": [{"numero": 3, "data_hora": "", "descricao": "Evento"}],
+        }
+        return scraper
+
+    def test_atualiza_ultimo_evento_pelo_link(self, app_db, scraper, fake_pool):
+        resultados = EProcService(pool=fake_pool(scraper), workers=2).atualizar_processos(["1", "2", "3", "9", "1"])
+
+        assert [(r["numero_processo"], r["status"]) for r in resultados] == [
+            ("1", "atualizado"), ("2", "inalterado"), ("3", "sem_link"), ("9", "nao_encontrado")
+        ]
+        assert resultados[0]["ultimo_evento"] == "Sentença\n05/04/2024 09:02"
+
+        db = app_db()
+        eventos = {p.ultimo_evento for p in db.query(Processo).filter(Processo.numero_processo == "1")}
+        assert eventos == {"Sentença\n05/04/2024 09:02"}
+        db.close()
+
+    def test_falha_isolada_por_processo(self, app_db, scraper, fake_pool):
+        scraper.falhas = {"https://eproc/1"}
+
+        resultados = EProcService(pool=fake_pool(scraper)).atualizar_processos(["1", "2"])
+
+        assert resultados[0]["status"] == "falhou"
+        assert "falha em https://eproc/1" in resultados[0]["erro"]
+        assert resultados[1]["status"] == "inalterado"
+
+    def test_numeros_desconhecidos(self, app_db, scraper, fake_pool):
+        resultados = EProcService(pool=fake_pool(scraper)).atualizar_processos(["9", "3"])
+
+        assert [r["status"] for r in resultados] == ["nao_encontrado", "sem_link"]
+
+    def test_grava_uma_vez_por_parte_sem_prender_escrita(self, app_db, scraper, monkeypatch, fake_pool):
+        from config.database import engine
+        import utils.eproc_scraper as eproc_scraper
+
+        conexoes_na_coleta = []
+        coletar = scraper.coletar_eventos_do_processo
+
+        def coletar_eventos(link):
+            conexoes_na_coleta.append(engine.pool.checkedout())
+            return coletar(link)
+
+        chamadas = []
+        upsert = eproc_scraper.upsert_processos
+
+        def contar_upsert(db, parte_id, dados):
+            chamadas.append((parte_id, sorted(d["numero_processo"] for d in dados)))
+            return upsert(db, parte_id, dados)
+
+        scraper.coletar_eventos_do_processo = coletar_eventos
+        monkeypatch.setattr(eproc_scraper, "upsert_processos", contar_upsert)
+
+        EProcService(pool=fake_pool(scraper), workers=2).atualizar_processos(["1", "2"])
+
+        assert conexoes_na_coleta == [0, 0]
+        assert sorted(numeros for _, numeros in chamadas) == [["1"], ["1", "2"]]
+
+    def test_rota_atualizar(self, app_db, scraper, monkeypatch, fake_pool):
+        from main import app
+
+        monkeypatch.setattr(rotas_processos, "EProcService", lambda: EProcService(pool=fake_pool(scraper)))
+        client = TestClient(app)
+
+        resposta = client.post("/processos/atualizar", json={"numeros": ["1", "3"]})
+
+        assert resposta.status_code == 200
+        assert resposta.json()["resumo"] == {"atualizado": 1, "sem_link": 1}
+        assert client.post("/processos/atualizar", json={"numeros": []}).status_code == 422
+
+
+class Queda(BaseException):
+    pass
+
+
+class TestRetomada:
+
+    @pytest.fixture
+    def scraper(self, partes_info, fake_scraper):
+        processos = {f"link-{i}": [processo(f"{i}-1")] for i in range(6)}
+        return fake_scraper(partes_info, processos, falhas={"link-2"})
+
+    @pytest.fixture
+    def fila(self, app_db, scraper, fake_pool):
+        return JobQueue(
+            workers=1,
+            service_factory=lambda: EProcService(pool=fake_pool(scraper), workers=2),
+            session_factory=app_db
+        )
+
+    def _checkpoint(self, app_db, busca_id):
+        db = app_db()
+        partes = db.query(BuscaParte).filter(BuscaParte.busca_id == busca_id).order_by(BuscaParte.ordem).all()
+        db.close()
+        return partes
+
+    def test_falha_persistente_fica_no_checkpoint(self, app_db, fila):
+        busca = fila.enfileirar("PARTE")
+        fila.executar(busca.id)
+
+        partes = self._checkpoint(app_db, busca.id)
+        assert [p.status for p in partes] == ["concluida"] * 2 + ["falhou"] + ["concluida"] * 3
+        assert partes[2].tentativas == BUSCA_TENTATIVAS_PARTE
+        assert "falha em link-2" in partes[2].erro
+        assert partes[0].tentativas == 1
+
+    def test_retomar_coleta_so_partes_pendentes(self, app_db, fila, scraper):
+        busca = fila.enfileirar("PARTE")
+        fila.executar(busca.id)
+        scraper.falhas = set()
+        scraper.chamadas.clear()
+
+        assert fila.retomar(busca.id)
+        assert not fila.retomar(busca.id)
+        assert fila._reivindicar() == busca.id
+        resultados = fila.executar(busca.id)
+
+        assert scraper.chamadas == ["link-2"]
+        assert scraper.buscas == 1
+        assert [r["nome_parte"] for r in resultados] == [f"PARTE {i}" for i in range(6)]
+        assert all("erro" not in r for r in resultados)
+        db = app_db()
+        concluida = db.get(Busca, busca.id)
+        assert concluida.status == Busca.CONCLUIDA
+        assert sorted(r["ordem"] for r in concluida.resultados) == list(range(6))
+        db.close()
+        assert not fila.retomar(busca.id)
+
+    def test_retoma_busca_interrompida(self, app_db, fila, scraper, fake_pool):
+        scraper.falhas = set()
+        busca = fila.enfileirar("PARTE")
+        fila._reivindicar()
+        concluidas = []
+
+        def interromper(idx, total, resultado):
+            concluidas.append(idx)
+            if len(concluidas) == 3:
+                raise Queda()
+
+        service = EProcService(pool=fake_pool(scraper), workers=1)
+        with pytest.raises(Queda):
+            fila.executar(busca.id, service=service, ao_concluir_parte=interromper)
+        scraper.chamadas.clear()
+
+        db = app_db()
+        db.get(Busca, busca.id).atualizado_em = datetime.utcnow() - timedelta(seconds=fila.lease_segundos + 1)
+        db.commit()
+        db.close()
+
+        assert fila._reivindicar() == busca.id
+        resultados = fila.executar(busca.id)
+
+        assert scraper.chamadas == ["link-3", "link-4", "link-5"]
+        assert len(resultados) == 6
+        assert [p.status for p in self._checkpoint(app_db, busca.id)] == ["concluida"] * 6
+
+    def test_rotas_partes_e_retomar(self, app_db, fila, monkeypatch):
+        from main import app
+        import utils.job_queue as job_queue
+
+        monkeypatch.setattr(job_queue, "_queue", fila)
+        client = TestClient(app)
+        busca = fila.enfileirar("PARTE")
+
+        assert client.post(f"/buscas/{busca.id}/retomar").status_code == 409
+        fila._reivindicar()
+        fila.executar(busca.id)
+
+        resposta = client.get(f"/buscas/{busca.id}/partes")
+        assert resposta.status_code == 200
+        assert resposta.json()["resumo"] == {"concluida": 5, "falhou": 1}
+        assert resposta.json()["partes"][2]["tentativas"] == BUSCA_TENTATIVAS_PARTE
+
+        resposta = client.post(f"/buscas/{busca.id}/retomar")
+        assert resposta.status_code == 202
+        assert resposta.json()["status"] == Busca.PENDENTE
+        assert client.get("/buscas/999999/partes").status_code == 404
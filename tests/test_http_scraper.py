@@ -0,0 +1,184 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from utils.http_scraper import EProcHttpScraper
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class StubEproc:
+    def __init__(self):
+        self.paginas = {
+            ("GET", "processo_consulta_publica"): "consulta_formulario.html",
+            ("POST", "processo_consulta_publica"): "consulta_partes.html",
+            ("GET", "processo_consulta_publica_parte"): "parte_processos.html",
+            ("GET", "processo_seleciona_publica"): "processo_eventos.html",
+        }
+        self.formularios = []
+        self.requisicoes = []
+        self.conexoes = set()
+
+
+@pytest.fixture
+def stub_eproc():
+    stub = StubEproc()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _responder(self, metodo):
+            query = parse_qs(urlparse(self.path).query)
+            acao = query.get("acao", [""])[0]
+            stub.requisicoes.append((metodo, acao))
+            stub.conexoes.add(self.client_address)
+
+            if metodo == "POST":
+                tamanho = int(self.headers.get("Content-Length", 0))
+                corpo = self.rfile.read(tamanho).decode("ascii")
+                stub.formularios.append(parse_qs(corpo, encoding="iso-8859-1"))
+
+            arquivo = stub.paginas.get((metodo, acao))
+            if arquivo is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            conteudo = (FIXTURES_DIR / arquivo).read_text(encoding="utf-8").encode("iso-8859-1")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=iso-8859-1")
+            self.send_header("Content-Length", str(len(conteudo)))
+            self.end_headers()
+            self.wfile.write(conteudo)
+
+        def do_GET(self):
+            self._responder("GET")
+
+        def do_POST(self):
+            self._responder("POST")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    stub.base_url = f"http://127.0.0.1:{server.server_port}/eproc/"
+    stub.url = stub.base_url + "externo_controlador.php?acao=processo_consulta_publica"
+    yield stub
+
+    server.shutdown()
+    server.server_close()
+
+
+class FakeSelenium:
+    def __init__(self):
+        self.chamadas = []
+        self.fechado = False
+
+    def buscar_partes(self, nome):
+        self.chamadas.append(("buscar_partes", nome))
+        return [{"nome": nome, "cpf_cnpj": "", "link": None}]
+
+    def coletar_processos_da_parte(self, link_parte):
+        self.chamadas.append(("coletar_processos_da_parte", link_parte))
+        return []
+
+    def close(self):
+        self.fechado = True
+
+
+class TestEProcHttpScraper:
+
+    def test_buscar_partes_envia_formulario(self, stub_eproc):
+        scraper = EProcHttpScraper(url=stub_eproc.url, fallback_factory=FakeSelenium)
+
+        partes = scraper.buscar_partes("JOSÉ DA SILVA")
+        scraper.close()
+
+        formulario = stub_eproc.formularios[0]
+        assert formulario["txtStrParte"] == ["JOSÉ DA SILVA"]
+        assert formulario["hdnToken"] == ["tok-42"]
+        assert formulario["selTipoPessoa"] == ["F"]
+        assert formulario["sbmNovo"] == ["Consultar"]
+
+        assert len(partes) == 2
+        assert partes[0]["nome"] == "ADILSON DA SILVA"
+        assert partes[0]["cpf_cnpj"] == "123.456.789-00"
+        assert partes[0]["link"] == (
+            stub_eproc.base_url + "externo_controlador.php?acao=processo_consulta_publica_parte&id=1"
+        )
+        assert partes[1]["nome"] == "ADILSON DA SILVA SANTOS"
+        assert partes[1]["cpf_cnpj"] == ""
+
+    def test_coletar_processos_da_parte(self, stub_eproc):
+        scraper = EProcHttpScraper(url=stub_eproc.url, fallback_factory=FakeSelenium)
+        link = stub_eproc.base_url + "externo_controlador.php?acao=processo_consulta_publica_parte&id=1"
+
+        processos = scraper.coletar_processos_da_parte(link)
+        scraper.close()
+
+        assert len(processos) == 2
+        assert processos[0]["numero_processo"] == "5000001-11.2024.8.13.0024"
+        assert processos[0]["reu"] == "BANCO XYZ S.A."
+        assert processos[0]["ultimo_evento"] == "Conclusos para decisão\n12/03/2024 10:15"
+        assert processos[0]["link_processo"].endswith("num_processo=50000011120248130024")
+        assert processos[1]["autor"] == "MUNICÍPIO DE BELO HORIZONTE"
+        assert processos[1]["assunto"] == "IPTU & Taxas"
+
+    def test_erro_ao_coletar_processos_propaga(self, stub_eproc):
+        scraper = EProcHttpScraper(url=stub_eproc.url, fallback_factory=FakeSelenium)
+        link = stub_eproc.base_url + "externo_controlador.php?acao=inexistente"
+
+        with pytest.raises(requests.HTTPError):
+            scraper.coletar_processos_da_parte(link)
+        scraper.close()
+
+    def test_coletar_eventos_do_processo(self, stub_eproc):
+        scraper = EProcHttpScraper(url=stub_eproc.url, fallback_factory=FakeSelenium)
+        link = stub_eproc.base_url + "externo_controlador.php?acao=processo_seleciona_publica&num_processo=1"
+
+        eventos = scraper.coletar_eventos_do_processo(link)
+        scraper.close()
+
+        assert stub_eproc.requisicoes == [("GET", "processo_seleciona_publica")]
+        assert [e["numero"] for e in eventos] == [15, 14, 12]
+        assert eventos[0]["descricao"] == "Conclusos para decisão"
+
+    def test_sem_resultados_nao_usa_navegador(self, stub_eproc):
+        stub_eproc.paginas[("POST", "processo_consulta_publica")] = "sem_resultados.html"
+        fallback = FakeSelenium()
+        scraper = EProcHttpScraper(url=stub_eproc.url, fallback_factory=lambda: fallback)
+
+        assert scraper.buscar_partes("NINGUEM") == []
+        assert fallback.chamadas == []
+
+    def test_captcha_usa_selenium(self, stub_eproc):
+        stub_eproc.paginas[("GET", "processo_consulta_publica")] = "captcha.html"
+        fallback = FakeSelenium()
+        scraper = EProcHttpScraper(url=stub_eproc.url, fallback_factory=lambda: fallback)
+
+        partes = scraper.buscar_partes("MARIA")
+        scraper.close()
+
+        assert fallback.chamadas == [("buscar_partes", "MARIA")]
+        assert partes[0]["nome"] == "MARIA"
+        assert fallback.fechado
+        assert stub_eproc.formularios == []
+
+    def test_reutiliza_conexao_http(self, stub_eproc):
+        scraper = EProcHttpScraper(url=stub_eproc.url, fallback_factory=FakeSelenium)
+        link = stub_eproc.base_url + "externo_controlador.php?acao=processo_consulta_publica_parte&id=1"
+
+        scraper.buscar_partes("ADILSON")
+        scraper.coletar_processos_da_parte(link)
+        scraper.close()
+
+        assert len(stub_eproc.requisicoes) == 3
+        assert len(stub_eproc.conexoes) == 1
@@ -0,0 +1,144 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import utils.job_queue as job_queue
+from models import Busca, BuscaParte
+from utils.job_queue import JobQueue
+
+
+@pytest.fixture
+def fila(app_db, fake_service):
+    fake_service.partes = 2
+    return JobQueue(workers=1, service_factory=fake_service, session_factory=app_db)
+
+
+class TestJobQueue:
+
+    def test_enfileirar_cria_busca_pendente(self, fila):
+        busca = fila.enfileirar("MARIA")
+
+        assert busca.id is not None
+        assert busca.status == Busca.PENDENTE
+
+    def test_enfileirar_se_ausente_agrupa_variacoes_do_nome(self, fila):
+        primeira = fila.enfileirar_se_ausente("JOSÉ DA SILVA")
+        segunda = fila.enfileirar_se_ausente("JOSE  DA SILVA")
+
+        assert segunda.id == primeira.id
+
+    def test_reivindicar_e_executar(self, fila, app_db):
+        busca = fila.enfileirar("MARIA")
+
+        assert fila._reivindicar() == busca.id
+        assert fila._reivindicar() is None
+        fila.executar(busca.id)
+
+        db = app_db()
+        concluida = db.get(Busca, busca.id)
+        assert concluida.status == Busca.CONCLUIDA
+        assert concluida.partes_concluidas == 2
+        assert [r["nome_parte"] for r in concluida.resultados] == ["MARIA 0", "MARIA 1"]
+        assert concluida.finalizado_em is not None
+        db.close()
+
+    def test_falha_preserva_resultados_parciais(self, fila, fake_service, app_db):
+        fake_service.erro = "timeout"
+        busca = fila.enfileirar("JOSE")
+
+        fila.executar(fila._reivindicar())
+
+        db = app_db()
+        falha = db.get(Busca, busca.id)
+        assert falha.status == Busca.FALHOU
+        assert falha.erro == "timeout"
+        assert len(falha.resultados) == 1
+        assert falha.resultado is None
+        db.close()
+
+    def test_resultados_ficam_so_nas_partes_da_busca(self, fila, app_db):
+        busca = fila.enfileirar("MARIA")
+        progresso = []
+
+        def acompanhar(idx, total, resultado):
+            db = app_db()
+            parcial = db.get(Busca, busca.id)
+            progresso.append((parcial.partes_concluidas, parcial.resultado, len(parcial.resultados)))
+            db.close()
+
+        fila.executar(fila._reivindicar(), ao_concluir_parte=acompanhar)
+
+        db = app_db()
+        concluida = db.get(Busca, busca.id)
+        assert progresso == [(1, None, 1), (2, None, 2)]
+        assert concluida.resultado is None
+        assert [r["ordem"] for r in concluida.resultados] == [0, 1]
+        assert [p.status for p in concluida.partes] == [BuscaParte.CONCLUIDA] * 2
+        db.close()
+
+    def test_recupera_busca_abandonada(self, fila, app_db):
+        busca = fila.enfileirar("ANA")
+        db = app_db()
+        abandonada = db.get(Busca, busca.id)
+        abandonada.status = Busca.EXECUTANDO
+        db.commit()
+        abandonada.atualizado_em = datetime.utcnow() - timedelta(hours=1)
+        db.commit()
+        db.close()
+
+        assert fila._reivindicar() == busca.id
+
+    def test_workers_processam_fila(self, fila, app_db):
+        busca = fila.enfileirar("PEDRO")
+        fila.poll_intervalo = 0.01
+        fila.start()
+        try:
+            for _ in range(200):
+                db = app_db()
+                status = db.get(Busca, busca.id).status
+                db.close()
+                if status in Busca.FINALIZADOS:
+                    break
+                time.sleep(0.01)
+        finally:
+            fila.stop()
+
+        assert status == Busca.CONCLUIDA
+
+
+class TestRotasBuscas:
+
+    @pytest.fixture
+    def client(self, fila, monkeypatch):
+        from main import app
+        monkeypatch.setattr(job_queue, "_queue", fila)
+        return TestClient(app)
+
+    def test_criar_e_consultar_busca(self, client, fila):
+        resposta = client.post("/buscas", json={"nome": " maria silva "})
+
+        assert resposta.status_code == 202
+        corpo = resposta.json()
+        assert corpo["nome"] == "MARIA SILVA"
+        assert corpo["status"] == Busca.PENDENTE
+
+        fila.executar(fila._reivindicar())
+
+        status = client.get(f"/buscas/{corpo['id']}").json()
+        assert status["status"] == Busca.CONCLUIDA
+        assert len(status["resultados"]) == 2
+
+    def test_busca_inexistente(self, client):
+        assert client.get("/buscas/999").status_code == 404
+
+    def test_eventos_sse(self, client, fila):
+        busca_id = client.post("/buscas", json={"nome": "ANA"}).json()["id"]
+        fila.executar(fila._reivindicar())
+
+        resposta = client.get(f"/buscas/{busca_id}/eventos")
+
+        assert resposta.headers["content-type"].startswith("text/event-stream")
+        assert resposta.text.count("event: parte") == 2
+        assert '"status":"concluida"' in resposta.text
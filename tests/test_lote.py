@@ -0,0 +1,105 @@
+import json
+import time
+from datetime import datetime
+
+from models import Busca, Parte, Processo
+from utils.lote import LOTE_MAXIMO_NOMES, deduplicar
+
+
+def registrar(app_db, nome):
+    db = app_db()
+    parte = Parte(nome=nome, ultima_coleta_em=datetime.utcnow())
+    db.add(parte)
+    db.flush()
+    db.add(Processo(parte_id=parte.id, numero_processo=f"{nome}-banco"))
+    busca = Busca(nome=nome, status=Busca.CONCLUIDA, finalizado_em=datetime.utcnow())
+    busca.resultados = [{"nome_parte": nome, "cpf_cnpj": "", "link": None, "processos": []}]
+    db.add(busca)
+    db.commit()
+    db.close()
+
+
+def linhas(resposta):
+    return [json.loads(linha) for linha in resposta.text.splitlines()]
+
+
+class TestDeduplicar:
+
+    def test_normaliza_e_mantem_a_primeira_grafia(self):
+        assert deduplicar(["José da Silva", "JOSE  DA  SILVA", " maria ", "", "Maria"]) == ["JOSÉ DA SILVA", "MARIA"]
+
+
+class TestRotaLote:
+
+    def test_banco_e_coleta_no_mesmo_lote(self, client, app_db, fake_service):
+        registrar(app_db, "CARLOS")
+
+        resposta = client.post("/processos/lote", json={"nomes": ["carlos", "ana", "Carlos", "bia"]})
+
+        assert resposta.status_code == 200
+        assert resposta.headers["content-type"].startswith("application/x-ndjson")
+        *itens, resumo = linhas(resposta)
+        por_nome = {item["nome_consultado"]: item for item in itens}
+
+        assert itens[0]["nome_consultado"] == "CARLOS"
+        assert por_nome["CARLOS"]["origem"] == "database"
+        assert por_nome["CARLOS"]["cache"] == "HIT"
+        assert por_nome["CARLOS"]["processos"][0]["numero_processo"] == "CARLOS-banco"
+        assert por_nome["ANA"]["origem"] == "scraper"
+        assert por_nome["BIA"]["total_processos"] == 1
+        assert sorted(fake_service.coletados) == ["ANA", "BIA"]
+        assert fake_service.instancias == 1
+        assert resumo["resumo"]["recebidos"] == 4
+        assert resumo["resumo"]["unicos"] == 3
+        assert resumo["resumo"]["concluido"] == 3
+
+    def test_sem_coleta_nao_cria_service(self, client, app_db, fake_service):
+        registrar(app_db, "CARLOS")
+
+        *_, resumo = linhas(client.post("/processos/lote", json={"nomes": ["CARLOS"]}))
+
+        assert resumo["resumo"]["concluido"] == 1
+        assert fake_service.instancias == 0
+
+    def test_erro_por_nome(self, client, fake_service):
+        fake_service.falhas = {"ANA"}
+
+        *itens, resumo = linhas(client.post("/processos/lote", json={"nomes": ["ANA", "BIA"]}))
+        por_nome = {item["nome_consultado"]: item for item in itens}
+
+        assert por_nome["ANA"]["status"] == "falhou"
+        assert "falha em ANA" in por_nome["ANA"]["erro"]
+        assert por_nome["BIA"]["status"] == "concluido"
+        assert resumo["resumo"]["falhou"] == 1
+
+    def test_prazo_esgotado(self, client, app_db, fake_service):
+        fake_service.lentos = {"LENTO"}
+
+        try:
+            inicio = time.perf_counter()
+            resposta = client.post("/processos/lote", json={"nomes": ["LENTO", "ANA"], "prazo_segundos": 0.3})
+            duracao = time.perf_counter() - inicio
+        finally:
+            fake_service.liberar.set()
+
+        *itens, resumo = linhas(resposta)
+        por_nome = {item["nome_consultado"]: item for item in itens}
+
+        assert duracao < 2
+        assert por_nome["LENTO"]["status"] == "prazo_esgotado"
+        assert por_nome["ANA"]["status"] == "concluido"
+        assert resumo["resumo"]["prazo_esgotado"] == 1
+
+        limite = time.monotonic() + 5
+        while time.monotonic() < limite:
+            db = app_db()
+            status = db.query(Busca.status).filter(Busca.nome == "LENTO").scalar()
+            db.close()
+            if status in Busca.FINALIZADOS:
+                break
+            time.sleep(0.01)
+
+    def test_validacao(self, client):
+        assert client.post("/processos/lote", json={"nomes": []}).status_code == 422
+        assert client.post("/processos/lote", json={"nomes": ["A"] * (LOTE_MAXIMO_NOMES + 1)}).status_code == 422
+        assert client.post("/processos/lote", json={"nomes": ["A"], "prazo_segundos": 0}).status_code == 422
@@ -0,0 +1,121 @@
+import logging
+from datetime import datetime
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from models import Busca, Parte, Processo
+from utils.cache import HIT
+from utils.eproc_scraper import BUSCA_TENTATIVAS_PARTE, EProcService
+from utils.logs import FormatadorJSON, RequestIdFilter, request_id
+from utils.metricas import REGISTRO
+
+
+@pytest.fixture
+def scraper(fake_scraper):
+    return fake_scraper(
+        [{"nome": "PARTE 0", "cpf_cnpj": "", "link": "link-0"},
+         {"nome": "PARTE 1", "cpf_cnpj": "", "link": "link-1"}],
+        {"link-0": [{"numero_processo": "1", "autor": "A"}]},
+        falhas={"link-1"}
+    )
+
+
+def amostra(nome, **rotulos):
+    return REGISTRO.get_sample_value(nome, rotulos) or 0
+
+
+@pytest.fixture(autouse=True)
+def sem_arquivo(monkeypatch):
+    monkeypatch.setattr(EProcService, "_arquivar", lambda self, nome, dados: None)
+
+
+class TestInstrumentacao:
+
+    def test_etapas_e_erros_da_coleta(self, app_db, scraper, fake_pool):
+        antes = {etapa: amostra("eproc_etapa_segundos_count", etapa=etapa)
+                 for etapa in ("buscar_partes", "coletar_processos", "salvar_processos")}
+        erros = amostra("eproc_erros_total", etapa="coletar_processos", tipo="RuntimeError")
+
+        EProcService(pool=fake_pool(scraper), workers=2).buscar_e_salvar("PARTE")
+
+        assert amostra("eproc_etapa_segundos_count", etapa="buscar_partes") == antes["buscar_partes"] + 1
+        assert amostra("eproc_etapa_segundos_count", etapa="coletar_processos") == antes["coletar_processos"] + 1 + BUSCA_TENTATIVAS_PARTE
+        assert amostra("eproc_etapa_segundos_count", etapa="salvar_processos") == antes["salvar_processos"] + 2
+        assert amostra("eproc_erros_total", etapa="coletar_processos", tipo="RuntimeError") == erros + BUSCA_TENTATIVAS_PARTE
+
+    def test_request_id_chega_as_threads_de_coleta(self, app_db, scraper, fake_pool):
+        token = request_id.set("req-123")
+        try:
+            EProcService(pool=fake_pool(scraper), workers=2).buscar_e_salvar("PARTE")
+        finally:
+            request_id.reset(token)
+
+        assert scraper.request_ids == ["req-123"] * (1 + BUSCA_TENTATIVAS_PARTE)
+
+
+class TestEndpoint:
+
+    @pytest.fixture
+    def client(self, app_db):
+        from main import app
+        return TestClient(app)
+
+    def test_metrics_expoe_etapas_e_http(self, client):
+        client.get("/processos", params={"limit": 1})
+
+        resposta = client.get("/metrics")
+
+        assert resposta.status_code == 200
+        assert resposta.headers["content-type"] == CONTENT_TYPE_LATEST
+        assert "# TYPE eproc_etapa_segundos histogram" in resposta.text
+        assert 'eproc_etapa_segundos_count{etapa="serializar_json"}' in resposta.text
+        assert 'eproc_http_requisicoes_total{metodo="GET",rota="/processos",status="200"}' in resposta.text
+        assert 'eproc_drivers{estado="em_uso"}' in resposta.text
+
+    def test_cache_contabilizado(self, client, app_db):
+        db = app_db()
+        parte = Parte(nome="CARLOS", ultima_coleta_em=datetime.utcnow())
+        db.add(parte)
+        db.flush()
+        db.add(Processo(parte_id=parte.id, numero_processo="001"))
+        busca = Busca(nome="CARLOS", status=Busca.CONCLUIDA, finalizado_em=datetime.utcnow())
+        busca.resultados = [{"nome_parte": "CARLOS", "cpf_cnpj": "1", "link": None, "processos": []}]
+        db.add(busca)
+        db.commit()
+        db.close()
+        hits = amostra("eproc_cache_total", estado=HIT)
+
+        assert client.get("/processos/CARLOS").status_code == 200
+        assert amostra("eproc_cache_total", estado=HIT) == hits + 1
+
+    def test_request_id_gerado_ou_repassado(self, client):
+        gerado = client.get("/health").headers["x-request-id"]
+        repassado = client.get("/health", headers={"X-Request-ID": "abc-123"}).headers["x-request-id"]
+        invalido = client.get("/health", headers={"X-Request-ID": "com espaco"}).headers["x-request-id"]
+
+        assert len(gerado) == 16
+        assert repassado == "abc-123"
+        assert invalido not in ("com espaco", gerado)
+
+
+class TestLogs:
+
+    def test_formatador_json_inclui_request_id_e_extras(self):
+        registro = logging.makeLogRecord({
+            "name": "eproc", "levelname": "INFO", "msg": "coletados %d", "args": (3,), "etapas": {"a": 1}
+        })
+        token = request_id.set("req-9")
+        try:
+            RequestIdFilter().filter(registro)
+        finally:
+            request_id.reset(token)
+
+        linha = orjson.loads(FormatadorJSON().format(registro))
+
+        assert linha["request_id"] == "req-9"
+        assert linha["mensagem"] == "coletados 3"
+        assert linha["nivel"] == "INFO"
+        assert linha["etapas"] == {"a": 1}
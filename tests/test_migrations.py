@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+
+from config.migrations import MIGRACOES, aplicar_migracoes
+from models import Processo
+
+
+class TestMigracoes:
+
+    def test_atualiza_banco_antigo(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path}/antigo.db")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE partes (id INTEGER PRIMARY KEY, nome VARCHAR NOT NULL UNIQUE)"))
+            conn.execute(text(
+                "CREATE TABLE processos (id INTEGER PRIMARY KEY, numero_processo VARCHAR NOT NULL, "
+                "autor VARCHAR, reu VARCHAR, assunto TEXT, ultimo_evento TEXT, link_processo TEXT, "
+                "criado_em DATETIME NOT NULL, atualizado_em DATETIME, parte_id INTEGER NOT NULL)"
+            ))
+            conn.execute(text("INSERT INTO partes (id, nome) VALUES (1, 'MARIA JOSÉ')"))
+            for evento in ("antigo", "intermediario", "recente"):
+                conn.execute(text(
+                    "INSERT INTO processos (numero_processo, ultimo_evento, criado_em, parte_id) "
+                    "VALUES ('123', :evento, CURRENT_TIMESTAMP, 1)"
+                ), {"evento": evento})
+
+        aplicadas = aplicar_migracoes(engine)
+
+        colunas = {c["name"] for c in inspect(engine).get_columns("partes")}
+        assert "ultima_coleta_em" in colunas
+        assert aplicadas == [versao for versao, _, _ in MIGRACOES]
+
+        with engine.connect() as conn:
+            restantes = conn.execute(text("SELECT ultimo_evento, hash_conteudo FROM processos")).all()
+        assert [r.ultimo_evento for r in restantes] == ["recente"]
+        assert restantes[0].hash_conteudo == Processo.calcular_hash({"ultimo_evento": "recente"})
+        indices = {i["name"]: i for i in inspect(engine).get_indexes("processos")}
+        assert indices["uq_processos_parte_numero"]["unique"]
+        assert indices["ix_processos_parte_atualizado"]["column_names"] == ["parte_id", "atualizado_em", "id"]
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT nome_normalizado FROM partes")).scalar() == "maria jose"
+            assert conn.execute(text(
+                "SELECT rowid FROM partes_trigrama WHERE partes_trigrama MATCH '\"ia jo\"'"
+            )).all() == [(1,)]
+
+    def test_atualizado_em_preenchido_e_obrigatorio(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path}/antigo.db")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE partes (id INTEGER PRIMARY KEY, nome VARCHAR NOT NULL UNIQUE)"))
+            conn.execute(text(
+                "CREATE TABLE processos (id INTEGER PRIMARY KEY, numero_processo VARCHAR NOT NULL, "
+                "autor VARCHAR, reu VARCHAR, assunto TEXT, ultimo_evento TEXT, link_processo TEXT, "
+                "criado_em DATETIME NOT NULL, atualizado_em DATETIME, parte_id INTEGER NOT NULL)"
+            ))
+            conn.execute(text("INSERT INTO partes (id, nome) VALUES (1, 'MARIA')"))
+            conn.execute(text(
+                "INSERT INTO processos (numero_processo, criado_em, parte_id) "
+                "VALUES ('123', '2024-01-02 03:04:05', 1)"
+            ))
+
+        aplicar_migracoes(engine)
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT atualizado_em FROM processos")).scalar() == "2024-01-02 03:04:05"
+        with pytest.raises(IntegrityError):
+            with engine.begin() as conn:
+                conn.execute(text(
+                    "INSERT INTO processos (numero_processo, criado_em, parte_id) "
+                    "VALUES ('456', CURRENT_TIMESTAMP, 1)"
+                ))
+        with pytest.raises(IntegrityError):
+            with engine.begin() as conn:
+                conn.execute(text("UPDATE processos SET atualizado_em = NULL"))
+
+    def test_remove_copia_dos_resultados_ja_guardados_nas_partes(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path}/antigo.db")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE partes (id INTEGER PRIMARY KEY, nome VARCHAR NOT NULL UNIQUE)"))
+            conn.execute(text(
+                "CREATE TABLE processos (id INTEGER PRIMARY KEY, numero_processo VARCHAR NOT NULL, "
+                "autor VARCHAR, reu VARCHAR, assunto TEXT, ultimo_evento TEXT, link_processo TEXT, "
+                "criado_em DATETIME NOT NULL, atualizado_em DATETIME, parte_id INTEGER NOT NULL)"
+            ))
+            conn.execute(text("CREATE TABLE buscas (id INTEGER PRIMARY KEY, nome VARCHAR NOT NULL, resultado TEXT)"))
+            conn.execute(text(
+                "CREATE TABLE buscas_partes (id INTEGER PRIMARY KEY, busca_id INTEGER NOT NULL, "
+                "ordem INTEGER NOT NULL, nome VARCHAR NOT NULL, resultado TEXT)"
+            ))
+            conn.execute(text(
+                "INSERT INTO buscas (id, nome, resultado) VALUES "
+                "(1, 'ANA', '[{\"ordem\": 0}]'), (2, 'JOSE', '[{\"ordem\": 0}]'), (3, 'LIA', '[]')"
+            ))
+            conn.execute(text(
+                "INSERT INTO buscas_partes (busca_id, ordem, nome, resultado) VALUES "
+                "(1, 0, 'ANA', '{}'), (2, 0, 'JOSE', '{}'), (2, 1, 'JOSE 1', NULL)"
+            ))
+
+        aplicar_migracoes(engine)
+
+        with engine.connect() as conn:
+            restantes = dict(conn.execute(text("SELECT id, resultado FROM buscas")).all())
+        assert restantes == {1: None, 2: '[{"ordem": 0}]', 3: "[]"}
+
+    def test_migracoes_sao_idempotentes(self, engine):
+        aplicar_migracoes(engine)
+
+        assert aplicar_migracoes(engine) == []
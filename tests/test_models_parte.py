@@ -1,6 +1,9 @@
 import pytest
+from sqlalchemy import inspect
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload, undefer
 from models.parte import Parte
+from models.processo import Processo
 
 class TestParteModel:
     
@@ -30,6 +33,11 @@ class TestParteModel:
         with pytest.raises(IntegrityError):
             session.commit()
     
+    def test_nome_normalizado(self, session, parte_factory):
+        parte = parte_factory(nome="JOSÉ  da Silva")
+
+        assert parte.nome_normalizado == "jose da silva"
+
     def test_parte_to_dict(self, session, parte_factory):
         parte = parte_factory(nome="PEDRO OLIVEIRA")
         
@@ -77,3 +85,33 @@ class TestParteModel:
         session.refresh(parte)
         
         assert parte.nome == "NOME NOVO"
+
+    def test_listar_partes_com_totais_em_uma_consulta(self, engine, session, contar_sql):
+        for i in range(5):
+            parte = Parte(nome=f"PARTE {i}")
+            session.add(parte)
+            session.flush()
+            session.add_all([Processo(parte_id=parte.id, numero_processo=f"{i}-{n}") for n in range(20 * i)])
+        session.commit()
+        session.expunge_all()
+
+        with contar_sql(engine) as comandos:
+            partes = session.query(Parte).options(
+                raiseload(Parte.processos), undefer(Parte.total_processos)
+            ).order_by(Parte.id).all()
+            totais = [parte.to_dict()["total_processos"] for parte in partes]
+
+        assert totais == [0, 20, 40, 60, 80]
+        assert len(comandos) == 1
+        assert all("processos" not in inspect(parte).dict for parte in partes)
+
+    def test_carregar_parte_nao_carrega_processos(self, engine, session, parte_factory, processo_factory, contar_sql):
+        parte = parte_factory(nome="LUCIA")
+        processo_factory(parte_id=parte.id)
+        session.expunge_all()
+
+        with contar_sql(engine) as comandos:
+            parte = session.query(Parte).filter(Parte.nome == "LUCIA").one()
+
+        assert len(comandos) == 1
+        assert "processos" not in inspect(parte).dict
@@ -0,0 +1,250 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+
+import utils.job_queue as job_queue
+from models import Monitorado, Verificacao
+from utils.eproc_scraper import EProcService
+from utils.job_queue import JobQueue
+from utils.monitoramento import MONITORAMENTO_INTERVALO_MINIMO, SEGUNDOS_POR_DIA, Agendador, monitorar, pontuacao
+
+
+def processo(numero, evento="Distribuído"):
+    return {"numero_processo": numero, "autor": "A", "reu": "R", "assunto": "S", "ultimo_evento": evento}
+
+
+@pytest.fixture(autouse=True)
+def sem_arquivo(monkeypatch):
+    monkeypatch.setattr(EProcService, "_arquivar", lambda self, nome, dados: None)
+
+
+@pytest.fixture
+def scraper(fake_scraper):
+    return fake_scraper(processos={"link-0": [processo("1"), processo("2")]})
+
+
+@pytest.fixture
+def agendador(app_db, scraper, fake_pool, monkeypatch):
+    monkeypatch.setattr(job_queue, "_queue", JobQueue(workers=1, session_factory=app_db))
+    return Agendador(
+        orcamento_diario=86400,
+        service_factory=lambda: EProcService(pool=fake_pool(scraper), workers=1),
+        session_factory=app_db
+    )
+
+
+def vencer(app_db, monitorado_id):
+    db = app_db()
+    monitorado = db.get(Monitorado, monitorado_id)
+    monitorado.proxima_em = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    db.close()
+
+
+class TestMonitorar:
+
+    def test_nomes_equivalentes_sao_o_mesmo_monitorado(self, app_db):
+        db = app_db()
+        primeiro = monitorar(db, "JOSÉ DA SILVA", intervalo_segundos=7200)
+        segundo = monitorar(db, "Jose  da Silva", intervalo_segundos=3600, prioridade=2)
+
+        assert primeiro.id == segundo.id
+        assert (segundo.nome, segundo.intervalo_segundos, segundo.prioridade) == ("JOSÉ DA SILVA", 3600, 2)
+        assert db.query(Monitorado).count() == 1
+        db.close()
+
+    def test_reduzir_intervalo_antecipa_a_proxima(self, app_db):
+        db = app_db()
+        monitorado = monitorar(db, "CARLOS", intervalo_segundos=86400)
+        db.query(Monitorado).update({"proxima_em": datetime.utcnow() + timedelta(days=1)})
+        db.commit()
+
+        atual = monitorar(db, "CARLOS", intervalo_segundos=3600)
+        db.close()
+
+        assert atual.id == monitorado.id
+        assert atual.proxima_em <= datetime.utcnow() + timedelta(hours=1)
+
+    def test_cadastros_simultaneos_em_processos_diferentes(self, app_db):
+        engines = [create_engine(app_db.kw["bind"].url, connect_args={"timeout": 10}) for _ in range(4)]
+        barreira = threading.Barrier(len(engines))
+        erros = []
+
+        def cadastrar(engine):
+            db = sessionmaker(bind=engine)()
+            try:
+                for i in range(20):
+                    barreira.wait()
+                    monitorar(db, f"PARTE {i}", intervalo_segundos=3600)
+            except Exception as e:
+                erros.append(e)
+                barreira.abort()
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=cadastrar, args=(engine,)) for engine in engines]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for engine in engines:
+            engine.dispose()
+
+        assert erros == []
+        db = app_db()
+        assert db.query(Monitorado).count() == 20
+        db.close()
+
+    def test_primeira_verificacao_distribuida_no_intervalo(self, app_db):
+        db = app_db()
+        agora = datetime.utcnow()
+        proximas = [monitorar(db, f"PARTE {i}", intervalo_segundos=86400).proxima_em for i in range(50)]
+        db.close()
+
+        assert all(agora <= p <= agora + timedelta(days=1, seconds=1) for p in proximas)
+        assert max(proximas) - min(proximas) > timedelta(hours=12)
+
+    def test_intervalo_minimo(self, app_db):
+        db = app_db()
+        assert monitorar(db, "ANA", intervalo_segundos=1).intervalo_segundos == MONITORAMENTO_INTERVALO_MINIMO
+        db.close()
+
+    def test_pontuacao_prefere_atrasados_e_que_mudam(self):
+        agora = datetime.utcnow()
+        base = dict(intervalo_segundos=3600, prioridade=0, ultima_verificacao_em=agora, verificacoes=10)
+        estavel = Monitorado(nome="A", proxima_em=agora, verificacoes_com_alteracao=0, **base)
+        muda = Monitorado(nome="B", proxima_em=agora, verificacoes_com_alteracao=8, **base)
+        atrasado = Monitorado(nome="C", proxima_em=agora - timedelta(hours=3), verificacoes_com_alteracao=0, **base)
+
+        ordem = sorted([estavel, muda, atrasado], key=lambda m: pontuacao(m, agora), reverse=True)
+
+        assert [m.nome for m in ordem] == ["C", "B", "A"]
+
+
+class TestAgendador:
+
+    def test_registra_diferencas_entre_verificacoes(self, app_db, agendador, scraper):
+        db = app_db()
+        monitorado = monitorar(db, "CARLOS", intervalo_segundos=3600)
+        db.close()
+        vencer(app_db, monitorado.id)
+
+        primeira = agendador.executar_proximo()
+        assert (primeira["inseridos"], primeira["atualizados"]) == (2, 0)
+
+        scraper.processos["link-0"] = [processo("1", "Sentença"), processo("2"), processo("3")]
+        vencer(app_db, monitorado.id)
+        segunda = agendador.executar_proximo()
+
+        assert (segunda["inseridos"], segunda["atualizados"], segunda["inalterados"]) == (1, 1, 1)
+        assert segunda["partes_alteradas"] == [{
+            "nome_parte": "CARLOS",
+            "inseridos": ["3"],
+            "atualizados": [{"numero_processo": "1", "ultimo_evento": "Sentença"}]
+        }]
+
+        db = app_db()
+        atual = db.get(Monitorado, monitorado.id)
+        assert (atual.verificacoes, atual.verificacoes_com_alteracao) == (2, 2)
+        assert atual.proxima_em > datetime.utcnow() + timedelta(minutes=59)
+        assert db.query(Verificacao).count() == 2
+        db.close()
+
+    def test_cada_verificacao_usa_um_service_novo(self, app_db, agendador):
+        criar = agendador.service_factory
+        services = []
+        agendador.service_factory = lambda: services.append(criar()) or services[-1]
+        db = app_db()
+        monitorado = monitorar(db, "CARLOS", intervalo_segundos=3600)
+        db.close()
+
+        for _ in range(2):
+            vencer(app_db, monitorado.id)
+            agendador.executar_proximo()
+
+        assert len(services) == 2
+        assert [len(s.cronometro.etapas["buscar_partes"]) for s in services] == [1, 1]
+
+    def test_nada_vencido(self, app_db, agendador):
+        db = app_db()
+        monitorar(db, "CARLOS", intervalo_segundos=3600)
+        db.query(Monitorado).update({"proxima_em": datetime.utcnow() + timedelta(hours=1)})
+        db.commit()
+        db.close()
+
+        assert agendador.executar_proximo() is None
+
+    def test_falha_reagenda_com_backoff(self, app_db, agendador, scraper):
+        db = app_db()
+        monitorado = monitorar(db, "CARLOS", intervalo_segundos=86400)
+        db.close()
+        vencer(app_db, monitorado.id)
+        scraper.fora_do_ar = True
+
+        verificacao = agendador.executar_proximo()
+
+        assert verificacao["status"] == Verificacao.FALHOU
+        assert "eproc fora do ar" in verificacao["erro"]
+        db = app_db()
+        atual = db.get(Monitorado, monitorado.id)
+        assert atual.falhas_consecutivas == 1
+        assert atual.proxima_em < datetime.utcnow() + timedelta(seconds=MONITORAMENTO_INTERVALO_MINIMO + 5)
+        db.close()
+
+    def test_orcamento_espaca_verificacoes_pelo_custo(self, app_db, agendador):
+        agendador.orcamento.intervalo_minimo = 10
+        db = app_db()
+        monitorado = monitorar(db, "CARLOS", intervalo_segundos=3600)
+        db.close()
+        vencer(app_db, monitorado.id)
+
+        agendador.executar_proximo()
+
+        assert agendador.orcamento.consumir(0) == pytest.approx(10, abs=1)
+
+    def test_orcamento_e_compartilhado_entre_workers(self, app_db, agendador):
+        outro = Agendador(orcamento_diario=SEGUNDOS_POR_DIA // 10, session_factory=app_db)
+        agendador.orcamento.intervalo_minimo = 10
+        db = app_db()
+        monitorado = monitorar(db, "CARLOS", intervalo_segundos=3600)
+        db.close()
+        vencer(app_db, monitorado.id)
+
+        agendador.executar_proximo()
+
+        assert outro.orcamento.consumir(0) == pytest.approx(10, abs=1)
+
+
+class TestRotas:
+
+    @pytest.fixture
+    def client(self, app_db):
+        from main import app
+        return TestClient(app)
+
+    def test_crud_e_historico(self, client, app_db, agendador):
+        criado = client.post("/monitorados", json={"nome": "carlos", "intervalo_segundos": 3600})
+        assert criado.status_code == 201
+        monitorado_id = criado.json()["id"]
+        assert criado.json()["nome"] == "CARLOS"
+
+        vencer(app_db, monitorado_id)
+        agendador.executar_proximo()
+
+        assert [m["id"] for m in client.get("/monitorados").json()["monitorados"]] == [monitorado_id]
+        historico = client.get(f"/monitorados/{monitorado_id}/verificacoes").json()
+        assert historico["verificacoes"][0]["inseridos"] == 2
+
+        assert client.delete(f"/monitorados/{monitorado_id}").status_code == 204
+        assert client.get(f"/monitorados/{monitorado_id}").status_code == 404
+        db = app_db()
+        assert db.query(Verificacao).count() == 0
+        db.close()
+
+    def test_intervalo_abaixo_do_minimo(self, client, app_db):
+        resposta = client.post("/monitorados", json={"nome": "carlos", "intervalo_segundos": 1})
+        assert resposta.status_code == 422
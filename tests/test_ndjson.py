@@ -0,0 +1,97 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from models import Busca, Parte, Processo
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+@pytest.fixture(autouse=True)
+def tres_partes(fake_service):
+    fake_service.partes = 3
+    fake_service.processos = 2
+    fake_service.parte_com_erro = 1
+
+
+def linhas(resposta):
+    return [json.loads(linha) for linha in resposta.text.splitlines()]
+
+
+def popular(app_db, total=7):
+    db = app_db()
+    parte = Parte(nome="CARLOS", ultima_coleta_em=datetime.utcnow())
+    db.add(parte)
+    db.flush()
+    db.add_all([Processo(parte_id=parte.id, numero_processo=f"{n:03d}") for n in range(total)])
+    busca = Busca(nome="CARLOS", status=Busca.CONCLUIDA, finalizado_em=datetime.utcnow())
+    busca.resultados = [{"nome_parte": "CARLOS", "cpf_cnpj": "1", "link": None, "processos": []}]
+    db.add(busca)
+    db.commit()
+    parte_id = parte.id
+    db.close()
+    return parte_id
+
+
+class TestNdjson:
+
+    def test_cache_transmitido_do_banco(self, client, app_db):
+        popular(app_db)
+
+        resposta = client.get("/processos/carlos", headers=NDJSON)
+
+        assert resposta.status_code == 200
+        assert resposta.headers["content-type"].startswith("application/x-ndjson")
+        assert resposta.headers["X-Cache"] == "HIT"
+        registros = linhas(resposta)
+        assert [r["numero_processo"] for r in registros] == [f"{n:03d}" for n in range(7)]
+        assert registros[0]["parte"] == "CARLOS"
+        assert registros[0]["cpf_cnpj"] == "1"
+
+    def test_scraping_transmitido_por_parte(self, client, app_db):
+        resposta = client.get("/processos/maria", headers=NDJSON)
+
+        assert resposta.headers["X-Cache"] == "MISS"
+        registros = linhas(resposta)
+        assert [r["numero_processo"] for r in registros] == ["0-0", "0-1", "1-0", "1-1", "2-0", "2-1"]
+        assert registros[-1]["parte"] == "MARIA 2"
+
+        db = app_db()
+        assert db.query(Busca).one().status == Busca.CONCLUIDA
+        db.close()
+
+    def test_falha_no_scraping_encerra_com_erro(self, client, fake_service):
+        fake_service.erro = "TJMG fora do ar"
+
+        registros = linhas(client.get("/processos/maria", headers=NDJSON))
+
+        assert [r.get("numero_processo") for r in registros[:4]] == ["0-0", "0-1", "1-0", "1-1"]
+        assert "TJMG fora do ar" in registros[-1]["erro"]
+
+    def test_sem_accept_mantem_json(self, client, app_db):
+        popular(app_db)
+
+        corpo = client.get("/processos/carlos").json()
+
+        assert corpo["total_processos"] == 7
+
+    def test_processos_da_parte_sem_paginar(self, client, app_db):
+        parte_id = popular(app_db, total=620)
+
+        registros = linhas(client.get(f"/partes/{parte_id}/processos", headers=NDJSON))
+
+        assert len(registros) == 620
+        chaves = [(r["atualizado_em"], r["id"]) for r in registros]
+        assert chaves == sorted(chaves)
+
+    def test_filtro_de_processos(self, client, app_db):
+        popular(app_db)
+
+        registros = linhas(client.get("/processos", params={"numero": "003"}, headers=NDJSON))
+
+        assert [r["numero_processo"] for r in registros] == ["003"]
+
+    def test_cursor_invalido_antes_de_transmitir(self, client, app_db):
+        resposta = client.get("/processos", params={"cursor": "x"}, headers=NDJSON)
+        assert resposta.status_code == 400
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from models import Parte, Processo
+from utils.paginacao import CursorInvalidoError, codificar_cursor, decodificar_cursor
+
+INICIO = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def client(app_db):
+    from main import app
+    return TestClient(app)
+
+
+@pytest.fixture
+def dados(app_db):
+    db = app_db()
+    partes = [Parte(nome=f"PARTE {i}") for i in range(3)]
+    db.add_all(partes)
+    db.flush()
+
+    for n in range(7):
+        db.add(Processo(
+            parte_id=partes[0].id,
+            numero_processo=f"000{n}",
+            assunto="Tributário" if n % 2 else "Cível",
+            atualizado_em=INICIO + timedelta(days=n % 4)
+        ))
+    db.add(Processo(parte_id=partes[1].id, numero_processo="9999", assunto="Cível", atualizado_em=INICIO))
+    db.commit()
+    ids = [parte.id for parte in partes]
+    db.close()
+    return ids
+
+
+def coletar(client, url, chave):
+    itens, cursor, paginas = [], None, 0
+    while True:
+        resposta = client.get(url, params={"limite": 3, **({"cursor": cursor} if cursor else {})})
+        assert resposta.status_code == 200
+        corpo = resposta.json()
+        itens += corpo[chave]
+        paginas += 1
+        cursor = corpo["proximo_cursor"]
+        if cursor is None:
+            return itens, paginas
+
+
+class TestCursor:
+
+    def test_ida_e_volta(self):
+        cursor = codificar_cursor([INICIO, 42])
+        assert decodificar_cursor(cursor, [Processo.atualizado_em, Processo.id]) == [INICIO, 42]
+
+    def test_cursor_invalido(self):
+        with pytest.raises(CursorInvalidoError):
+            decodificar_cursor("nao-e-cursor", [Processo.atualizado_em, Processo.id])
+
+
+class TestRotasPaginadas:
+
+    def test_lista_partes(self, client, dados):
+        partes, paginas = coletar(client, "/partes", "partes")
+
+        assert [p["id"] for p in partes] == dados
+        assert [p["total_processos"] for p in partes] == [7, 1, 0]
+        assert paginas == 1
+
+    def test_lista_partes_em_uma_consulta(self, client, dados, contar_sql):
+        from config.database import read_engine
+
+        with contar_sql(read_engine) as comandos:
+            resposta = client.get("/partes")
+
+        assert resposta.status_code == 200
+        assert len(comandos) == 1
+
+    def test_processos_da_parte_percorre_todas_as_paginas(self, client, dados):
+        processos, paginas = coletar(client, f"/partes/{dados[0]}/processos", "processos")
+
+        assert paginas == 3
+        assert len({p["id"] for p in processos}) == 7
+        chaves = [(p["atualizado_em"], p["id"]) for p in processos]
+        assert chaves == sorted(chaves)
+
+    def test_parte_inexistente(self, client, dados):
+        assert client.get("/partes/999/processos").status_code == 404
+
+    def test_filtros_de_processos(self, client, dados):
+        assert [p["numero_processo"] for p in client.get("/processos", params={"numero": "9999"}).json()["processos"]] == ["9999"]
+
+        tributarios = client.get("/processos", params={"assunto": "Tributário"}).json()["processos"]
+        assert sorted(p["numero_processo"] for p in tributarios) == ["0001", "0003", "0005"]
+
+        recentes = client.get("/processos", params={"desde": (INICIO + timedelta(days=2)).isoformat()}).json()["processos"]
+        assert sorted(p["numero_processo"] for p in recentes) == ["0002", "0003", "0006"]
+
+    def test_cursor_invalido_retorna_400(self, client, dados):
+        assert client.get("/processos", params={"cursor": "???"}).status_code == 400
+
+    def test_consulta_usa_indice(self, app_db, dados):
+        db = app_db()
+        plano = db.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM processos WHERE parte_id = 1 "
+            "AND (atualizado_em, id) > ('2024-01-01', 0) ORDER BY atualizado_em, id LIMIT 51"
+        )).all()
+        db.close()
+
+        detalhes = " ".join(linha[-1] for linha in plano)
+        assert "ix_processos_parte_atualizado" in detalhes
+        assert "TEMP B-TREE" not in detalhes
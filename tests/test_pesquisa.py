@@ -0,0 +1,177 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from config.migrations import aplicar_migracoes
+from models import Parte, Processo
+from utils.pesquisa import ConsultaInvalidaError, montar_consulta, pesquisar_partes, pesquisar_processos, sugerir_partes
+from utils.upsert import upsert_processos
+
+
+@pytest.fixture
+def corpus(session):
+    maria = Parte(nome="MARIA DA CONCEIÇÃO")
+    joao = Parte(nome="JOÃO PEREIRA")
+    session.add_all([maria, joao])
+    session.flush()
+
+    session.add_all([
+        Processo(parte_id=maria.id, numero_processo="1", autor="MARIA DA CONCEIÇÃO", reu="BANCO XYZ",
+                 assunto="Indenização por Dano Moral", ultimo_evento="Conclusos para decisão"),
+        Processo(parte_id=maria.id, numero_processo="2", autor="MUNICÍPIO DE BELO HORIZONTE", reu="MARIA DA CONCEIÇÃO",
+                 assunto="IPTU", ultimo_evento="Audiência de conciliação designada"),
+        Processo(parte_id=joao.id, numero_processo="3", autor="JOÃO PEREIRA", reu="EMPRESA ABC",
+                 assunto="Rescisão contratual", ultimo_evento="Sentença com resolução de mérito"),
+    ])
+    session.commit()
+    return maria, joao
+
+
+class TestMontarConsulta:
+
+    def test_termos_entre_aspas(self):
+        assert montar_consulta('dano "moral') == '"dano" "moral"'
+
+    def test_prefixo(self):
+        assert montar_consulta("concilia*") == '"concilia"*'
+
+    def test_sem_termos(self):
+        with pytest.raises(ConsultaInvalidaError):
+            montar_consulta("  ---  ")
+
+
+class TestPesquisaTextual:
+
+    def test_ignora_acentos(self, session, corpus):
+        resultados = pesquisar_processos(session, "indenizacao", limite=10)
+
+        assert [r["numero_processo"] for r in resultados] == ["1"]
+        assert "<mark>Indenização</mark>" in resultados[0]["trecho"]
+
+    def test_ranqueia_por_relevancia(self, session, corpus):
+        resultados = pesquisar_processos(session, "maria conceicao", limite=10)
+
+        assert {r["numero_processo"] for r in resultados} == {"1", "2"}
+        assert resultados[0]["relevancia"] <= resultados[1]["relevancia"]
+
+    def test_pesquisa_por_prefixo(self, session, corpus):
+        resultados = pesquisar_processos(session, "concilia*", limite=10)
+        assert [r["numero_processo"] for r in resultados] == ["2"]
+
+    def test_pesquisa_partes(self, session, corpus):
+        resultados = pesquisar_partes(session, "joao", limite=10)
+
+        assert [r["nome"] for r in resultados] == ["JOÃO PEREIRA"]
+        assert resultados[0]["trecho"] == "<mark>JOÃO</mark> PEREIRA"
+
+    def test_indice_acompanha_upsert(self, session, corpus):
+        maria, _ = corpus
+        upsert_processos(session, maria.id, [
+            {"numero_processo": "1", "autor": "MARIA DA CONCEIÇÃO", "reu": "BANCO XYZ",
+             "assunto": "Revisão de juros", "ultimo_evento": "Conclusos para decisão", "link_processo": None},
+        ])
+        session.commit()
+
+        assert pesquisar_processos(session, "indenizacao", limite=10) == []
+        assert [r["numero_processo"] for r in pesquisar_processos(session, "juros", limite=10)] == ["1"]
+
+    def test_indice_acompanha_exclusao(self, session, corpus):
+        _, joao = corpus
+        session.delete(joao)
+        session.commit()
+
+        assert pesquisar_processos(session, "rescisao", limite=10) == []
+        assert pesquisar_partes(session, "pereira", limite=10) == []
+
+    def test_migracao_indexa_dados_existentes(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path}/antigo.db")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE partes (id INTEGER PRIMARY KEY, nome VARCHAR NOT NULL UNIQUE)"))
+            conn.execute(text(
+                "CREATE TABLE processos (id INTEGER PRIMARY KEY, numero_processo VARCHAR NOT NULL, "
+                "autor VARCHAR, reu VARCHAR, assunto TEXT, ultimo_evento TEXT, link_processo TEXT, "
+                "criado_em DATETIME NOT NULL, atualizado_em DATETIME, parte_id INTEGER NOT NULL)"
+            ))
+            conn.execute(text("INSERT INTO partes (id, nome) VALUES (1, 'JOSÉ')"))
+            conn.execute(text(
+                "INSERT INTO processos (numero_processo, assunto, criado_em, parte_id) "
+                "VALUES ('9', 'Execução fiscal', CURRENT_TIMESTAMP, 1)"
+            ))
+
+        aplicar_migracoes(engine)
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT rowid FROM processos_fts WHERE processos_fts MATCH 'execucao'")).all() == [(1,)]
+            assert conn.execute(text("SELECT rowid FROM partes_fts WHERE partes_fts MATCH 'jose'")).all() == [(1,)]
+
+
+class TestSugestoes:
+
+    @pytest.fixture
+    def nomes(self, session):
+        session.add_all([Parte(nome=nome) for nome in (
+            "JOSÉ DA SILVA", "JOSEFA SOUZA", "JOSÉ PEREIRA", "MARIA JOSÉ SILVA", "ANA CLARA"
+        )])
+        session.commit()
+
+    def test_prefixo_ignora_acentos(self, session, nomes):
+        sugestoes = sugerir_partes(session, "jose", limite=3)
+
+        assert [s["nome"] for s in sugestoes] == ["JOSÉ DA SILVA", "JOSÉ PEREIRA", "JOSEFA SOUZA"]
+        assert {s["correspondencia"] for s in sugestoes} == {"prefixo"}
+
+    def test_completa_com_trigrama(self, session, nomes):
+        sugestoes = sugerir_partes(session, "José", limite=10)
+
+        assert [s["nome"] for s in sugestoes][:3] == ["JOSÉ DA SILVA", "JOSÉ PEREIRA", "JOSEFA SOUZA"]
+        assert sugestoes[3] == {"id": sugestoes[3]["id"], "nome": "MARIA JOSÉ SILVA", "correspondencia": "trecho"}
+        assert len(sugestoes) == 4
+
+    def test_trecho_no_meio_do_nome(self, session, nomes):
+        assert [s["nome"] for s in sugerir_partes(session, "da silv", limite=10)] == ["JOSÉ DA SILVA"]
+
+    def test_prefixo_usa_indice(self, session, nomes):
+        plano = session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM partes "
+            "WHERE nome_normalizado >= 'jose' AND nome_normalizado < 'jose\U0010ffff' ORDER BY nome_normalizado"
+        )).all()
+
+        assert "ix_partes_nome_normalizado" in " ".join(linha[-1] for linha in plano)
+
+
+class TestRotaPesquisa:
+
+    def test_pesquisa_processos(self, app_db):
+        from main import app
+
+        db = app_db()
+        parte = Parte(nome="ANA")
+        db.add(parte)
+        db.flush()
+        db.add(Processo(parte_id=parte.id, numero_processo="7", assunto="Usucapião extraordinária"))
+        db.commit()
+        db.close()
+
+        client = TestClient(app)
+        resposta = client.get("/pesquisa/processos", params={"q": "usucapiao"})
+
+        assert resposta.status_code == 200
+        corpo = resposta.json()
+        assert corpo["total"] == 1
+        assert corpo["resultados"][0]["numero_processo"] == "7"
+        assert "<mark>" in corpo["resultados"][0]["trecho"]
+
+        assert client.get("/pesquisa/partes", params={"q": "!!"}).status_code == 400
+
+    def test_sugestoes(self, app_db):
+        from main import app
+
+        db = app_db()
+        db.add(Parte(nome="CONCEIÇÃO APARECIDA"))
+        db.commit()
+        db.close()
+
+        resposta = TestClient(app).get("/pesquisa/sugestoes", params={"q": "concei"})
+
+        assert resposta.status_code == 200
+        assert resposta.json()["sugestoes"][0]["nome"] == "CONCEIÇÃO APARECIDA"
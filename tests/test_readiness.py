@@ -0,0 +1,100 @@
+import time
+import pytest
+from selenium.common.exceptions import TimeoutException
+from utils.rate_limiter import RateLimiter, RateLimiterBanco
+from utils.readiness import aguardar_tabela_estavel
+from utils.timing import Cronometro
+
+
+class FakeDriver:
+    def __init__(self, estados):
+        self.estados = list(estados)
+        self.chamadas = 0
+
+    def execute_script(self, script, *args):
+        self.chamadas += 1
+        if len(self.estados) > 1:
+            return self.estados.pop(0)
+        return self.estados[0]
+
+
+class TestAguardarTabelaEstavel:
+
+    def test_retorna_quando_tabela_estabiliza(self):
+        driver = FakeDriver([
+            None,
+            ["loading", 3, 100],
+            ["complete", 5, 200],
+            ["complete", 8, 320],
+            ["complete", 8, 320],
+        ])
+
+        linhas = aguardar_tabela_estavel(driver, timeout=2, intervalo=0.001)
+
+        assert linhas == 8
+        assert driver.chamadas == 5
+
+    def test_timeout_quando_tabela_nao_aparece(self):
+        driver = FakeDriver([None])
+
+        with pytest.raises(TimeoutException):
+            aguardar_tabela_estavel(driver, timeout=0.05, intervalo=0.01)
+
+    def test_nao_espera_tempo_fixo(self):
+        driver = FakeDriver([["complete", 2, 50]])
+
+        inicio = time.monotonic()
+        aguardar_tabela_estavel(driver, timeout=5, intervalo=0.01)
+
+        assert time.monotonic() - inicio < 0.5
+
+
+class TestRateLimiter:
+
+    def test_espaca_requisicoes(self):
+        limiter = RateLimiter(intervalo_minimo=0.05)
+
+        inicio = time.monotonic()
+        for _ in range(3):
+            limiter.aguardar()
+
+        assert time.monotonic() - inicio >= 0.1
+
+    def test_sem_intervalo_nao_aguarda(self):
+        limiter = RateLimiter(intervalo_minimo=0)
+
+        assert limiter.aguardar() == 0
+        assert limiter.aguardar() == 0
+
+    def test_rajada_libera_sem_espera(self):
+        limiter = RateLimiter(intervalo_minimo=0.05, rajada=3)
+
+        esperas = [limiter.aguardar() for _ in range(4)]
+
+        assert esperas[:3] == [0, 0, 0]
+        assert esperas[3] > 0
+
+    def test_banco_compartilha_fichas_entre_instancias(self, app_db):
+        primeiro = RateLimiterBanco(intervalo_minimo=10, rajada=2, session_factory=app_db)
+        segundo = RateLimiterBanco(intervalo_minimo=10, rajada=2, session_factory=app_db)
+
+        assert primeiro._reservar() == 0
+        assert segundo._reservar() == 0
+        assert primeiro._reservar() == pytest.approx(10, abs=0.1)
+        assert segundo._reservar() == pytest.approx(20, abs=0.1)
+
+
+class TestCronometro:
+
+    def test_registra_etapas(self):
+        cronometro = Cronometro()
+
+        with cronometro.medir("carregar_pagina"):
+            pass
+        cronometro.registrar("carregar_pagina", 0.5)
+        cronometro.registrar("extrair_partes", 0.01)
+
+        resumo = cronometro.resumo()
+        assert resumo["carregar_pagina"]["chamadas"] == 2
+        assert resumo["carregar_pagina"]["max_ms"] == 500.0
+        assert "extrair_partes;dur=10.0" in cronometro.server_timing()
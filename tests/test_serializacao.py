@@ -0,0 +1,124 @@
+import gzip
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+from models import Busca, Parte, Processo
+from schemas import ConsultaProcessosSchema
+from utils.compressao import COMPRESSAO_MINIMO_BYTES, CompressaoMiddleware
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+def popular(app_db, total):
+    db = app_db()
+    parte = Parte(nome="CARLOS", ultima_coleta_em=datetime.utcnow())
+    db.add(parte)
+    db.flush()
+    db.add_all([
+        Processo(parte_id=parte.id, numero_processo=f"{n:07d}-11.2024.8.13.0024", assunto="Contratos Bancários")
+        for n in range(total)
+    ])
+    busca = Busca(nome="CARLOS", status=Busca.CONCLUIDA, finalizado_em=datetime.utcnow())
+    busca.resultados = [{"nome_parte": "CARLOS", "cpf_cnpj": "1", "link": None, "processos": []}]
+    db.add(busca)
+    db.commit()
+    parte_id = parte.id
+    db.close()
+    return parte_id
+
+
+class TestSerializacao:
+
+    def test_resposta_do_banco_segue_o_schema(self, client, app_db):
+        popular(app_db, 3)
+
+        resposta = client.get("/processos/carlos")
+
+        assert resposta.status_code == 200
+        assert resposta.headers["X-Cache"] == "HIT"
+        consulta = ConsultaProcessosSchema.model_validate(resposta.json())
+        assert consulta.total_processos == 3
+        assert isinstance(consulta.processos[0].atualizado_em, datetime)
+
+    def test_resposta_do_scraping_segue_o_schema(self, client):
+        resposta = client.get("/processos/ana")
+
+        assert resposta.headers["X-Cache"] == "MISS"
+        assert "Server-Timing" in resposta.headers
+        assert ConsultaProcessosSchema.model_validate(resposta.json()).processos[0].parte == "ANA"
+
+    def test_datas_em_iso_8601(self, client, app_db):
+        parte_id = popular(app_db, 1)
+        db = app_db()
+        criado_em = db.query(Processo.criado_em).filter(Processo.parte_id == parte_id).scalar()
+        db.close()
+
+        processo = client.get(f"/partes/{parte_id}/processos").json()["processos"][0]
+
+        assert processo["criado_em"] == criado_em.isoformat()
+
+    def test_resultados_da_busca_aceitam_datas(self):
+        agora = datetime(2024, 5, 1, 12, 30)
+        busca = Busca(nome="ANA")
+        busca.resultados = [{"processos": [{"atualizado_em": agora}]}]
+
+        assert busca.resultados[0]["processos"][0]["atualizado_em"] == agora.isoformat()
+
+    def test_openapi_documenta_schemas(self, client):
+        rota = client.get("/openapi.json").json()["paths"]["/processos/{nome}"]["get"]["responses"]["200"]["content"]
+
+        assert rota["application/json"]["schema"]["$ref"].endswith("/ConsultaProcessosSchema")
+        assert "application/x-ndjson" in rota
+
+
+class TestCompressao:
+
+    def test_comprime_respostas_grandes(self, client, app_db):
+        popular(app_db, 200)
+
+        resposta = client.get("/processos/carlos", headers={"Accept-Encoding": "gzip"})
+
+        assert resposta.headers["content-encoding"] == "gzip"
+        assert int(resposta.headers["content-length"]) < len(resposta.content)
+        assert resposta.json()["total_processos"] == 200
+
+    def test_respostas_pequenas_sem_compressao(self, client):
+        resposta = client.get("/pesquisa/sugestoes", params={"q": "zz"}, headers={"Accept-Encoding": "gzip"})
+
+        assert len(resposta.content) < COMPRESSAO_MINIMO_BYTES
+        assert "content-encoding" not in resposta.headers
+
+    def test_ndjson_nao_e_comprimido(self, client, app_db):
+        parte_id = popular(app_db, 200)
+
+        resposta = client.get(f"/partes/{parte_id}/processos", headers={**NDJSON, "Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in resposta.headers
+        assert len(resposta.text.splitlines()) == 200
+
+    def test_stream_sem_accept_ndjson_nao_e_comprimido(self):
+        async def linhas():
+            for n in range(200):
+                yield f'{{"numero_processo":"{n:07d}"}}\n'.encode()
+
+        app = Starlette(routes=[
+            Route("/stream", lambda request: StreamingResponse(linhas(), media_type="application/x-ndjson"))
+        ])
+        app.add_middleware(CompressaoMiddleware)
+
+        resposta = TestClient(app).get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in resposta.headers
+        assert len(resposta.text.splitlines()) == 200
+
+    def test_corpo_comprimido_e_json_valido(self, client, app_db):
+        popular(app_db, 200)
+
+        with client.stream("GET", "/processos/carlos", headers={"Accept-Encoding": "gzip"}) as resposta:
+            bruto = b"".join(resposta.iter_raw())
+
+        assert gzip.decompress(bruto).startswith(b'{"nome_consultado":"CARLOS"')
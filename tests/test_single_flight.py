@@ -0,0 +1,138 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from models import Lease, Parte
+from utils.eproc_scraper import EProcService
+from utils.single_flight import Coalescedor, LeaseDistribuido, SingleFlight
+
+
+class TestSingleFlight:
+
+    def test_chamadas_concorrentes_executam_uma_vez(self):
+        flight = SingleFlight()
+        chamadas = []
+        liberar = threading.Event()
+
+        def consulta():
+            chamadas.append(1)
+            liberar.wait(2)
+            return ["resultado"]
+
+        resultados = []
+        threads = [
+            threading.Thread(target=lambda: resultados.append(flight.executar("MARIA", consulta)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        liberar.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(chamadas) == 1
+        assert len(resultados) == 5
+        assert all(r is resultados[0] for r in resultados)
+        assert flight.em_andamento() == 0
+
+    def test_erro_propagado_para_todos(self):
+        flight = SingleFlight()
+        liberar = threading.Event()
+        erros = []
+
+        def consulta():
+            liberar.wait(2)
+            raise RuntimeError("timeout")
+
+        def chamar():
+            try:
+                flight.executar("JOSE", consulta)
+            except RuntimeError as e:
+                erros.append(e)
+
+        threads = [threading.Thread(target=chamar) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        liberar.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(erros) == 3
+
+    def test_chaves_diferentes_nao_coalescem(self):
+        flight = SingleFlight()
+
+        assert flight.executar("A", lambda: 1) == 1
+        assert flight.executar("B", lambda: 2) == 2
+
+
+class TestLeaseDistribuido:
+
+    def test_apenas_um_dono(self, app_db):
+        primeiro = LeaseDistribuido("MARIA", app_db)
+        segundo = LeaseDistribuido("MARIA", app_db)
+
+        assert primeiro.adquirir()
+        assert not segundo.adquirir()
+
+        primeiro.liberar()
+        assert segundo.adquirir()
+
+    def test_assume_lease_expirado(self, app_db):
+        db = app_db()
+        db.add(Lease(chave="ANA", dono="worker-morto", expira_em=datetime.utcnow() - timedelta(seconds=1)))
+        db.commit()
+        db.close()
+
+        assert LeaseDistribuido("ANA", app_db).adquirir()
+
+    def test_coalescedor_aguarda_outro_worker(self, app_db):
+        outro_worker = LeaseDistribuido("PEDRO", app_db)
+        assert outro_worker.adquirir()
+        threading.Timer(0.1, outro_worker.liberar).start()
+
+        coalescedor = Coalescedor(app_db)
+        executou = []
+
+        resultado = coalescedor._executar_com_lease(
+            "PEDRO",
+            lambda: executou.append(1) or ["novo scraping"],
+            lambda: ["resultado do outro worker"]
+        )
+
+        assert resultado == ["resultado do outro worker"]
+        assert executou == []
+
+
+class _SessaoComCorrida:
+    def __init__(self, db):
+        self.db = db
+        self.consultas = 0
+
+    def query(self, *args):
+        self.consultas += 1
+        consulta = self.db.query(*args)
+        if self.consultas == 1:
+            return consulta.filter(False)
+        return consulta
+
+    def __getattr__(self, nome):
+        return getattr(self.db, nome)
+
+
+class TestObterOuCriarParte:
+
+    def test_insercao_concorrente_reaproveita_parte(self, app_db):
+        outra = app_db()
+        outra.add(Parte(nome="CARLOS"))
+        outra.commit()
+        outra.close()
+
+        db = app_db()
+        parte = EProcService(pool=object())._obter_ou_criar_parte(_SessaoComCorrida(db), "CARLOS")
+
+        assert parte.nome == "CARLOS"
+        assert db.query(Parte).count() == 1
+        db.close()
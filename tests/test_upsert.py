@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from models import Processo
+import utils.upsert as upsert
+from utils.upsert import _deduplicar, upsert_processos
+
+
+def dados(numero, evento="Distribuído"):
+    return {
+        "numero_processo": numero,
+        "autor": "AUTOR",
+        "reu": "RÉU",
+        "assunto": "Cobrança",
+        "ultimo_evento": evento,
+        "link_processo": f"https://eproc/{numero}"
+    }
+
+
+class TestUpsertProcessos:
+
+    def test_insere_novos(self, session, parte_factory):
+        parte = parte_factory()
+
+        resultado = upsert_processos(session, parte.id, [dados("1"), dados("2")])
+        session.commit()
+
+        assert resultado.inseridos == ["1", "2"]
+        assert session.query(Processo).count() == 2
+        processo = session.query(Processo).filter_by(numero_processo="1").one()
+        assert processo.hash_conteudo == Processo.calcular_hash(dados("1"))
+
+    def test_reconsulta_sem_alteracao_nao_escreve(self, session, parte_factory):
+        parte = parte_factory()
+        upsert_processos(session, parte.id, [dados("1"), dados("2")])
+        session.commit()
+        atualizado_em = session.query(Processo.atualizado_em).filter_by(numero_processo="1").scalar()
+
+        resultado = upsert_processos(session, parte.id, [dados("1"), dados("2")])
+        session.commit()
+
+        assert resultado.contagem() == {"inseridos": 0, "atualizados": 0, "inalterados": 2}
+        assert session.query(Processo).count() == 2
+        assert session.query(Processo.atualizado_em).filter_by(numero_processo="1").scalar() == atualizado_em
+
+    def test_atualiza_apenas_alterados(self, session, parte_factory):
+        parte = parte_factory()
+        upsert_processos(session, parte.id, [dados("1"), dados("2")])
+        session.commit()
+
+        resultado = upsert_processos(session, parte.id, [dados("1"), dados("2", "Sentença"), dados("3")])
+        session.commit()
+
+        assert resultado.inseridos == ["3"]
+        assert resultado.atualizados == ["2"]
+        assert resultado.inalterados == 1
+        assert session.query(Processo).count() == 3
+        assert session.query(Processo).filter_by(numero_processo="2").one().ultimo_evento == "Sentença"
+
+    def test_mesmo_numero_em_partes_diferentes(self, session, parte_factory):
+        parte1 = parte_factory(nome="PARTE 1")
+        parte2 = parte_factory(nome="PARTE 2")
+
+        upsert_processos(session, parte1.id, [dados("1")])
+        upsert_processos(session, parte2.id, [dados("1")])
+        session.commit()
+
+        assert session.query(Processo).count() == 2
+
+    def test_deduplica_lote(self, parte_factory):
+        linhas = _deduplicar(1, [dados("1", "antigo"), dados("1", "novo")])
+
+        assert len(linhas) == 1
+        assert linhas[0]["ultimo_evento"] == "novo"
+
+    def test_dialeto_sem_on_conflict(self, session, parte_factory, monkeypatch):
+        monkeypatch.setattr(upsert, "insert_do_dialeto", lambda dialeto: None)
+        parte = parte_factory()
+        upsert_processos(session, parte.id, [dados("1"), dados("2")])
+        session.commit()
+
+        resultado = upsert_processos(session, parte.id, [dados("1", "Sentença"), dados("2"), dados("3")])
+        session.commit()
+
+        assert resultado.contagem() == {"inseridos": 1, "atualizados": 1, "inalterados": 1}
+        assert session.query(Processo).count() == 3
+        assert session.query(Processo).filter_by(numero_processo="1").one().ultimo_evento == "Sentença"
+
+    def test_hash_ignora_campos_nao_coletados(self):
+        assert Processo.calcular_hash(dados("1")) == Processo.calcular_hash({**dados("1"), "parte_id": 9, "criado_em": None})
+        assert Processo.calcular_hash(dados("1")) != Processo.calcular_hash(dados("1", "Outro"))
+
+    def test_numero_duplicado_na_parte_viola_unicidade(self, session, parte_factory, processo_factory):
+        parte = parte_factory()
+        processo_factory(parte_id=parte.id, numero="1")
+
+        session.add(Processo(parte_id=parte.id, numero_processo="1"))
+        with pytest.raises(IntegrityError):
+            session.commit()
@@ -0,0 +1,317 @@
+import gzip
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from utils.metricas import registrar_erro
+from utils.normalizacao import chave_nome
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ARQUIVO_DIR = Path(os.getenv("ARQUIVO_DIR", "data/arquivo"))
+ARQUIVO_COMPRESSAO = os.getenv("ARQUIVO_COMPRESSAO", "zstd" if zstandard else "gzip")
+ARQUIVO_NIVEL = int(os.getenv("ARQUIVO_NIVEL", "3"))
+ARQUIVO_SEGMENTO_BYTES = int(os.getenv("ARQUIVO_SEGMENTO_BYTES", str(64 * 1024 * 1024)))
+ARQUIVO_LOTE = int(os.getenv("ARQUIVO_LOTE", "500"))
+ARQUIVO_INTERVALO = float(os.getenv("ARQUIVO_INTERVALO", "1"))
+ARQUIVO_FILA_MAXIMA = int(os.getenv("ARQUIVO_FILA_MAXIMA", "10000"))
+
+logger = logging.getLogger(__name__)
+
+INDICE = "indice.sqlite"
+ESPERA_OCIOSA = 0.1
+
+EXTENSOES = {
+    "zstd": ".jsonl.zst",
+    "gzip": ".jsonl.gz",
+}
+
+
+def _comprimir(compressao: str, nivel: int) -> Callable[[bytes], bytes]:
+    if compressao == "zstd":
+        if zstandard is None:
+            raise RuntimeError("ARQUIVO_COMPRESSAO=zstd requer o pacote zstandard")
+        compressor = zstandard.ZstdCompressor(level=nivel)
+        return compressor.compress
+    if compressao == "gzip":
+        return lambda dados: gzip.compress(dados, compresslevel=nivel)
+    raise ValueError(f"Compressão desconhecida: {compressao}")
+
+
+def _descomprimir(segmento: str, dados: bytes) -> bytes:
+    if segmento.endswith(EXTENSOES["zstd"]):
+        return zstandard.ZstdDecompressor().decompress(dados)
+    return gzip.decompress(dados)
+
+
+@contextmanager
+def _travado(arquivo):
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+
+
+def _momento(valor: datetime) -> str:
+    return valor.isoformat(timespec="microseconds")
+
+
+class ArquivoBruto:
+
+    def __init__(
+        self,
+        diretorio: Path = ARQUIVO_DIR,
+        compressao: str = ARQUIVO_COMPRESSAO,
+        nivel: int = ARQUIVO_NIVEL,
+        segmento_bytes: int = ARQUIVO_SEGMENTO_BYTES,
+        lote: int = ARQUIVO_LOTE,
+        intervalo: float = ARQUIVO_INTERVALO,
+        fila_maxima: int = ARQUIVO_FILA_MAXIMA
+    ):
+        self.diretorio = Path(diretorio)
+        self.extensao = EXTENSOES[compressao]
+        self.comprimir = _comprimir(compressao, nivel)
+        self.segmento_bytes = segmento_bytes
+        self.lote = lote
+        self.intervalo = intervalo
+
+        self._fila: "queue.Queue[Tuple[str, datetime, List[Dict]]]" = queue.Queue(maxsize=fila_maxima)
+        self._parar = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._arquivo = None
+        self._segmento: Optional[str] = None
+        self.descartadas = 0
+
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        conn = self._conectar()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS capturas ("
+            "id INTEGER PRIMARY KEY, chave TEXT NOT NULL, chave_parte TEXT, capturado_em TEXT NOT NULL, "
+            "segmento TEXT NOT NULL, inicio INTEGER NOT NULL, tamanho INTEGER NOT NULL, linha INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_capturas_chave ON capturas (chave, capturado_em)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_capturas_chave_parte ON capturas (chave_parte, capturado_em)")
+        conn.commit()
+        conn.close()
+
+    def _conectar(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.diretorio / INDICE, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._executar, name="arquivo-bruto", daemon=True)
+            self._thread.start()
+        logger.info("Arquivo bruto em %s (%s)", self.diretorio, self.extensao)
+
+    def stop(self, timeout: Optional[float] = None):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def registrar(self, nome: str, resultados: List[Dict]) -> bool:
+        if not resultados:
+            return True
+
+        self.start()
+        try:
+            self._fila.put_nowait((nome, datetime.utcnow(), resultados))
+            return True
+        except queue.Full:
+            self.descartadas += 1
+            logger.warning("Arquivo bruto: fila cheia, captura de '%s' descartada", nome)
+            return False
+
+    def aguardar(self):
+        self._fila.join()
+
+    def _executar(self):
+        conn = self._conectar()
+        try:
+            while not (self._parar.is_set() and self._fila.empty()):
+                lote = self._proximo_lote()
+                if not lote:
+                    continue
+                try:
+                    self._gravar(conn, lote)
+                except Exception as e:
+                    conn.rollback()
+                    logger.error("Arquivo bruto: falha ao gravar %d captura(s): %s", len(lote), e)
+                    registrar_erro("arquivar", e)
+                finally:
+                    for _ in lote:
+                        self._fila.task_done()
+        finally:
+            conn.close()
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+    def _proximo_lote(self) -> List[Tuple[str, datetime, List[Dict]]]:
+        try:
+            lote = [self._fila.get(timeout=min(self.intervalo, ESPERA_OCIOSA))]
+        except queue.Empty:
+            return []
+
+        linhas = len(lote[0][2])
+        limite = time.monotonic() + self.intervalo
+        while linhas < self.lote and not self._parar.is_set():
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                item = self._fila.get(timeout=restante)
+            except queue.Empty:
+                break
+            lote.append(item)
+            linhas += len(item[2])
+
+        return lote
+
+    def _gravar(self, conn: sqlite3.Connection, lote: List[Tuple[str, datetime, List[Dict]]]):
+        linhas = []
+        indices = []
+        for nome, capturado_em, resultados in lote:
+            chave = chave_nome(nome)
+            for resultado in resultados:
+                registro = {"consulta": nome, "capturado_em": capturado_em, **resultado}
+                indices.append((chave, chave_nome(resultado.get("nome_parte") or ""), _momento(capturado_em), len(linhas)))
+                linhas.append(orjson.dumps(registro, option=orjson.OPT_APPEND_NEWLINE))
+
+        quadro = self.comprimir(b"".join(linhas))
+        segmento, inicio = self._anexar(quadro)
+
+        conn.executemany(
+            "INSERT INTO capturas (chave, chave_parte, capturado_em, segmento, inicio, tamanho, linha) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(chave, chave_parte, momento, segmento, inicio, len(quadro), linha)
+             for chave, chave_parte, momento, linha in indices]
+        )
+        conn.commit()
+
+    def _anexar(self, quadro: bytes) -> Tuple[str, int]:
+        if self._arquivo is None:
+            self._abrir(self._ultimo_segmento())
+
+        while True:
+            with _travado(self._arquivo):
+                inicio = self._arquivo.seek(0, os.SEEK_END)
+                if not inicio or inicio + len(quadro) <= self.segmento_bytes:
+                    self._arquivo.write(quadro)
+                    self._arquivo.flush()
+                    return self._segmento, inicio
+
+            segmento = self._ultimo_segmento()
+            self._abrir(segmento if segmento != self._segmento else self._proximo_segmento())
+
+    def _segmentos(self) -> List[Path]:
+        return sorted(p for p in self.diretorio.iterdir() if p.name.endswith(tuple(EXTENSOES.values())))
+
+    def _ultimo_segmento(self) -> str:
+        segmentos = self._segmentos()
+        if segmentos:
+            ultimo = segmentos[-1]
+            if ultimo.name.endswith(self.extensao) and ultimo.stat().st_size < self.segmento_bytes:
+                return ultimo.name
+        return self._proximo_segmento()
+
+    def _proximo_segmento(self) -> str:
+        segmentos = self._segmentos()
+        sequencia = int(segmentos[-1].name.split(".")[0]) + 1 if segmentos else 1
+        return f"{sequencia:06d}{self.extensao}"
+
+    def _abrir(self, segmento: str):
+        if self._arquivo is not None:
+            self._arquivo.close()
+        self._arquivo = open(self.diretorio / segmento, "ab")
+        self._segmento = segmento
+
+    def consultar(
+        self,
+        nome: str,
+        desde: Optional[datetime] = None,
+        ate: Optional[datetime] = None
+    ) -> Iterator[Dict]:
+        chave = chave_nome(nome)
+        filtros = ""
+        parametros = [chave, chave]
+        if desde:
+            filtros += " AND capturado_em >= ?"
+            parametros.append(_momento(desde))
+        if ate:
+            filtros += " AND capturado_em <= ?"
+            parametros.append(_momento(ate))
+
+        conn = self._conectar()
+        try:
+            localizacoes = conn.execute(
+                "SELECT segmento, inicio, tamanho, linha FROM capturas "
+                f"WHERE (chave = ? OR chave_parte = ?){filtros} ORDER BY capturado_em, id",
+                parametros
+            ).fetchall()
+        finally:
+            conn.close()
+
+        quadro_atual = None
+        linhas: List[bytes] = []
+        for segmento, inicio, tamanho, linha in localizacoes:
+            if quadro_atual != (segmento, inicio):
+                with open(self.diretorio / segmento, "rb") as f:
+                    f.seek(inicio)
+                    linhas = _descomprimir(segmento, f.read(tamanho)).splitlines()
+                quadro_atual = (segmento, inicio)
+            yield orjson.loads(linhas[linha])
+
+
+_arquivo: Optional[ArquivoBruto] = None
+
+
+def get_arquivo_bruto() -> ArquivoBruto:
+    global _arquivo
+
+    if _arquivo is None:
+        _arquivo = ArquivoBruto()
+
+    return _arquivo
+
+
+def start_arquivo_bruto() -> ArquivoBruto:
+    arquivo = get_arquivo_bruto()
+    arquivo.start()
+    return arquivo
+
+
+def stop_arquivo_bruto():
+    global _arquivo
+
+    if _arquivo is not None:
+        _arquivo.stop()
+        _arquivo = None
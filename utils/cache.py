@@ -0,0 +1,137 @@
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, defer, selectinload
+
+from models import Busca, BuscaParte, Parte, Processo
+from utils.condicional import Versao, gerar_etag
+from utils.normalizacao import chave_nome
+
+CACHE_TTL_SEGUNDOS = int(os.getenv("CACHE_TTL_SEGUNDOS", "3600"))
+CACHE_STALE_SEGUNDOS = int(os.getenv("CACHE_STALE_SEGUNDOS", "86400"))
+CACHE_NEGATIVO_SEGUNDOS = int(os.getenv("CACHE_NEGATIVO_SEGUNDOS", "300"))
+
+HIT = "HIT"
+STALE = "STALE"
+MISS = "MISS"
+
+
+@dataclass
+class ResultadoCache:
+    resultados: List[Dict]
+    coletado_em: datetime
+
+    @property
+    def idade(self) -> int:
+        return max(0, int((datetime.utcnow() - self.coletado_em).total_seconds()))
+
+    @property
+    def ttl(self) -> int:
+        return CACHE_TTL_SEGUNDOS if self.resultados else CACHE_NEGATIVO_SEGUNDOS
+
+    @property
+    def max_age(self) -> int:
+        return max(0, self.ttl - self.idade)
+
+    @property
+    def estado(self) -> str:
+        if self.idade <= self.ttl:
+            return HIT
+        if self.resultados and self.idade <= self.ttl + CACHE_STALE_SEGUNDOS:
+            return STALE
+        return MISS
+
+
+def consultar_cache(db: Session, nome: str, carregar_processos: bool = True) -> Optional[ResultadoCache]:
+    busca = (
+        db.query(Busca)
+        .options(defer(Busca.resultado))
+        .filter(Busca.chave == chave_nome(nome), Busca.status == Busca.CONCLUIDA)
+        .order_by(Busca.finalizado_em.desc())
+        .first()
+    )
+    if busca is None:
+        return None
+
+    resultados_busca = _partes_da_busca(db, busca)
+    if not resultados_busca:
+        return ResultadoCache(resultados=[], coletado_em=busca.finalizado_em)
+
+    chaves = [chave_nome(r["nome_parte"]) for r in resultados_busca]
+    query = db.query(Parte).filter(Parte.nome_normalizado.in_(chaves)).order_by(Parte.id)
+    if carregar_processos:
+        query = query.options(selectinload(Parte.processos))
+
+    partes = {}
+    for parte in query:
+        partes.setdefault(parte.nome_normalizado, parte)
+
+    if len(partes) < len(set(chaves)) or any(p.ultima_coleta_em is None for p in partes.values()):
+        return None
+
+    resultados = []
+    for resultado, chave in zip(resultados_busca, chaves):
+        parte = partes[chave]
+        item = {
+            "nome_parte": parte.nome,
+            "cpf_cnpj": resultado.get("cpf_cnpj", ""),
+            "link": resultado.get("link"),
+            "parte_id": parte.id
+        }
+        if carregar_processos:
+            item["processos"] = [processo.to_dict() for processo in parte.processos]
+        resultados.append(item)
+
+    return ResultadoCache(
+        resultados=resultados,
+        coletado_em=min(parte.ultima_coleta_em for parte in partes.values())
+    )
+
+
+def _partes_da_busca(db: Session, busca: Busca) -> List[Dict]:
+    partes = (
+        db.query(BuscaParte.nome, BuscaParte.cpf_cnpj, BuscaParte.link)
+        .filter(BuscaParte.busca_id == busca.id)
+        .order_by(BuscaParte.ordem)
+        .all()
+    )
+    if not partes:
+        return busca.resultados
+    return [{"nome_parte": nome, "cpf_cnpj": cpf_cnpj or "", "link": link} for nome, cpf_cnpj, link in partes]
+
+
+def versao_resultados(db: Session, nome: str, resultados: List[Dict], formato: str) -> Versao:
+    agregados = {
+        parte_id: (total, ultima)
+        for parte_id, total, ultima in (
+            db.query(Processo.parte_id, func.count(Processo.id), func.max(Processo.atualizado_em))
+            .filter(Processo.parte_id.in_([r["parte_id"] for r in resultados]))
+            .group_by(Processo.parte_id)
+        )
+    }
+
+    componentes = [formato, nome] + [
+        [r["parte_id"], r["nome_parte"], r["cpf_cnpj"], *agregados.get(r["parte_id"], (0, None))]
+        for r in resultados
+    ]
+    ultima_modificacao = max((ultima for _, ultima in agregados.values() if ultima), default=None)
+
+    return Versao(etag=gerar_etag(componentes), ultima_modificacao=ultima_modificacao)
+
+
+def carregar_processos(db: Session, resultados: List[Dict]) -> List[Dict]:
+    processos: Dict[int, List[Dict]] = {r["parte_id"]: [] for r in resultados}
+    query = (
+        db.query(Processo)
+        .filter(Processo.parte_id.in_(list(processos)))
+        .order_by(Processo.parte_id, Processo.id)
+    )
+    for processo in query:
+        processos[processo.parte_id].append(processo.to_dict())
+
+    for resultado in resultados:
+        resultado["processos"] = processos[resultado["parte_id"]]
+    return resultados
@@ -0,0 +1,84 @@
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import orjson
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from config.database import SessionLocal
+from models import BuscaParte
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+
+    def __init__(self, busca_id: int, session_factory: Callable = SessionLocal):
+        self.busca_id = busca_id
+        self.session_factory = session_factory
+
+    def partes(self) -> List[BuscaParte]:
+        db = self.session_factory()
+        try:
+            partes = (
+                db.query(BuscaParte)
+                .filter(BuscaParte.busca_id == self.busca_id)
+                .order_by(BuscaParte.ordem)
+                .all()
+            )
+            db.expunge_all()
+            return partes
+        finally:
+            db.close()
+
+    def registrar_partes(self, partes_info: List[Dict]):
+        db = self.session_factory()
+        try:
+            db.add_all([
+                BuscaParte(
+                    busca_id=self.busca_id,
+                    ordem=idx,
+                    nome=parte_info["nome"],
+                    cpf_cnpj=parte_info.get("cpf_cnpj"),
+                    link=parte_info.get("link")
+                )
+                for idx, parte_info in enumerate(partes_info)
+            ])
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            logger.warning("Partes da busca %d já registradas", self.busca_id)
+        finally:
+            db.close()
+
+    def concluir(self, ordem: int, resultado: Dict):
+        self._atualizar(
+            ordem,
+            status=BuscaParte.CONCLUIDA,
+            erro=None,
+            resultado=orjson.dumps(resultado).decode("utf-8")
+        )
+
+    def falhar(self, ordem: int, erro: str, resultado: Optional[Dict] = None):
+        if resultado is None:
+            self._atualizar(ordem, status=BuscaParte.FALHOU, erro=erro)
+        else:
+            self._atualizar(
+                ordem,
+                status=BuscaParte.FALHOU,
+                erro=erro,
+                resultado=orjson.dumps(resultado).decode("utf-8")
+            )
+
+    def _atualizar(self, ordem: int, **valores):
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(BuscaParte)
+                .where(BuscaParte.busca_id == self.busca_id, BuscaParte.ordem == ordem)
+                .values(tentativas=BuscaParte.tentativas + 1, atualizado_em=datetime.utcnow(), **valores)
+            )
+            db.commit()
+        finally:
+            db.close()
@@ -0,0 +1,42 @@
+import os
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+COMPRESSAO_MINIMO_BYTES = int(os.getenv("COMPRESSAO_MINIMO_BYTES", "1024"))
+COMPRESSAO_NIVEL = int(os.getenv("COMPRESSAO_NIVEL", "6"))
+
+TIPOS_TRANSMISSAO = (b"application/x-ndjson", b"text/event-stream")
+
+
+def _transmissao(message: Message) -> bool:
+    for nome, valor in message.get("headers", []):
+        if nome.lower() == b"content-type":
+            return valor.startswith(TIPOS_TRANSMISSAO)
+    return False
+
+
+class CompressaoMiddleware:
+    def __init__(self, app: ASGIApp, minimo: int = COMPRESSAO_MINIMO_BYTES, nivel: int = COMPRESSAO_NIVEL):
+        self.app = app
+        self.minimo = minimo
+        self.nivel = nivel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def aplicacao(scope: Scope, receive: Receive, send_comprimido: Send):
+            destino = send_comprimido
+
+            async def enviar(message: Message):
+                nonlocal destino
+                if message["type"] == "http.response.start" and _transmissao(message):
+                    destino = send
+                await destino(message)
+
+            await self.app(scope, receive, enviar)
+
+        comprimir = GZipMiddleware(aplicacao, minimum_size=self.minimo, compresslevel=self.nivel)
+        await comprimir(scope, receive, send)
@@ -0,0 +1,59 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, List, Optional
+
+import orjson
+from fastapi import Request
+
+
+@dataclass(frozen=True)
+class Versao:
+    etag: str
+    ultima_modificacao: Optional[datetime] = None
+
+
+def gerar_etag(conteudo) -> str:
+    bruto = conteudo if isinstance(conteudo, bytes) else orjson.dumps(conteudo)
+    return f'"{hashlib.blake2b(bruto, digest_size=16).hexdigest()}"'
+
+
+def _utc(valor: datetime) -> datetime:
+    return valor.replace(tzinfo=timezone.utc) if valor.tzinfo is None else valor.astimezone(timezone.utc)
+
+
+def _etags(cabecalho: str) -> List[str]:
+    etags = []
+    for etag in cabecalho.split(","):
+        etag = etag.strip()
+        etags.append(etag[2:] if etag.startswith("W/") else etag)
+    return etags
+
+
+def nao_modificado(request: Request, versao: Versao) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etags = _etags(if_none_match)
+        return "*" in etags or versao.etag in etags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and versao.ultima_modificacao:
+        try:
+            desde = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _utc(versao.ultima_modificacao).replace(microsecond=0) <= _utc(desde)
+
+    return False
+
+
+def cabecalhos_validacao(versao: Versao, max_age: int) -> Dict[str, str]:
+    cabecalhos = {
+        "ETag": versao.etag,
+        "Cache-Control": f"max-age={max(0, max_age)}",
+        "Vary": "Accept"
+    }
+    if versao.ultima_modificacao:
+        cabecalhos["Last-Modified"] = format_datetime(_utc(versao.ultima_modificacao), usegmt=True)
+    return cabecalhos
@@ -0,0 +1,115 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from utils.metricas import DISJUNTOR
+
+DISJUNTOR_FALHAS = int(os.getenv("DISJUNTOR_FALHAS", "5"))
+DISJUNTOR_ESPERA_SEGUNDOS = float(os.getenv("DISJUNTOR_ESPERA_SEGUNDOS", "60"))
+
+FECHADO = "fechado"
+MEIO_ABERTO = "meio_aberto"
+ABERTO = "aberto"
+
+_CODIGOS = {FECHADO: 0, MEIO_ABERTO: 1, ABERTO: 2}
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitoAbertoError(Exception):
+
+    def __init__(self, tentar_em: float):
+        self.tentar_em = max(0.0, tentar_em)
+        super().__init__(f"Portal do TJMG indisponível, nova tentativa em {self.tentar_em:.0f}s")
+
+
+class Disjuntor:
+
+    def __init__(self, falhas: int = DISJUNTOR_FALHAS, espera: float = DISJUNTOR_ESPERA_SEGUNDOS):
+        self.limite_falhas = falhas
+        self.espera = espera
+        self._lock = threading.Lock()
+        self._estado = FECHADO
+        self._falhas = 0
+        self._aberto_em = 0.0
+        self._sonda_em: Optional[float] = None
+        self.aberturas = 0
+        self.rejeitadas = 0
+        DISJUNTOR.set(_CODIGOS[FECHADO])
+
+    def _mudar(self, estado: str):
+        if estado != self._estado:
+            logger.warning("Disjuntor do portal: %s -> %s", self._estado, estado)
+        self._estado = estado
+        DISJUNTOR.set(_CODIGOS[estado])
+
+    @property
+    def estado(self) -> str:
+        with self._lock:
+            if self._estado == ABERTO and time.monotonic() - self._aberto_em >= self.espera:
+                return MEIO_ABERTO
+            return self._estado
+
+    @property
+    def aberto(self) -> bool:
+        return self.estado == ABERTO
+
+    def permitir(self):
+        with self._lock:
+            agora = time.monotonic()
+            if self._estado == FECHADO:
+                return
+
+            if self._estado == ABERTO:
+                restante = self.espera - (agora - self._aberto_em)
+                if restante > 0:
+                    self.rejeitadas += 1
+                    raise CircuitoAbertoError(restante)
+                self._mudar(MEIO_ABERTO)
+
+            if self._sonda_em is not None and agora - self._sonda_em < self.espera:
+                self.rejeitadas += 1
+                raise CircuitoAbertoError(self.espera - (agora - self._sonda_em))
+            self._sonda_em = agora
+
+    def registrar_sucesso(self):
+        with self._lock:
+            self._falhas = 0
+            self._sonda_em = None
+            self._mudar(FECHADO)
+
+    def registrar_falha(self):
+        with self._lock:
+            self._falhas += 1
+            self._sonda_em = None
+            if self._estado == MEIO_ABERTO or self._falhas >= self.limite_falhas:
+                if self._estado != ABERTO:
+                    self.aberturas += 1
+                self._aberto_em = time.monotonic()
+                self._mudar(ABERTO)
+
+    def stats(self) -> Dict:
+        estado = self.estado
+        with self._lock:
+            return {
+                "estado": estado,
+                "falhas_consecutivas": self._falhas,
+                "aberturas": self.aberturas,
+                "rejeitadas": self.rejeitadas,
+                "tentar_em": round(max(0.0, self.espera - (time.monotonic() - self._aberto_em)), 1)
+                if estado == ABERTO else 0
+            }
+
+
+_disjuntor: Optional[Disjuntor] = None
+
+
+def get_disjuntor() -> Disjuntor:
+    global _disjuntor
+
+    if _disjuntor is None:
+        _disjuntor = Disjuntor()
+
+    return _disjuntor
@@ -0,0 +1,245 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchWindowException,
+    TimeoutException,
+    WebDriverException
+)
+
+from utils.eproc_scraper import EProcScraper
+
+SCRAPER_BACKEND = os.getenv("SCRAPER_BACKEND", "selenium").lower()
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "4"))
+DRIVER_POOL_PREWARM = int(os.getenv("DRIVER_POOL_PREWARM", "1"))
+DRIVER_POOL_MAX_USOS = int(os.getenv("DRIVER_POOL_MAX_USOS", "50"))
+DRIVER_POOL_TIMEOUT = float(os.getenv("DRIVER_POOL_TIMEOUT", "30"))
+
+
+logger = logging.getLogger(__name__)
+
+
+class PoolEsgotadoError(Exception):
+    pass
+
+
+def criar_scraper(backend: str = SCRAPER_BACKEND):
+    if backend == "http":
+        from utils.http_scraper import EProcHttpScraper
+        return EProcHttpScraper()
+    if backend == "selenium":
+        return EProcScraper(headless=True)
+    raise ValueError(f"Backend de scraping desconhecido: {backend}")
+
+
+class _Entrada:
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.usos = 0
+
+
+class DriverPool:
+
+    def __init__(
+        self,
+        factory: Optional[Callable[[], EProcScraper]] = None,
+        max_size: int = DRIVER_POOL_SIZE,
+        max_usos: int = DRIVER_POOL_MAX_USOS,
+        timeout: float = DRIVER_POOL_TIMEOUT
+    ):
+        self.factory = factory or criar_scraper
+        self.max_size = max_size
+        self.max_usos = max_usos
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        self._livres: List[_Entrada] = []
+        self._em_uso: Dict[int, _Entrada] = {}
+        self._total = 0
+        self._aguardando = 0
+        self._fechado = False
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._reciclados = 0
+        self._falhas = 0
+        self._espera_total = 0.0
+
+    def prewarm(self, quantidade: int = DRIVER_POOL_PREWARM):
+        quantidade = min(quantidade, self.max_size)
+        while True:
+            with self._cond:
+                if self._total >= quantidade:
+                    break
+                self._total += 1
+            try:
+                entrada = _Entrada(self.factory())
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._livres.append(entrada)
+                self._cond.notify()
+
+    def checkout(self, timeout: Optional[float] = None):
+        timeout = self.timeout if timeout is None else timeout
+        inicio = time.monotonic()
+        limite = inicio + timeout
+
+        with self._cond:
+            self._aguardando += 1
+            try:
+                while True:
+                    if self._fechado:
+                        raise PoolEsgotadoError("Pool de drivers encerrado")
+                    if self._livres:
+                        entrada = self._livres.pop()
+                        break
+                    if self._total < self.max_size:
+                        self._total += 1
+                        entrada = None
+                        break
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self._timeouts += 1
+                        raise PoolEsgotadoError(
+                            f"Nenhum driver disponível após {timeout:.0f}s"
+                        )
+                    self._cond.wait(restante)
+            finally:
+                self._aguardando -= 1
+
+        if entrada is None:
+            try:
+                entrada = _Entrada(self.factory())
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                    self._falhas += 1
+                    self._cond.notify()
+                raise
+
+        with self._cond:
+            entrada.usos += 1
+            self._em_uso[id(entrada.scraper)] = entrada
+            self._checkouts += 1
+            self._espera_total += time.monotonic() - inicio
+
+        return entrada.scraper
+
+    def checkin(self, scraper, descartar: bool = False):
+        with self._cond:
+            entrada = self._em_uso.pop(id(scraper), None)
+            if entrada is None:
+                return
+
+            reciclar = descartar or self._fechado or entrada.usos >= self.max_usos
+            if not reciclar:
+                self._livres.append(entrada)
+                self._cond.notify()
+                return
+
+            self._total -= 1
+            self._reciclados += 1
+            if descartar:
+                self._falhas += 1
+            self._cond.notify()
+
+        self._fechar_scraper(scraper)
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        scraper = self.checkout(timeout)
+        descartar = False
+        try:
+            yield scraper
+        except TimeoutException:
+            raise
+        except (InvalidSessionIdException, NoSuchWindowException):
+            descartar = True
+            raise
+        except WebDriverException:
+            descartar = not self._driver_ativo(scraper)
+            raise
+        finally:
+            self.checkin(scraper, descartar=descartar)
+
+    def _driver_ativo(self, scraper) -> bool:
+        verificar = getattr(scraper, "ativo", None)
+        if verificar is None:
+            return False
+        try:
+            return verificar()
+        except Exception:
+            return False
+
+    def stats(self) -> Dict:
+        with self._cond:
+            em_uso = len(self._em_uso)
+            return {
+                "max_size": self.max_size,
+                "total": self._total,
+                "em_uso": em_uso,
+                "livres": len(self._livres),
+                "aguardando": self._aguardando,
+                "saturacao": round(em_uso / self.max_size, 2) if self.max_size else 0,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "reciclados": self._reciclados,
+                "falhas": self._falhas,
+                "espera_media_ms": round(self._espera_total / self._checkouts * 1000, 2) if self._checkouts else 0
+            }
+
+    def close(self):
+        with self._cond:
+            self._fechado = True
+            livres, self._livres = self._livres, []
+            self._total -= len(livres)
+            self._cond.notify_all()
+
+        for entrada in livres:
+            self._fechar_scraper(entrada.scraper)
+
+    def _fechar_scraper(self, scraper):
+        try:
+            scraper.close()
+        except Exception as e:
+            logger.warning("Erro ao encerrar driver: %s", e)
+
+
+_pool: Optional[DriverPool] = None
+
+
+def get_driver_pool() -> DriverPool:
+    global _pool
+
+    if _pool is None:
+        _pool = DriverPool()
+
+    return _pool
+
+
+def init_driver_pool() -> DriverPool:
+    pool = get_driver_pool()
+
+    try:
+        pool.prewarm()
+    except Exception as e:
+        logger.warning("Não foi possível pré-aquecer o pool de drivers: %s", e)
+
+    return pool
+
+
+def close_driver_pool():
+    global _pool
+
+    if _pool is not None:
+        _pool.close()
+        _pool = None
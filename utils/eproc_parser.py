@@ -0,0 +1,290 @@
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+BASE_URL = "https://eproc-consulta-publica-1g.tjmg.jus.br/eproc/"
+AREA_TELA_ID = "divInfraAreaTela"
+AREA_TABELA_ID = "divInfraAreaTabela"
+TABELA_CLASSE = "infraTable"
+TABELA_EVENTOS_ID = "tblEventos"
+MARCADORES_CAPTCHA = ("captcha", "g-recaptcha", "h-captcha", "hcaptcha")
+
+_DATA_HORA_COM_SEGUNDOS = re.compile(r"^(\d{2}/\d{2}/\d{4} \d{2}:\d{2}):\d{2}$")
+_TAGS_VAZIAS = {"br", "img", "input", "meta", "link", "hr", "col", "wbr", "source", "area", "base"}
+
+
+def build_full_url(relative_url: Optional[str], base_url: str = BASE_URL) -> Optional[str]:
+    if not relative_url:
+        return None
+    return relative_url if relative_url.startswith("http") else urljoin(base_url, relative_url)
+
+
+def _limpar_texto(partes: List[str]) -> str:
+    linhas = "".join(partes).split("\n")
+    return "\n".join(" ".join(linha.split()) for linha in linhas if linha.strip())
+
+
+class Celula:
+    __slots__ = ("_texto", "_texto_link", "href")
+
+    def __init__(self):
+        self._texto: List[str] = []
+        self._texto_link: Optional[List[str]] = None
+        self.href: Optional[str] = None
+
+    @property
+    def texto(self) -> str:
+        return _limpar_texto(self._texto)
+
+    @property
+    def texto_link(self) -> Optional[str]:
+        return _limpar_texto(self._texto_link) if self._texto_link is not None else None
+
+
+class _TabelaParser(HTMLParser):
+
+    def __init__(self, tabela_id: Optional[str] = None):
+        super().__init__(convert_charrefs=True)
+        self.tabela_id = tabela_id
+        self.linhas: List[List[Celula]] = []
+        self._pilha: List[str] = []
+        self._profundidade_area: Optional[int] = 0 if tabela_id else None
+        self._profundidade_tabela: Optional[int] = None
+        self._tabela_encontrada = False
+        self._linha: Optional[List[Celula]] = None
+        self._celula: Optional[Celula] = None
+        self._em_link = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _TAGS_VAZIAS:
+            if tag == "br" and self._celula is not None:
+                self._adicionar_texto("\n")
+            return
+
+        self._pilha.append(tag)
+        profundidade = len(self._pilha)
+        attrs = dict(attrs)
+
+        if self._profundidade_area is None:
+            if attrs.get("id") == AREA_TABELA_ID:
+                self._profundidade_area = profundidade
+            return
+
+        if self._profundidade_tabela is None:
+            if tag == "table" and not self._tabela_encontrada and self._tabela_procurada(attrs):
+                self._profundidade_tabela = profundidade
+                self._tabela_encontrada = True
+            return
+
+        if tag == "tr" and self._linha is None:
+            self._linha = []
+        elif tag == "td" and self._linha is not None and self._celula is None:
+            self._celula = Celula()
+        elif tag == "a" and self._celula is not None and self._celula._texto_link is None:
+            self._celula._texto_link = []
+            self._celula.href = attrs.get("href")
+            self._em_link = True
+
+    def _tabela_procurada(self, attrs: Dict) -> bool:
+        if self.tabela_id:
+            return attrs.get("id") == self.tabela_id
+        return TABELA_CLASSE in (attrs.get("class") or "").split()
+
+    def handle_endtag(self, tag):
+        if tag in _TAGS_VAZIAS or tag not in self._pilha:
+            return
+
+        while self._pilha:
+            atual = self._pilha.pop()
+            self._fechar(atual, len(self._pilha) + 1)
+            if atual == tag:
+                break
+
+    def _fechar(self, tag: str, profundidade: int):
+        if tag == "a":
+            self._em_link = False
+        elif tag == "td" and self._celula is not None:
+            self._linha.append(self._celula)
+            self._celula = None
+        elif tag == "tr" and self._linha is not None:
+            if self._linha:
+                self.linhas.append(self._linha)
+            self._linha = None
+
+        if profundidade == self._profundidade_tabela:
+            self._profundidade_tabela = None
+        if profundidade == self._profundidade_area:
+            self._profundidade_area = None
+
+    def handle_data(self, data):
+        if self._celula is not None:
+            self._adicionar_texto(data.replace("\n", " "))
+
+    def _adicionar_texto(self, data: str):
+        self._celula._texto.append(data)
+        if self._em_link:
+            self._celula._texto_link.append(data)
+
+
+def extrair_linhas_tabela(html: str, tabela_id: Optional[str] = None) -> List[List[Celula]]:
+    parser = _TabelaParser(tabela_id)
+    parser.feed(html)
+    parser.close()
+    return parser.linhas
+
+
+def _texto_e_link(celula: Celula, base_url: str) -> Tuple[str, Optional[str]]:
+    if celula.texto_link is not None:
+        return celula.texto_link, build_full_url(celula.href, base_url)
+    return celula.texto, None
+
+
+def extrair_partes(html: str, base_url: str = BASE_URL) -> List[Dict]:
+    partes = []
+    for colunas in extrair_linhas_tabela(html):
+        nome, link = _texto_e_link(colunas[0], base_url)
+        cpf_cnpj = colunas[1].texto if len(colunas) >= 2 else ""
+
+        partes.append({
+            "nome": nome,
+            "cpf_cnpj": cpf_cnpj,
+            "link": link
+        })
+
+    return partes
+
+
+def extrair_processos(html: str, base_url: str = BASE_URL) -> List[Dict]:
+    processos = []
+    for colunas in extrair_linhas_tabela(html):
+        if len(colunas) < 5:
+            continue
+
+        numero, link_processo = _texto_e_link(colunas[0], base_url)
+
+        processos.append({
+            "numero_processo": numero,
+            "autor": colunas[1].texto,
+            "reu": colunas[2].texto,
+            "assunto": colunas[3].texto,
+            "ultimo_evento": colunas[4].texto,
+            "link_processo": link_processo
+        })
+
+    return processos
+
+
+def extrair_eventos(html: str) -> List[Dict]:
+    eventos = []
+    for colunas in extrair_linhas_tabela(html, TABELA_EVENTOS_ID):
+        if len(colunas) < 3 or not colunas[0].texto.isdigit():
+            continue
+
+        eventos.append({
+            "numero": int(colunas[0].texto),
+            "data_hora": colunas[1].texto,
+            "descricao": colunas[2].texto
+        })
+
+    return sorted(eventos, key=lambda evento: evento["numero"], reverse=True)
+
+
+def formatar_ultimo_evento(eventos: List[Dict]) -> Optional[str]:
+    if not eventos:
+        return None
+    evento = eventos[0]
+    data_hora = _DATA_HORA_COM_SEGUNDOS.sub(r"\1", evento["data_hora"])
+    return "\n".join(texto for texto in (evento["descricao"], data_hora) if texto)
+
+
+def possui_tabela(html: str) -> bool:
+    return AREA_TABELA_ID in html and TABELA_CLASSE in html
+
+
+def pagina_renderizada(html: str) -> bool:
+    return AREA_TELA_ID in html
+
+
+def possui_captcha(html: str) -> bool:
+    html_lower = html.lower()
+    return any(marcador in html_lower for marcador in MARCADORES_CAPTCHA)
+
+
+class _FormularioParser(HTMLParser):
+
+    def __init__(self, campo: str):
+        super().__init__(convert_charrefs=True)
+        self.campo = campo
+        self.formularios: List[Dict] = []
+        self._form: Optional[Dict] = None
+        self._select: Optional[str] = None
+        self._select_definido = False
+        self._textarea: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+
+        if tag == "form":
+            self._form = {
+                "action": attrs.get("action") or "",
+                "method": (attrs.get("method") or "get").lower(),
+                "campos": {},
+                "botoes": {},
+                "nome_campo": None
+            }
+            self.formularios.append(self._form)
+            return
+
+        if self._form is None:
+            return
+
+        nome = attrs.get("name")
+        if attrs.get("id") == self.campo or nome == self.campo:
+            self._form["nome_campo"] = nome or self.campo
+
+        if tag == "input" and nome:
+            tipo = (attrs.get("type") or "text").lower()
+            if tipo in ("submit", "button", "image"):
+                self._form["botoes"][attrs.get("id") or nome] = (nome, attrs.get("value") or "")
+            elif tipo in ("checkbox", "radio"):
+                if "checked" in attrs:
+                    self._form["campos"][nome] = attrs.get("value") or "on"
+            elif tipo not in ("reset", "file"):
+                self._form["campos"][nome] = attrs.get("value") or ""
+        elif tag == "button" and nome:
+            self._form["botoes"][attrs.get("id") or nome] = (nome, attrs.get("value") or "")
+        elif tag == "select" and nome:
+            self._select = nome
+            self._select_definido = False
+        elif tag == "option" and self._select:
+            if "selected" in attrs or not self._select_definido:
+                self._form["campos"][self._select] = attrs.get("value") or ""
+                self._select_definido = True
+        elif tag == "textarea" and nome:
+            self._textarea = nome
+            self._form["campos"][nome] = ""
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._form = None
+        elif tag == "select":
+            self._select = None
+        elif tag == "textarea":
+            self._textarea = None
+
+    def handle_data(self, data):
+        if self._form is not None and self._textarea:
+            self._form["campos"][self._textarea] += data
+
+
+def extrair_formulario(html: str, campo: str) -> Optional[Dict]:
+    parser = _FormularioParser(campo)
+    parser.feed(html)
+    parser.close()
+
+    for formulario in parser.formularios:
+        if formulario["nome_campo"]:
+            return formulario
+
+    return None
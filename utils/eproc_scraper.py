@@ -1,30 +1,90 @@
+import contextvars
+import logging
+import os
+import threading
 import time
-import json
-from pathlib import Path
-from typing import List, Dict, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing, contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchWindowException,
+    TimeoutException,
+    WebDriverException
+)
 from webdriver_manager.chrome import ChromeDriverManager
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from config.database import SessionLocal
-from models import Parte, Processo
+from config.database import ReadSessionLocal, SessionLocal
+from models import BuscaParte, Parte, Processo
+from utils.arquivo_bruto import get_arquivo_bruto
+from utils.checkpoint import Checkpoint
+from utils.disjuntor import CircuitoAbertoError, get_disjuntor
+from utils.eproc_parser import (
+    AREA_TABELA_ID,
+    BASE_URL,
+    TABELA_EVENTOS_ID,
+    extrair_eventos,
+    extrair_partes,
+    extrair_processos,
+    formatar_ultimo_evento,
+    pagina_renderizada,
+)
+from utils.metricas import COLETAS_EM_ANDAMENTO, PARTES_COLETADAS, PROCESSOS_COLETADOS, registrar_erro
+from utils.normalizacao import chave_nome
+from utils.rate_limiter import get_rate_limiter
+from utils.readiness import TIMEOUT_PROCESSOS, TIMEOUT_RESULTADOS, aguardar_elemento, aguardar_tabela_estavel
+from utils.timing import Cronometro
+from utils.upsert import ResultadoUpsert, upsert_processos
+
+EPROC_URL = BASE_URL + "externo_controlador.php?acao=processo_consulta_publica"
+PORTAL_TIMEOUT_SEGUNDOS = float(os.getenv("PORTAL_TIMEOUT_SEGUNDOS", "20"))
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "4"))
+MAX_CONCORRENCIA_TJMG = int(os.getenv("MAX_CONCORRENCIA_TJMG", "4"))
+BUSCA_TENTATIVAS_PARTE = int(os.getenv("BUSCA_TENTATIVAS_PARTE", "3"))
+BUSCA_BACKOFF_SEGUNDOS = float(os.getenv("BUSCA_BACKOFF_SEGUNDOS", "2"))
+
+logger = logging.getLogger(__name__)
+
+ATUALIZACAO_ATUALIZADO = "atualizado"
+ATUALIZACAO_INALTERADO = "inalterado"
+ATUALIZACAO_SEM_EVENTOS = "sem_eventos"
+ATUALIZACAO_SEM_LINK = "sem_link"
+ATUALIZACAO_NAO_ENCONTRADO = "nao_encontrado"
+ATUALIZACAO_FALHOU = "falhou"
+
+_limite_tjmg = threading.BoundedSemaphore(MAX_CONCORRENCIA_TJMG)
+
+SCRIPT_HTML_TABELA = """
+const area = document.getElementById(arguments[0]);
+return [window.location.href, area ? area.outerHTML : ""];
+"""
+
+
+class ColetaFalhouError(Exception):
+    pass
+
+
+@lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    return ChromeDriverManager().install()
 
-EPROC_URL = "https://eproc-consulta-publica-1g.tjmg.jus.br/eproc/externo_controlador.php?acao=processo_consulta_publica"
-BASE_URL = "https://eproc-consulta-publica-1g.tjmg.jus.br/eproc/"
-DATA_DIR = Path("data")
-TIMEOUT = 20
-WAIT_TIME = 2
 
 class EProcScraper:
     def __init__(self, headless: bool = True):
-        self.driver = self._init_driver(headless)
-        DATA_DIR.mkdir(exist_ok=True)
+        self.cronometro = Cronometro()
+        self.rate_limiter = get_rate_limiter()
+        self.disjuntor = get_disjuntor()
+        with self.cronometro.medir("driver_init"):
+            self.driver = self._init_driver(headless)
     
     def _init_driver(self, headless: bool) -> webdriver.Chrome:
         options = webdriver.ChromeOptions()
@@ -34,117 +94,108 @@ class EProcScraper:
         options.add_argument("--no-sandbox")
         options.add_argument("--window-size=1920,1080")
         
-        service = Service(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=options)
+        service = Service(_chromedriver_path())
+        driver = webdriver.Chrome(service=service, options=options)
+        driver.set_page_load_timeout(PORTAL_TIMEOUT_SEGUNDOS)
+        return driver
     
-    def _build_full_url(self, relative_url: str) -> str:
-        if not relative_url:
-            return None
-        return relative_url if relative_url.startswith("http") else BASE_URL + relative_url
+    def _carregar(self, url: str):
+        self.disjuntor.permitir()
+        with self.cronometro.medir("rate_limit"):
+            self.rate_limiter.aguardar()
+        with self.cronometro.medir("carregar_pagina"):
+            try:
+                self.driver.get(url)
+            except (InvalidSessionIdException, NoSuchWindowException):
+                raise
+            except WebDriverException:
+                self.disjuntor.registrar_falha()
+                raise
     
-    def _extract_text_from_link(self, element, tag: str = "a") -> tuple[str, Optional[str]]:
+    def _aguardar_portal(self, aguardar: Callable, *args, **kwargs):
         try:
-            link_elem = element.find_element(By.TAG_NAME, tag)
-            text = link_elem.text.strip()
-            link = self._build_full_url(link_elem.get_attribute("href"))
-            return text, link
-        except NoSuchElementException:
-            return element.text.strip(), None
+            resultado = aguardar(self.driver, *args, **kwargs)
+        except TimeoutException:
+            if pagina_renderizada(self.driver.page_source):
+                self.disjuntor.registrar_sucesso()
+            else:
+                self.disjuntor.registrar_falha()
+            raise
+        self.disjuntor.registrar_sucesso()
+        return resultado
+    
+    def _html_da_tabela(self, elemento_id: str = AREA_TABELA_ID) -> Tuple[str, str]:
+        url, html = self.driver.execute_script(SCRIPT_HTML_TABELA, elemento_id)
+        return html or "", url or BASE_URL
     
     def buscar_partes(self, nome: str) -> List[Dict]:
-        print(f"🔍 Pesquisando pelo nome: {nome}...")
+        logger.info("Pesquisando pelo nome: %s", nome)
         
-        self.driver.get(EPROC_URL)
-        time.sleep(WAIT_TIME)
+        self._carregar(EPROC_URL)
         
-        campo_nome = self.driver.find_element(By.ID, "txtStrParte")
+        with self.cronometro.medir("aguardar_formulario"):
+            campo_nome = self._aguardar_portal(aguardar_elemento, "txtStrParte")
         campo_nome.clear()
         campo_nome.send_keys(nome)
         
-        botao = self.driver.find_element(By.ID, "sbmNovo")
-        botao.click()
+        with self.cronometro.medir("rate_limit"):
+            self.rate_limiter.aguardar()
+        self.driver.find_element(By.ID, "sbmNovo").click()
         
         try:
-            WebDriverWait(self.driver, TIMEOUT).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "#divInfraAreaTabela .infraTable"))
-            )
-            time.sleep(WAIT_TIME)
-        except TimeoutException:
-            print("❌ Timeout ao aguardar resultados")
+            with self.cronometro.medir("aguardar_resultados"):
+                self._aguardar_portal(aguardar_tabela_estavel, TIMEOUT_RESULTADOS)
+        except TimeoutException as e:
+            if not pagina_renderizada(self.driver.page_source):
+                logger.warning("Timeout ao aguardar resultados para %s", nome)
+                registrar_erro("buscar_partes", e)
+                raise
+            logger.info("Nenhuma parte encontrada para %s", nome)
             return []
         
-        return self._extrair_partes_da_tabela()
+        with self.cronometro.medir("extrair_partes"):
+            return self._extrair_partes_da_tabela()
     
     def _extrair_partes_da_tabela(self) -> List[Dict]:
-        todas_linhas = self.driver.find_elements(By.CSS_SELECTOR, "#divInfraAreaTabela .infraTable tr")
-        
-        linhas_dados = [
-            tr for tr in todas_linhas 
-            if tr.find_elements(By.TAG_NAME, "td")
-        ]
-        
-        print(f"✅ {len(linhas_dados)} parte(s) encontrada(s)")
-        
-        partes = []
-        for linha in linhas_dados:
-            colunas = linha.find_elements(By.TAG_NAME, "td")
-            
-            if len(colunas) >= 1:
-                nome, link = self._extract_text_from_link(colunas[0])
-                cpf_cnpj = colunas[1].text.strip() if len(colunas) >= 2 else ""
-                
-                partes.append({
-                    "nome": nome,
-                    "cpf_cnpj": cpf_cnpj,
-                    "link": link
-                })
-        
+        html, url = self._html_da_tabela()
+        partes = extrair_partes(html, base_url=url)
+        logger.info("%d parte(s) encontrada(s)", len(partes))
         return partes
     
     def coletar_processos_da_parte(self, link_parte: str) -> List[Dict]:
         if not link_parte:
             return []
         
-        try:
-            self.driver.get(link_parte)
-            
-            WebDriverWait(self.driver, TIMEOUT).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "#divInfraAreaTabela .infraTable"))
-            )
-            time.sleep(WAIT_TIME)
-            
+        self._carregar(link_parte)
+        
+        with self.cronometro.medir("aguardar_processos"):
+            self._aguardar_portal(aguardar_tabela_estavel, TIMEOUT_PROCESSOS)
+        
+        with self.cronometro.medir("extrair_processos"):
             return self._extrair_processos_da_tabela()
-            
-        except Exception as e:
-            print(f"  ❌ Erro ao coletar processos: {e}")
-            return []
     
     def _extrair_processos_da_tabela(self) -> List[Dict]:
-        todas_linhas = self.driver.find_elements(By.CSS_SELECTOR, "#divInfraAreaTabela .infraTable tr")
-        
-        linhas_dados = [
-            tr for tr in todas_linhas 
-            if tr.find_elements(By.TAG_NAME, "td")
-        ]
+        html, url = self._html_da_tabela()
+        processos = extrair_processos(html, base_url=url)
+        logger.info("Coletados %d processo(s)", len(processos))
+        return processos
+    
+    def coletar_eventos_do_processo(self, link_processo: str) -> List[Dict]:
+        self._carregar(link_processo)
         
-        processos = []
-        for linha in linhas_dados:
-            colunas = linha.find_elements(By.TAG_NAME, "td")
-            
-            if len(colunas) >= 5:
-                numero, link_processo = self._extract_text_from_link(colunas[0])
-                
-                processos.append({
-                    "numero_processo": numero,
-                    "autor": colunas[1].text.strip(),
-                    "reu": colunas[2].text.strip(),
-                    "assunto": colunas[3].text.strip(),
-                    "ultimo_evento": colunas[4].text.strip(),
-                    "link_processo": link_processo
-                })
+        with self.cronometro.medir("aguardar_eventos"):
+            self._aguardar_portal(aguardar_tabela_estavel, TIMEOUT_PROCESSOS, tabela_id=TABELA_EVENTOS_ID)
         
-        print(f"  ✅ Coletados {len(processos)} processo(s)")
-        return processos
+        with self.cronometro.medir("extrair_eventos"):
+            html, _ = self._html_da_tabela(TABELA_EVENTOS_ID)
+            return extrair_eventos(html)
+    
+    def ativo(self) -> bool:
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
     
     def close(self):
         self.driver.quit()
@@ -152,46 +203,118 @@ class EProcScraper:
 
 class EProcService:
     
-    def __init__(self):
-        self.scraper = EProcScraper(headless=True)
+    def __init__(self, pool=None, workers: int = SCRAPER_WORKERS):
+        if pool is None:
+            from utils.driver_pool import get_driver_pool
+            pool = get_driver_pool()
+        self.pool = pool
+        self.workers = max(1, workers)
+        self.cronometro = Cronometro()
     
-    def buscar_e_salvar(self, nome: str) -> List[Dict]:
+    @contextmanager
+    def _scraper(self):
+        inicio = time.perf_counter()
+        with self.pool.acquire() as scraper:
+            self.cronometro.registrar("aguardar_driver", time.perf_counter() - inicio)
+            scraper.cronometro = self.cronometro
+            yield scraper
+    
+    def buscar_e_salvar(
+        self,
+        nome: str,
+        ao_concluir_parte: Optional[Callable[[int, int, Dict], None]] = None,
+        checkpoint: Optional[Checkpoint] = None
+    ) -> List[Dict]:
+        with COLETAS_EM_ANDAMENTO.track_inprogress():
+            return self._buscar_e_salvar(nome, ao_concluir_parte, checkpoint)
+    
+    def _partes_da_busca(self, nome: str, checkpoint: Optional[Checkpoint]) -> Tuple[List[Dict], Dict[int, Dict]]:
+        salvas = checkpoint.partes() if checkpoint else []
+        if salvas:
+            concluidas = {p.ordem: p.resultado_coletado for p in salvas if p.status == BuscaParte.CONCLUIDA}
+            logger.info("Retomando %s: %d de %d parte(s) já coletada(s)", nome, len(concluidas), len(salvas))
+            return [p.info() for p in salvas], concluidas
+        
+        with self._scraper() as scraper:
+            with self.cronometro.medir("buscar_partes"):
+                partes_info = scraper.buscar_partes(nome)
+        
+        if checkpoint and partes_info:
+            checkpoint.registrar_partes(partes_info)
+        return partes_info, {}
+    
+    def _buscar_e_salvar(
+        self,
+        nome: str,
+        ao_concluir_parte: Optional[Callable[[int, int, Dict], None]],
+        checkpoint: Optional[Checkpoint]
+    ) -> List[Dict]:
+        partes_info, concluidas = self._partes_da_busca(nome, checkpoint)
+        
+        if not partes_info:
+            logger.info("Nenhuma parte encontrada para %s", nome)
+            return []
+        
         db = SessionLocal()
-        resultados = []
+        resultados: List[Optional[Dict]] = [concluidas.get(idx) for idx in range(len(partes_info))]
+        pendentes = [idx for idx in range(len(partes_info)) if idx not in concluidas]
+        tentativa = 1
         
         try:
-            partes_info = self.scraper.buscar_partes(nome)
+            while pendentes:
+                repetir = []
+                with closing(self._coletar_em_paralelo([partes_info[idx] for idx in pendentes])) as coletas:
+                    for posicao, processos_data, erro in coletas:
+                        idx = pendentes[posicao]
+                        
+                        if erro and tentativa < BUSCA_TENTATIVAS_PARTE and not get_disjuntor().aberto:
+                            repetir.append(idx)
+                            if checkpoint:
+                                checkpoint.falhar(idx, erro)
+                            continue
+                        
+                        resultados[idx] = self._gravar_parte(db, idx, len(partes_info), partes_info[idx], processos_data, erro)
+                        if checkpoint:
+                            if erro:
+                                checkpoint.falhar(idx, erro, resultados[idx])
+                            else:
+                                checkpoint.concluir(idx, resultados[idx])
+                        
+                        if ao_concluir_parte:
+                            ao_concluir_parte(idx, len(partes_info), resultados[idx])
+                        
+                pendentes = sorted(repetir)
+                if pendentes:
+                    espera = BUSCA_BACKOFF_SEGUNDOS * 2 ** (tentativa - 1)
+                    tentativa += 1
+                    logger.warning(
+                        "Repetindo %d parte(s) em %.1fs (tentativa %d de %d)",
+                        len(pendentes), espera, tentativa, BUSCA_TENTATIVAS_PARTE
+                    )
+                    time.sleep(espera)
             
-            if not partes_info:
-                print("❌ Nenhuma parte encontrada")
-                return []
+            falhas = [r for r in resultados if r.get("erro")]
+            if len(falhas) == len(resultados):
+                disjuntor = get_disjuntor()
+                if disjuntor.aberto:
+                    raise CircuitoAbertoError(disjuntor.stats()["tentar_em"])
+                raise ColetaFalhouError(
+                    f"Nenhuma das {len(resultados)} parte(s) de {nome} foi coletada: {falhas[0]['erro']}"
+                )
             
-            for idx, parte_info in enumerate(partes_info, 1):
-                print(f"\n[{idx}/{len(partes_info)}] Processando: {parte_info['nome']}")
-                
-                parte = self._obter_ou_criar_parte(db, parte_info['nome'])
-                
-                processos_data = self.scraper.coletar_processos_da_parte(parte_info['link'])
-                time.sleep(1)
-                
-                self._salvar_processos(db, parte, processos_data)
-                
-                resultados.append({
-                    "nome_parte": parte_info['nome'],
-                    "cpf_cnpj": parte_info['cpf_cnpj'],
-                    "link": parte_info['link'],
-                    "processos": processos_data
-                })
-            
-            self._salvar_json(nome, resultados)
+            with self.cronometro.medir("arquivar"):
+                self._arquivar(nome, resultados)
             
             total_processos = sum(len(r["processos"]) for r in resultados)
-            print(f"\n📊 Busca finalizada:")
-            print(f"   • {len(resultados)} parte(s) coletada(s)")
-            print(f"   • {total_processos} processo(s) coletado(s)")
+            logger.info(
+                "Busca finalizada: %d parte(s), %d processo(s)",
+                len(resultados), total_processos,
+                extra={"etapas": self.cronometro.resumo()}
+            )
             
         except Exception as e:
-            print(f"❌ Erro ao processar: {e}")
+            logger.exception("Erro ao processar %s", nome)
+            registrar_erro("buscar_e_salvar", e)
             db.rollback()
             raise
         finally:
@@ -199,41 +322,209 @@ class EProcService:
         
         return resultados
     
+    def _gravar_parte(
+        self,
+        db: Session,
+        idx: int,
+        total: int,
+        parte_info: Dict,
+        processos_data: List[Dict],
+        erro: Optional[str]
+    ) -> Dict:
+        logger.info("[%d/%d] Processando: %s", idx + 1, total, parte_info['nome'])
+        
+        parte = self._obter_ou_criar_parte(db, parte_info['nome'])
+        if not erro:
+            parte.ultima_coleta_em = datetime.utcnow()
+        
+        with self.cronometro.medir("salvar_processos"):
+            gravacao = self._salvar_processos(db, parte, processos_data)
+        PARTES_COLETADAS.inc()
+        PROCESSOS_COLETADOS.inc(len(processos_data))
+        
+        resultado = {
+            "nome_parte": parte_info['nome'],
+            "cpf_cnpj": parte_info['cpf_cnpj'],
+            "link": parte_info['link'],
+            "processos": processos_data,
+            "alteracoes": gravacao.to_dict()
+        }
+        if erro:
+            resultado["erro"] = erro
+        return resultado
+    
+    def _coletar_em_paralelo(
+        self,
+        partes_info: List[Dict],
+        coletar: Optional[Callable[[Dict], List[Dict]]] = None,
+        etapa: str = "coletar_processos"
+    ) -> Iterator[Tuple[int, List[Dict], Optional[str]]]:
+        if not partes_info:
+            return
+        
+        coletar = coletar or self._coletar_parte
+        workers = min(self.workers, len(partes_info))
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coleta") as executor:
+            futures = {
+                executor.submit(contextvars.copy_context().run, coletar, parte_info): idx
+                for idx, parte_info in enumerate(partes_info)
+            }
+            
+            try:
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    try:
+                        yield idx, future.result(), None
+                    except Exception as e:
+                        logger.error("Falha ao coletar %s: %s", partes_info[idx]['nome'], e)
+                        registrar_erro(etapa, e)
+                        yield idx, [], str(e)
+            finally:
+                for future in futures:
+                    future.cancel()
+    
+    def _coletar_parte(self, parte_info: Dict) -> List[Dict]:
+        if not parte_info['link']:
+            return []
+        
+        with _limite_tjmg:
+            with self._scraper() as scraper:
+                with self.cronometro.medir("coletar_processos"):
+                    return scraper.coletar_processos_da_parte(parte_info['link'])
+    
+    def _coletar_eventos(self, alvo: Dict) -> List[Dict]:
+        with _limite_tjmg:
+            with self._scraper() as scraper:
+                with self.cronometro.medir("coletar_eventos"):
+                    return scraper.coletar_eventos_do_processo(alvo['link'])
+    
+    def atualizar_processos(self, numeros: List[str]) -> List[Dict]:
+        with COLETAS_EM_ANDAMENTO.track_inprogress():
+            return self._atualizar_processos(list(dict.fromkeys(n.strip() for n in numeros if n.strip())))
+    
+    def _localizar_processos(self, numeros: List[str]) -> Dict[str, List[Dict]]:
+        db = ReadSessionLocal()
+        try:
+            por_numero: Dict[str, List[Dict]] = defaultdict(list)
+            processos = db.query(Processo).filter(Processo.numero_processo.in_(numeros)).order_by(Processo.id)
+            for processo in processos:
+                por_numero[processo.numero_processo].append({
+                    "parte_id": processo.parte_id,
+                    **{campo: getattr(processo, campo) for campo in Processo.CAMPOS_COLETADOS}
+                })
+            return por_numero
+        finally:
+            db.close()
+    
+    def _atualizar_processos(self, numeros: List[str]) -> List[Dict]:
+        try:
+            por_numero = self._localizar_processos(numeros)
+            
+            resultados = {}
+            alvos = []
+            for numero in numeros:
+                link = next((p["link_processo"] for p in por_numero[numero] if p["link_processo"]), None)
+                if not por_numero[numero]:
+                    resultados[numero] = {"numero_processo": numero, "status": ATUALIZACAO_NAO_ENCONTRADO}
+                elif not link:
+                    resultados[numero] = {"numero_processo": numero, "status": ATUALIZACAO_SEM_LINK}
+                else:
+                    alvos.append({"nome": numero, "numero_processo": numero, "link": link})
+            
+            if not alvos:
+                return [resultados[numero] for numero in numeros]
+            
+            logger.info("Atualizando %d processo(s) pelo link direto", len(alvos))
+            coletados = {}
+            for idx, eventos, erro in self._coletar_em_paralelo(alvos, self._coletar_eventos, "coletar_eventos"):
+                coletados[alvos[idx]["numero_processo"]] = (eventos, erro)
+            
+            resultados.update(self._aplicar_eventos(por_numero, coletados))
+            logger.info("Atualização direta finalizada", extra={"etapas": self.cronometro.resumo()})
+        except Exception as e:
+            logger.exception("Erro ao atualizar processos")
+            registrar_erro("atualizar_processos", e)
+            raise
+        
+        return [resultados[numero] for numero in numeros]
+    
+    def _aplicar_eventos(
+        self,
+        por_numero: Dict[str, List[Dict]],
+        coletados: Dict[str, Tuple[List[Dict], Optional[str]]]
+    ) -> Dict[str, Dict]:
+        resultados = {}
+        ultimos = {}
+        por_parte: Dict[int, List[Dict]] = defaultdict(list)
+        
+        for numero, (eventos, erro) in coletados.items():
+            if erro:
+                resultados[numero] = {"numero_processo": numero, "status": ATUALIZACAO_FALHOU, "erro": erro}
+                continue
+            
+            ultimo_evento = formatar_ultimo_evento(eventos)
+            if ultimo_evento is None:
+                resultados[numero] = {"numero_processo": numero, "status": ATUALIZACAO_SEM_EVENTOS}
+                continue
+            
+            ultimos[numero] = (ultimo_evento, len(eventos))
+            for processo in por_numero[numero]:
+                dados = {campo: processo[campo] for campo in Processo.CAMPOS_COLETADOS}
+                dados.update(numero_processo=numero, ultimo_evento=ultimo_evento)
+                por_parte[processo["parte_id"]].append(dados)
+        
+        atualizados = set()
+        if por_parte:
+            db = SessionLocal()
+            try:
+                with self.cronometro.medir("salvar_processos"):
+                    for parte_id, dados in por_parte.items():
+                        atualizados.update(upsert_processos(db, parte_id, dados).atualizados)
+                    db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        PROCESSOS_COLETADOS.inc(len(ultimos))
+        
+        for numero, (ultimo_evento, total_eventos) in ultimos.items():
+            resultados[numero] = {
+                "numero_processo": numero,
+                "status": ATUALIZACAO_ATUALIZADO if numero in atualizados else ATUALIZACAO_INALTERADO,
+                "ultimo_evento": ultimo_evento,
+                "eventos": total_eventos
+            }
+        return resultados
+    
     def _obter_ou_criar_parte(self, db: Session, nome: str) -> Parte:
-        parte = db.query(Parte).filter(Parte.nome == nome).first()
+        chave = chave_nome(nome)
+        parte = db.query(Parte).filter(Parte.nome_normalizado == chave).order_by(Parte.id).first()
         
         if not parte:
-            parte = Parte(nome=nome)
-            db.add(parte)
-            db.commit()
-            db.refresh(parte)
+            try:
+                parte = Parte(nome=nome)
+                db.add(parte)
+                db.commit()
+                db.refresh(parte)
+            except IntegrityError:
+                db.rollback()
+                parte = db.query(Parte).filter(Parte.nome_normalizado == chave).order_by(Parte.id).first()
         
         return parte
     
-    def _salvar_processos(self, db: Session, parte: Parte, processos_data: List[Dict]):
-        for proc_data in processos_data:
-            processo = Processo(
-                numero_processo=proc_data["numero_processo"],
-                autor=proc_data["autor"],
-                reu=proc_data["reu"],
-                assunto=proc_data["assunto"],
-                ultimo_evento=proc_data["ultimo_evento"],
-                link_processo=proc_data["link_processo"],
-                parte_id=parte.id
-            )
-            db.add(processo)
-        
+    def _salvar_processos(self, db: Session, parte: Parte, processos_data: List[Dict]) -> ResultadoUpsert:
+        gravacao = upsert_processos(db, parte.id, processos_data)
         db.commit()
-    
-    def _salvar_json(self, nome: str, dados: List[Dict]):
-        if not dados:
-            return
         
-        arquivo = DATA_DIR / f"resultados_{nome.replace(' ', '_')}.json"
-        with open(arquivo, "w", encoding="utf-8") as f:
-            json.dump(dados, f, indent=4, ensure_ascii=False)
+        if gravacao.escritos:
+            logger.info(
+                "%d novo(s), %d alterado(s), %d inalterado(s)",
+                len(gravacao.inseridos), len(gravacao.atualizados), gravacao.inalterados
+            )
         
-        print(f"✅ JSON salvo em: {arquivo}")
+        return gravacao
     
-    def close(self):
-        self.scraper.close()
\ No newline at end of file
+    def _arquivar(self, nome: str, dados: List[Dict]):
+        get_arquivo_bruto().registrar(nome, dados)
\ No newline at end of file
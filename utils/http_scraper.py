@@ -0,0 +1,171 @@
+import logging
+import os
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.disjuntor import get_disjuntor
+from utils.eproc_parser import (
+    TABELA_EVENTOS_ID,
+    extrair_eventos,
+    extrair_formulario,
+    extrair_partes,
+    extrair_processos,
+    pagina_renderizada,
+    possui_captcha,
+    possui_tabela,
+)
+from utils.eproc_scraper import EPROC_URL, PORTAL_TIMEOUT_SEGUNDOS, EProcScraper
+from utils.rate_limiter import get_rate_limiter
+from utils.timing import Cronometro
+
+CAMPO_NOME = "txtStrParte"
+BOTAO_PESQUISAR = "sbmNovo"
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NavegadorNecessarioError(Exception):
+    pass
+
+
+def criar_sessao(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+class EProcHttpScraper:
+
+    def __init__(
+        self,
+        url: str = EPROC_URL,
+        session: Optional[requests.Session] = None,
+        fallback_factory: Optional[Callable[[], EProcScraper]] = None,
+        timeout: float = PORTAL_TIMEOUT_SEGUNDOS
+    ):
+        self.url = url
+        self.session = session or criar_sessao()
+        self.timeout = timeout
+        self.fallback_factory = fallback_factory or (lambda: EProcScraper(headless=True))
+        self._fallback: Optional[EProcScraper] = None
+        self.cronometro = Cronometro()
+        self.rate_limiter = get_rate_limiter()
+        self.disjuntor = get_disjuntor()
+
+    def _fallback_scraper(self) -> EProcScraper:
+        if self._fallback is None:
+            logger.info("Página exige navegador, usando Selenium")
+            self._fallback = self.fallback_factory()
+        self._fallback.cronometro = self.cronometro
+        return self._fallback
+
+    def _requisitar(self, metodo: str, url: str, **kwargs) -> requests.Response:
+        self.disjuntor.permitir()
+        with self.cronometro.medir("rate_limit"):
+            self.rate_limiter.aguardar()
+        with self.cronometro.medir("carregar_pagina"):
+            try:
+                resposta = self.session.request(metodo, url, timeout=self.timeout, **kwargs)
+            except (requests.Timeout, requests.ConnectionError):
+                self.disjuntor.registrar_falha()
+                raise
+        if resposta.status_code >= 500:
+            self.disjuntor.registrar_falha()
+        else:
+            self.disjuntor.registrar_sucesso()
+        resposta.raise_for_status()
+        return resposta
+
+    def _possui_resultados(self, html: str) -> bool:
+        if possui_captcha(html):
+            raise NavegadorNecessarioError("Página exige captcha")
+        if possui_tabela(html):
+            return True
+        if pagina_renderizada(html):
+            return False
+        raise NavegadorNecessarioError("Página depende de JavaScript")
+
+    def buscar_partes(self, nome: str) -> List[Dict]:
+        try:
+            return self._buscar_partes_http(nome)
+        except NavegadorNecessarioError:
+            return self._fallback_scraper().buscar_partes(nome)
+
+    def _buscar_partes_http(self, nome: str) -> List[Dict]:
+        logger.info("Pesquisando pelo nome: %s", nome)
+
+        pagina = self._requisitar("GET", self.url)
+        formulario = extrair_formulario(pagina.text, CAMPO_NOME)
+
+        if formulario is None or possui_captcha(pagina.text):
+            raise NavegadorNecessarioError("Formulário de consulta indisponível")
+
+        campos = dict(formulario["campos"])
+        campos[formulario["nome_campo"]] = nome
+        if BOTAO_PESQUISAR in formulario["botoes"]:
+            nome_botao, valor_botao = formulario["botoes"][BOTAO_PESQUISAR]
+            campos[nome_botao] = valor_botao
+
+        encoding = pagina.encoding or "utf-8"
+        dados = {chave: valor.encode(encoding, errors="replace") for chave, valor in campos.items()}
+        action = urljoin(pagina.url, formulario["action"] or pagina.url)
+
+        if formulario["method"] == "post":
+            resposta = self._requisitar("POST", action, data=dados)
+        else:
+            resposta = self._requisitar("GET", action, params=dados)
+
+        if not self._possui_resultados(resposta.text):
+            logger.info("Nenhum resultado encontrado para %s", nome)
+            return []
+
+        with self.cronometro.medir("extrair_partes"):
+            partes = extrair_partes(resposta.text, base_url=resposta.url)
+        logger.info("%d parte(s) encontrada(s)", len(partes))
+        return partes
+
+    def coletar_processos_da_parte(self, link_parte: str) -> List[Dict]:
+        if not link_parte:
+            return []
+
+        try:
+            resposta = self._requisitar("GET", link_parte)
+            if not self._possui_resultados(resposta.text):
+                return []
+        except NavegadorNecessarioError:
+            return self._fallback_scraper().coletar_processos_da_parte(link_parte)
+
+        with self.cronometro.medir("extrair_processos"):
+            processos = extrair_processos(resposta.text, base_url=resposta.url)
+        logger.info("Coletados %d processo(s)", len(processos))
+        return processos
+
+    def coletar_eventos_do_processo(self, link_processo: str) -> List[Dict]:
+        try:
+            resposta = self._requisitar("GET", link_processo)
+            if possui_captcha(resposta.text):
+                raise NavegadorNecessarioError("Página exige captcha")
+            if TABELA_EVENTOS_ID not in resposta.text and not pagina_renderizada(resposta.text):
+                raise NavegadorNecessarioError("Página depende de JavaScript")
+        except NavegadorNecessarioError:
+            return self._fallback_scraper().coletar_eventos_do_processo(link_processo)
+
+        with self.cronometro.medir("extrair_eventos"):
+            return extrair_eventos(resposta.text)
+
+    def close(self):
+        self.session.close()
+        if self._fallback is not None:
+            self._fallback.close()
+            self._fallback = None
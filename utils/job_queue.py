@@ -0,0 +1,293 @@
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import exists, or_, update
+
+from config.database import SessionLocal
+from models import Busca, BuscaParte
+from utils.cache import HIT, consultar_cache
+from utils.checkpoint import Checkpoint
+from utils.metricas import registrar_erro
+from utils.normalizacao import chave_nome
+from utils.single_flight import Coalescedor
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_INTERVALO = float(os.getenv("JOB_POLL_INTERVALO", "2"))
+JOB_LEASE_SEGUNDOS = int(os.getenv("JOB_LEASE_SEGUNDOS", "600"))
+
+logger = logging.getLogger(__name__)
+
+
+def _service_padrao():
+    from utils.eproc_scraper import EProcService
+    return EProcService()
+
+
+class JobQueue:
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        service_factory: Callable = _service_padrao,
+        session_factory: Callable = SessionLocal,
+        poll_intervalo: float = JOB_POLL_INTERVALO,
+        lease_segundos: int = JOB_LEASE_SEGUNDOS
+    ):
+        self.workers = workers
+        self.service_factory = service_factory
+        self.session_factory = session_factory
+        self.poll_intervalo = poll_intervalo
+        self.lease_segundos = lease_segundos
+
+        self.coalescedor = Coalescedor(session_factory)
+
+        self._evento = threading.Event()
+        self._parar = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _registrar(self, nome: str, status: str) -> Busca:
+        db = self.session_factory()
+        try:
+            agora = datetime.utcnow()
+            busca = Busca(
+                nome=nome,
+                status=status,
+                iniciado_em=agora if status == Busca.EXECUTANDO else None
+            )
+            db.add(busca)
+            db.commit()
+            db.refresh(busca)
+            db.expunge(busca)
+            return busca
+        finally:
+            db.close()
+
+    def enfileirar(self, nome: str) -> Busca:
+        busca = self._registrar(nome, Busca.PENDENTE)
+        self._evento.set()
+        return busca
+
+    def enfileirar_se_ausente(self, nome: str) -> Busca:
+        db = self.session_factory()
+        try:
+            ativa = (
+                db.query(Busca)
+                .filter(Busca.chave == chave_nome(nome), Busca.status.in_((Busca.PENDENTE, Busca.EXECUTANDO)))
+                .order_by(Busca.id.desc())
+                .first()
+            )
+            if ativa is not None:
+                db.expunge(ativa)
+                return ativa
+        finally:
+            db.close()
+
+        return self.enfileirar(nome)
+
+    def executar_agora(
+        self,
+        nome: str,
+        service=None,
+        ao_concluir_parte: Optional[Callable[[int, int, Dict], None]] = None
+    ) -> List[Dict]:
+        busca = self._registrar(nome, Busca.EXECUTANDO)
+        return self.executar(busca.id, propagar_erros=True, service=service, ao_concluir_parte=ao_concluir_parte)
+
+    def retomar(self, busca_id: int) -> bool:
+        incompletas = exists().where(BuscaParte.busca_id == Busca.id, BuscaParte.status != BuscaParte.CONCLUIDA)
+        db = self.session_factory()
+        try:
+            retomada = db.execute(
+                update(Busca)
+                .where(Busca.id == busca_id, Busca.status.in_(Busca.FINALIZADOS))
+                .where(or_(Busca.status == Busca.FALHOU, incompletas))
+                .values(status=Busca.PENDENTE, erro=None, finalizado_em=None, atualizado_em=datetime.utcnow())
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        if retomada.rowcount != 1:
+            return False
+        logger.info("Busca %d reenfileirada para retomar as partes pendentes", busca_id)
+        self._evento.set()
+        return True
+
+    def start(self):
+        self._parar.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        logger.info("%d worker(s) de busca iniciados", self.workers)
+
+    def stop(self, timeout: Optional[float] = 5):
+        self._parar.set()
+        self._evento.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _loop(self):
+        while not self._parar.is_set():
+            busca_id = self._reivindicar()
+            if busca_id is None:
+                self._evento.wait(self.poll_intervalo)
+                self._evento.clear()
+                continue
+
+            self.executar(busca_id)
+
+    def _reivindicar(self) -> Optional[int]:
+        db = self.session_factory()
+        try:
+            self._recuperar_abandonadas(db)
+
+            candidatos = (
+                db.query(Busca.id)
+                .filter(Busca.status == Busca.PENDENTE)
+                .order_by(Busca.id)
+                .limit(self.workers)
+                .all()
+            )
+
+            for (busca_id,) in candidatos:
+                agora = datetime.utcnow()
+                reivindicada = db.execute(
+                    update(Busca)
+                    .where(Busca.id == busca_id, Busca.status == Busca.PENDENTE)
+                    .values(status=Busca.EXECUTANDO, iniciado_em=agora, atualizado_em=agora)
+                )
+                db.commit()
+                if reivindicada.rowcount == 1:
+                    return busca_id
+
+            return None
+        finally:
+            db.close()
+
+    def _recuperar_abandonadas(self, db):
+        limite = datetime.utcnow() - timedelta(seconds=self.lease_segundos)
+        recuperadas = db.execute(
+            update(Busca)
+            .where(Busca.status == Busca.EXECUTANDO, Busca.atualizado_em < limite)
+            .values(status=Busca.PENDENTE, atualizado_em=datetime.utcnow())
+        )
+        db.commit()
+        if recuperadas.rowcount:
+            logger.warning("%d busca(s) abandonada(s) reenfileirada(s)", recuperadas.rowcount)
+
+    def executar(
+        self,
+        busca_id: int,
+        propagar_erros: bool = False,
+        service=None,
+        ao_concluir_parte: Optional[Callable[[int, int, Dict], None]] = None
+    ) -> List[Dict]:
+        db = self.session_factory()
+        resultados = []
+        try:
+            busca = db.get(Busca, busca_id)
+            nome = busca.nome
+            logger.info("Executando busca %d: %s", busca_id, nome)
+            concluidas = {
+                ordem for (ordem,) in (
+                    db.query(BuscaParte.ordem)
+                    .filter(BuscaParte.busca_id == busca_id, BuscaParte.resultado.isnot(None))
+                )
+            }
+            db.commit()
+
+            def registrar_parcial(idx: int, total: int, resultado: dict):
+                concluidas.add(idx)
+                busca.total_partes = total
+                busca.partes_concluidas = len(concluidas)
+                db.commit()
+                if ao_concluir_parte:
+                    ao_concluir_parte(idx, total, resultado)
+
+            try:
+                service = service or self.service_factory()
+                resultados = self.coalescedor.executar(
+                    chave_nome(nome),
+                    lambda: service.buscar_e_salvar(
+                        nome,
+                        ao_concluir_parte=registrar_parcial,
+                        checkpoint=Checkpoint(busca_id, self.session_factory)
+                    ),
+                    lambda: self._resultado_recente(nome)
+                )
+            except Exception as e:
+                db.rollback()
+                busca.status = Busca.FALHOU
+                busca.erro = str(e)
+                busca.finalizado_em = datetime.utcnow()
+                db.commit()
+                logger.error("Busca %d falhou: %s", busca_id, e)
+                registrar_erro("busca", e)
+                if propagar_erros:
+                    raise
+            else:
+                if busca.partes.first() is None:
+                    db.add_all([
+                        BuscaParte(
+                            busca_id=busca_id,
+                            ordem=idx,
+                            nome=r["nome_parte"],
+                            cpf_cnpj=r.get("cpf_cnpj"),
+                            link=r.get("link"),
+                            status=BuscaParte.FALHOU if r.get("erro") else BuscaParte.CONCLUIDA,
+                            erro=r.get("erro"),
+                            resultado_coletado=r
+                        )
+                        for idx, r in enumerate(resultados)
+                    ])
+                busca.resultado = None
+                busca.total_partes = len(resultados)
+                busca.partes_concluidas = len(resultados)
+                busca.status = Busca.CONCLUIDA
+                busca.finalizado_em = datetime.utcnow()
+                db.commit()
+        finally:
+            db.close()
+
+        return resultados
+
+
+    def _resultado_recente(self, nome: str) -> Optional[List[Dict]]:
+        db = self.session_factory()
+        try:
+            cache = consultar_cache(db, nome)
+            return cache.resultados if cache and cache.estado == HIT else None
+        finally:
+            db.close()
+
+
+_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    global _queue
+
+    if _queue is None:
+        _queue = JobQueue()
+
+    return _queue
+
+
+def start_job_queue() -> JobQueue:
+    queue = get_job_queue()
+    queue.start()
+    return queue
+
+
+def stop_job_queue():
+    global _queue
+
+    if _queue is not None:
+        _queue.stop()
+        _queue = None
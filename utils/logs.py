@@ -0,0 +1,87 @@
+import logging
+import os
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+LOG_NIVEL = os.getenv("LOG_NIVEL", "INFO").upper()
+LOG_FORMATO = os.getenv("LOG_FORMATO", "json").lower()
+
+CABECALHO_REQUEST_ID = "X-Request-ID"
+
+request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+_REQUEST_ID_VALIDO = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+_ATRIBUTOS_PADRAO = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class FormatadorJSON(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        registro = {
+            "momento": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", request_id.get()),
+            "mensagem": record.getMessage(),
+        }
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_PADRAO:
+                registro[chave] = valor
+        if record.exc_info:
+            registro["excecao"] = self.formatException(record.exc_info)
+        return orjson.dumps(registro, default=str).decode("utf-8")
+
+
+FORMATO_TEXTO = "%(asctime)s %(levelname)-7s [%(request_id)s] %(name)s: %(message)s"
+
+
+def configurar_logs(nivel: str = LOG_NIVEL, formato: str = LOG_FORMATO):
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(RequestIdFilter())
+    handler.setFormatter(FormatadorJSON() if formato == "json" else logging.Formatter(FORMATO_TEXTO))
+
+    raiz = logging.getLogger()
+    for existente in list(raiz.handlers):
+        if getattr(existente, "_eproc", False):
+            raiz.removeHandler(existente)
+    handler._eproc = True
+    raiz.addHandler(handler)
+    raiz.setLevel(nivel)
+
+
+class RequestIdMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recebido = dict(scope["headers"]).get(CABECALHO_REQUEST_ID.lower().encode(), b"").decode("latin-1")
+        identificador = recebido if _REQUEST_ID_VALIDO.match(recebido) else uuid.uuid4().hex[:16]
+        token = request_id.set(identificador)
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                mensagem.setdefault("headers", [])
+                mensagem["headers"] = list(mensagem["headers"]) + [
+                    (CABECALHO_REQUEST_ID.lower().encode(), identificador.encode())
+                ]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,123 @@
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from config.database import ReadSessionLocal
+from utils.cache import MISS, STALE, consultar_cache
+from utils.job_queue import get_job_queue
+from utils.metricas import CACHE, registrar_erro
+from utils.normalizacao import chave_nome, normalizar_nome
+
+LOTE_MAXIMO_NOMES = int(os.getenv("LOTE_MAXIMO_NOMES", "500"))
+LOTE_WORKERS = int(os.getenv("LOTE_WORKERS", "2"))
+LOTE_PRAZO_SEGUNDOS = float(os.getenv("LOTE_PRAZO_SEGUNDOS", "600"))
+LOTE_PRAZO_MAXIMO = float(os.getenv("LOTE_PRAZO_MAXIMO", "3600"))
+
+logger = logging.getLogger(__name__)
+
+CONCLUIDO = "concluido"
+NAO_ENCONTRADO = "nao_encontrado"
+FALHOU = "falhou"
+PRAZO_ESGOTADO = "prazo_esgotado"
+
+
+@dataclass
+class ItemLote:
+    nome: str
+    status: str
+    origem: Optional[str] = None
+    cache: Optional[str] = None
+    resultados: List[Dict] = field(default_factory=list)
+    erro: Optional[str] = None
+
+
+def deduplicar(nomes: Iterable[str]) -> List[str]:
+    unicos: Dict[str, str] = {}
+    for nome in nomes:
+        normalizado = normalizar_nome(nome)
+        chave = chave_nome(normalizado)
+        if chave and chave not in unicos:
+            unicos[chave] = normalizado
+    return list(unicos.values())
+
+
+def _consultar_banco(nome: str):
+    db = ReadSessionLocal()
+    try:
+        return consultar_cache(db, nome)
+    finally:
+        db.close()
+
+
+def _concluido(nome: str, origem: str, cache: str, resultados: List[Dict]) -> ItemLote:
+    status = CONCLUIDO if resultados else NAO_ENCONTRADO
+    return ItemLote(nome=nome, status=status, origem=origem, cache=cache, resultados=resultados)
+
+
+def _esgotado(nome: str, prazo: float) -> ItemLote:
+    return ItemLote(nome=nome, status=PRAZO_ESGOTADO, erro=f"Prazo de {prazo:g}s esgotado")
+
+
+def processar_lote(
+    nomes: List[str],
+    prazo: float = LOTE_PRAZO_SEGUNDOS,
+    service_factory: Optional[Callable] = None,
+    force_refresh: bool = False,
+    workers: int = LOTE_WORKERS
+) -> Iterator[ItemLote]:
+    limite = time.monotonic() + prazo
+    pendentes = []
+
+    for nome in nomes:
+        if time.monotonic() >= limite:
+            yield _esgotado(nome, prazo)
+            continue
+
+        cache = None if force_refresh else _consultar_banco(nome)
+        estado = cache.estado if cache else MISS
+        CACHE.labels(estado=estado).inc()
+        if estado == MISS:
+            pendentes.append(nome)
+            continue
+
+        if estado == STALE:
+            get_job_queue().enfileirar_se_ausente(nome)
+        yield _concluido(nome, "database", estado, cache.resultados)
+
+    if not pendentes:
+        return
+
+    if service_factory is None:
+        from utils.eproc_scraper import EProcService
+        service_factory = EProcService
+    service = service_factory()
+
+    logger.info("Lote: %d nome(s) para coletar com %d worker(s)", len(pendentes), min(workers, len(pendentes)))
+    fila = get_job_queue()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(pendentes))), thread_name_prefix="lote")
+    futuros = {executor.submit(contextvars.copy_context().run, fila.executar_agora, nome, service): nome for nome in pendentes}
+
+    try:
+        for futuro in as_completed(list(futuros), timeout=max(0, limite - time.monotonic())):
+            nome = futuros.pop(futuro)
+            try:
+                resultados = futuro.result()
+            except Exception as e:
+                logger.error("Lote: erro ao coletar %s: %s", nome, e)
+                registrar_erro("lote", e)
+                yield ItemLote(nome=nome, status=FALHOU, origem="scraper", cache=MISS, erro=str(e))
+                continue
+            yield _concluido(nome, "scraper", MISS, resultados)
+    except TimeoutError:
+        for futuro in futuros:
+            futuro.cancel()
+        for nome in list(futuros.values()):
+            yield _esgotado(nome, prazo)
+    finally:
+        for futuro in futuros:
+            futuro.cancel()
+        executor.shutdown(wait=False)
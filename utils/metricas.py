@@ -0,0 +1,105 @@
+import time
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+BUCKETS_ETAPA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BUCKETS_HTTP = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REGISTRO = CollectorRegistry()
+
+ETAPA_SEGUNDOS = Histogram(
+    "eproc_etapa_segundos",
+    "Duração de cada etapa da coleta e da resposta",
+    ["etapa"],
+    buckets=BUCKETS_ETAPA,
+    registry=REGISTRO
+)
+PROCESSOS_COLETADOS = Counter(
+    "eproc_processos_coletados_total",
+    "Linhas de processo extraídas do eproc",
+    registry=REGISTRO
+)
+PARTES_COLETADAS = Counter(
+    "eproc_partes_coletadas_total",
+    "Partes cujos processos foram coletados",
+    registry=REGISTRO
+)
+ERROS = Counter(
+    "eproc_erros_total",
+    "Erros por etapa e tipo de exceção",
+    ["etapa", "tipo"],
+    registry=REGISTRO
+)
+CACHE = Counter(
+    "eproc_cache_total",
+    "Consultas por estado do cache",
+    ["estado"],
+    registry=REGISTRO
+)
+COLETAS_EM_ANDAMENTO = Gauge(
+    "eproc_coletas_em_andamento",
+    "Buscas no eproc em execução neste processo",
+    registry=REGISTRO
+)
+DRIVERS = Gauge(
+    "eproc_drivers",
+    "Navegadores do pool por estado",
+    ["estado"],
+    registry=REGISTRO
+)
+VERIFICACOES = Counter(
+    "eproc_verificacoes_total",
+    "Verificações agendadas de nomes monitorados por status",
+    ["status"],
+    registry=REGISTRO
+)
+DISJUNTOR = Gauge(
+    "eproc_disjuntor_estado",
+    "Disjuntor do portal: 0 fechado, 1 meio aberto, 2 aberto",
+    registry=REGISTRO
+)
+HTTP_REQUISICOES = Counter(
+    "eproc_http_requisicoes_total",
+    "Requisições HTTP atendidas",
+    ["metodo", "rota", "status"],
+    registry=REGISTRO
+)
+HTTP_DURACAO = Histogram(
+    "eproc_http_duracao_segundos",
+    "Duração das requisições HTTP até o fim da resposta",
+    ["metodo", "rota"],
+    buckets=BUCKETS_HTTP,
+    registry=REGISTRO
+)
+
+
+def registrar_erro(etapa: str, erro: BaseException):
+    ERROS.labels(etapa=etapa, tipo=type(erro).__name__).inc()
+
+
+class MetricasMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        status = 500
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            rota = scope.get("route")
+            caminho = getattr(rota, "path", None) or "nao_encontrada"
+            HTTP_REQUISICOES.labels(metodo=scope["method"], rota=caminho, status=status).inc()
+            HTTP_DURACAO.labels(metodo=scope["method"], rota=caminho).observe(time.perf_counter() - inicio)
@@ -0,0 +1,330 @@
+import logging
+import os
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, case, update
+from sqlalchemy.orm import Session
+
+from config.database import SessionLocal
+from models import Monitorado, Verificacao
+from utils.disjuntor import get_disjuntor
+from utils.job_queue import get_job_queue
+from utils.logs import request_id
+from utils.metricas import VERIFICACOES, registrar_erro
+from utils.normalizacao import chave_nome
+from utils.rate_limiter import RateLimiterBanco
+from utils.upsert import insert_do_dialeto
+
+MONITORAMENTO_INTERVALO_PADRAO = int(os.getenv("MONITORAMENTO_INTERVALO_PADRAO", "86400"))
+MONITORAMENTO_INTERVALO_MINIMO = int(os.getenv("MONITORAMENTO_INTERVALO_MINIMO", "900"))
+MONITORAMENTO_ORCAMENTO_DIARIO = int(os.getenv("MONITORAMENTO_ORCAMENTO_DIARIO", "2000"))
+MONITORAMENTO_POLL_INTERVALO = float(os.getenv("MONITORAMENTO_POLL_INTERVALO", "30"))
+MONITORAMENTO_LEASE_SEGUNDOS = int(os.getenv("MONITORAMENTO_LEASE_SEGUNDOS", "600"))
+
+SEGUNDOS_POR_DIA = 86400
+CHAVE_ORCAMENTO = "monitoramento"
+CANDIDATOS = 200
+
+logger = logging.getLogger(__name__)
+
+
+def _defasagem(chave: str, intervalo: int) -> timedelta:
+    return timedelta(seconds=zlib.crc32(chave.encode("utf-8")) % max(1, intervalo))
+
+
+def monitorar(
+    db: Session,
+    nome: str,
+    intervalo_segundos: int = MONITORAMENTO_INTERVALO_PADRAO,
+    prioridade: int = 0
+) -> Monitorado:
+    intervalo = max(MONITORAMENTO_INTERVALO_MINIMO, intervalo_segundos)
+    chave = chave_nome(nome)
+    agora = datetime.utcnow()
+
+    insert = insert_do_dialeto(db.get_bind().dialect.name)
+    if insert is None:
+        return _monitorar_generico(db, nome, intervalo, prioridade)
+
+    antecipada = agora + timedelta(seconds=intervalo)
+    stmt = insert(Monitorado).values(
+        nome=nome,
+        chave=chave,
+        intervalo_segundos=intervalo,
+        prioridade=prioridade,
+        ativo=True,
+        proxima_em=agora + _defasagem(chave, intervalo)
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Monitorado.chave],
+        set_={
+            "intervalo_segundos": stmt.excluded.intervalo_segundos,
+            "prioridade": stmt.excluded.prioridade,
+            "ativo": True,
+            "proxima_em": case(
+                (and_(Monitorado.intervalo_segundos > intervalo, Monitorado.proxima_em > antecipada), antecipada),
+                else_=Monitorado.proxima_em
+            )
+        }
+    )
+    db.execute(stmt)
+    db.commit()
+    return db.query(Monitorado).filter(Monitorado.chave == chave).populate_existing().one()
+
+
+def _monitorar_generico(db: Session, nome: str, intervalo: int, prioridade: int) -> Monitorado:
+    monitorado = db.query(Monitorado).filter(Monitorado.chave == chave_nome(nome)).first()
+
+    if monitorado is None:
+        monitorado = Monitorado(nome=nome, intervalo_segundos=intervalo, prioridade=prioridade)
+        monitorado.proxima_em = datetime.utcnow() + _defasagem(monitorado.chave, intervalo)
+        db.add(monitorado)
+    else:
+        if intervalo < monitorado.intervalo_segundos:
+            monitorado.proxima_em = min(monitorado.proxima_em, datetime.utcnow() + timedelta(seconds=intervalo))
+        monitorado.intervalo_segundos = intervalo
+        monitorado.prioridade = prioridade
+        monitorado.ativo = True
+
+    db.commit()
+    db.refresh(monitorado)
+    return monitorado
+
+
+def pontuacao(monitorado: Monitorado, agora: datetime) -> float:
+    atraso = (agora - monitorado.proxima_em).total_seconds() / monitorado.intervalo_segundos
+    nunca_verificado = 1.0 if monitorado.ultima_verificacao_em is None else 0.0
+    return atraso + monitorado.taxa_alteracao + nunca_verificado + monitorado.prioridade
+
+
+def diferencas(resultados: List[Dict]) -> List[Dict]:
+    alteradas = []
+    for resultado in resultados:
+        alteracoes = resultado.get("alteracoes") or {}
+        inseridos = alteracoes.get("numeros_inseridos") or []
+        atualizados = set(alteracoes.get("numeros_atualizados") or [])
+        if not inseridos and not atualizados:
+            continue
+        alteradas.append({
+            "nome_parte": resultado["nome_parte"],
+            "inseridos": inseridos,
+            "atualizados": [
+                {"numero_processo": p["numero_processo"], "ultimo_evento": p.get("ultimo_evento")}
+                for p in resultado.get("processos", [])
+                if p.get("numero_processo") in atualizados
+            ]
+        })
+    return alteradas
+
+
+class Agendador:
+
+    def __init__(
+        self,
+        orcamento_diario: int = MONITORAMENTO_ORCAMENTO_DIARIO,
+        service_factory: Optional[Callable] = None,
+        session_factory: Callable = SessionLocal,
+        poll_intervalo: float = MONITORAMENTO_POLL_INTERVALO,
+        lease_segundos: int = MONITORAMENTO_LEASE_SEGUNDOS
+    ):
+        self.orcamento_diario = orcamento_diario
+        self.service_factory = service_factory
+        self.session_factory = session_factory
+        self.poll_intervalo = poll_intervalo
+        self.lease_segundos = lease_segundos
+        self.orcamento = RateLimiterBanco(
+            intervalo_minimo=SEGUNDOS_POR_DIA / orcamento_diario if orcamento_diario > 0 else 0,
+            rajada=1,
+            session_factory=session_factory,
+            chave=CHAVE_ORCAMENTO
+        )
+
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.orcamento_diario <= 0:
+            logger.info("Monitoramento desligado (MONITORAMENTO_ORCAMENTO_DIARIO=0)")
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name="monitoramento", daemon=True)
+        self._thread.start()
+        logger.info("Monitoramento iniciado com orçamento de %d requisição(ões) por dia", self.orcamento_diario)
+
+    def stop(self, timeout: Optional[float] = 5):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self):
+        while not self._parar.is_set():
+            espera = self.orcamento.consumir(0)
+            if espera > 0:
+                self._parar.wait(min(espera, self.poll_intervalo))
+                continue
+
+            if get_disjuntor().aberto:
+                self._parar.wait(self.poll_intervalo)
+                continue
+
+            try:
+                verificacao = self.executar_proximo()
+            except Exception as e:
+                logger.exception("Erro no agendador de monitoramento")
+                registrar_erro("monitoramento", e)
+                verificacao = None
+
+            if verificacao is None:
+                self._parar.wait(self.poll_intervalo)
+
+    def _reivindicar(self) -> Optional[Monitorado]:
+        db = self.session_factory()
+        try:
+            agora = datetime.utcnow()
+            candidatos = (
+                db.query(Monitorado)
+                .filter(Monitorado.ativo.is_(True), Monitorado.proxima_em <= agora)
+                .order_by(Monitorado.proxima_em)
+                .limit(CANDIDATOS)
+                .all()
+            )
+            db.expunge_all()
+
+            for monitorado in sorted(candidatos, key=lambda m: pontuacao(m, agora), reverse=True):
+                reivindicado = db.execute(
+                    update(Monitorado)
+                    .where(Monitorado.id == monitorado.id, Monitorado.proxima_em == monitorado.proxima_em)
+                    .values(proxima_em=agora + timedelta(seconds=self.lease_segundos))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                if reivindicado.rowcount == 1:
+                    return monitorado
+
+            return None
+        finally:
+            db.close()
+
+    def _criar_service(self):
+        if self.service_factory is None:
+            from utils.eproc_scraper import EProcService
+            self.service_factory = EProcService
+        return self.service_factory()
+
+    def executar_proximo(self) -> Optional[Dict]:
+        monitorado = self._reivindicar()
+        if monitorado is None:
+            return None
+
+        token = request_id.set(f"monitorado-{monitorado.id}")
+        try:
+            return self._verificar(monitorado)
+        finally:
+            request_id.reset(token)
+
+    def _verificar(self, monitorado: Monitorado) -> Dict:
+        iniciado_em = datetime.utcnow()
+        inicio = time.monotonic()
+        logger.info("Verificando %s", monitorado.nome)
+
+        try:
+            resultados = get_job_queue().executar_agora(monitorado.nome, service=self._criar_service())
+            erro = None
+        except Exception as e:
+            resultados = []
+            erro = str(e)
+            logger.error("Verificação de %s falhou: %s", monitorado.nome, e)
+            registrar_erro("monitoramento", e)
+
+        custo = 1 + sum(1 for r in resultados if r.get("link"))
+        self.orcamento.consumir(custo)
+
+        return self._registrar(monitorado, resultados, erro, iniciado_em, time.monotonic() - inicio, custo)
+
+    def _registrar(
+        self,
+        monitorado: Monitorado,
+        resultados: List[Dict],
+        erro: Optional[str],
+        iniciado_em: datetime,
+        duracao: float,
+        custo: int
+    ) -> Dict:
+        alteradas = diferencas(resultados)
+        totais = {"inseridos": 0, "atualizados": 0, "inalterados": 0}
+        for resultado in resultados:
+            alteracoes = resultado.get("alteracoes") or {}
+            for chave in totais:
+                totais[chave] += alteracoes.get(chave, 0)
+
+        verificacao = Verificacao(
+            monitorado_id=monitorado.id,
+            status=Verificacao.FALHOU if erro else Verificacao.CONCLUIDA,
+            erro=erro,
+            duracao_segundos=round(duracao, 3),
+            iniciado_em=iniciado_em,
+            finalizado_em=datetime.utcnow(),
+            **totais
+        )
+        verificacao.partes_alteradas = alteradas
+
+        db = self.session_factory()
+        try:
+            atual = db.get(Monitorado, monitorado.id)
+            if atual is None:
+                return verificacao.to_dict()
+
+            agora = verificacao.finalizado_em
+            intervalo = timedelta(seconds=atual.intervalo_segundos)
+            if erro:
+                atual.falhas_consecutivas += 1
+                espera = MONITORAMENTO_INTERVALO_MINIMO * 2 ** (atual.falhas_consecutivas - 1)
+                atual.proxima_em = agora + min(intervalo, timedelta(seconds=espera))
+            else:
+                atual.falhas_consecutivas = 0
+                atual.verificacoes += 1
+                atual.ultima_verificacao_em = agora
+                atual.custo_estimado = custo
+                if alteradas:
+                    atual.verificacoes_com_alteracao += 1
+                    atual.ultima_alteracao_em = agora
+                proxima = monitorado.proxima_em + intervalo
+                atual.proxima_em = proxima if proxima > agora else agora + intervalo
+
+            db.add(verificacao)
+            db.commit()
+            VERIFICACOES.labels(status=verificacao.status).inc()
+            return verificacao.to_dict()
+        finally:
+            db.close()
+
+
+_agendador: Optional[Agendador] = None
+
+
+def get_agendador() -> Agendador:
+    global _agendador
+
+    if _agendador is None:
+        _agendador = Agendador()
+
+    return _agendador
+
+
+def start_agendador() -> Agendador:
+    agendador = get_agendador()
+    agendador.start()
+    return agendador
+
+
+def stop_agendador():
+    global _agendador
+
+    if _agendador is not None:
+        _agendador.stop()
+        _agendador = None
@@ -0,0 +1,44 @@
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence
+
+import orjson
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Column
+from sqlalchemy.orm import Query, Session
+
+from config.database import ReadSessionLocal
+from utils.paginacao import percorrer
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+RESPOSTA_NDJSON = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string", "description": "Um objeto JSON por linha"}}}
+    }
+}
+
+
+def aceita_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _linhas(registros: Iterable[Dict]) -> Iterator[bytes]:
+    for registro in registros:
+        yield orjson.dumps(registro, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def resposta_ndjson(registros: Iterable[Dict], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    return StreamingResponse(_linhas(registros), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+def transmitir_consulta(
+    montar_query: Callable[[Session], Query],
+    chave: Sequence[Column],
+    cursor: Optional[str] = None
+) -> Iterator[Dict]:
+    db = ReadSessionLocal()
+    try:
+        for item in percorrer(montar_query(db), chave, cursor):
+            yield item.to_dict()
+    finally:
+        db.close()
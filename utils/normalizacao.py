@@ -0,0 +1,11 @@
+import unicodedata
+
+
+def normalizar_nome(nome: str) -> str:
+    return " ".join(nome.upper().split())
+
+
+def chave_nome(nome: str) -> str:
+    decomposto = unicodedata.normalize("NFKD", nome or "")
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
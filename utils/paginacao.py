@@ -0,0 +1,64 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Column, DateTime, tuple_
+from sqlalchemy.orm import Query
+
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 500
+LOTE_STREAMING = 500
+
+
+class CursorInvalidoError(ValueError):
+    pass
+
+
+@dataclass
+class Pagina:
+    itens: List[Any]
+    proximo_cursor: Optional[str]
+
+
+def codificar_cursor(valores: Sequence) -> str:
+    bruto = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in valores])
+    return base64.urlsafe_b64encode(bruto.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str, chave: Sequence[Column]) -> List:
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        valores = json.loads(bruto)
+        if not isinstance(valores, list) or len(valores) != len(chave):
+            raise ValueError("quantidade de valores incompatível")
+        return [
+            datetime.fromisoformat(valor) if isinstance(coluna.type, DateTime) else int(valor)
+            for coluna, valor in zip(chave, valores)
+        ]
+    except (ValueError, TypeError) as e:
+        raise CursorInvalidoError(f"Cursor inválido: {cursor}") from e
+
+
+def paginar(query: Query, chave: Sequence[Column], cursor: Optional[str], limite: int = LIMITE_PADRAO) -> Pagina:
+    if cursor:
+        valores = decodificar_cursor(cursor, chave)
+        query = query.filter(tuple_(*chave) > tuple_(*valores))
+
+    itens = query.order_by(*chave).limit(limite + 1).all()
+
+    proximo_cursor = None
+    if len(itens) > limite:
+        itens = itens[:limite]
+        proximo_cursor = codificar_cursor([getattr(itens[-1], coluna.key) for coluna in chave])
+
+    return Pagina(itens=itens, proximo_cursor=proximo_cursor)
+
+
+def percorrer(query: Query, chave: Sequence[Column], cursor: Optional[str] = None, lote: int = LOTE_STREAMING) -> Iterator[Any]:
+    if cursor:
+        valores = decodificar_cursor(cursor, chave)
+        query = query.filter(tuple_(*chave) > tuple_(*valores))
+
+    yield from query.order_by(*chave).yield_per(lote)
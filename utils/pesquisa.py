@@ -0,0 +1,122 @@
+import re
+from typing import Dict, List, Sequence
+
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.orm import Session
+
+from models import Parte
+from models.indice_textual import suportado
+from utils.normalizacao import chave_nome
+
+PESOS_PROCESSOS = (1.0, 1.0, 3.0, 1.5)
+PESOS_PARTES = (1.0,)
+MARCA_INICIO = "<mark>"
+MARCA_FIM = "</mark>"
+TOKENS_SNIPPET = 12
+MINIMO_TRIGRAMA = 3
+FIM_PREFIXO = "\U0010ffff"
+
+_TERMO = re.compile(r"\w+\*?")
+
+
+class ConsultaInvalidaError(ValueError):
+    pass
+
+
+def montar_consulta(termos: str) -> str:
+    partes = []
+    for termo in _TERMO.findall(termos or ""):
+        prefixo = termo.endswith("*")
+        palavra = termo.rstrip("*")
+        partes.append(f'"{palavra}"*' if prefixo else f'"{palavra}"')
+
+    if not partes:
+        raise ConsultaInvalidaError(f"Consulta sem termos pesquisáveis: {termos!r}")
+
+    return " ".join(partes)
+
+
+def _ranquear(db: Session, indice: str, pesos: Sequence[float], consulta: str, limite: int, offset: int) -> Dict[int, float]:
+    lista_pesos = ", ".join(str(peso) for peso in pesos)
+    linhas = db.execute(text(
+        f"SELECT rowid, bm25({indice}, {lista_pesos}) AS relevancia FROM {indice} "
+        f"WHERE {indice} MATCH :consulta ORDER BY relevancia LIMIT :limite OFFSET :offset"
+    ), {"consulta": consulta, "limite": limite, "offset": offset}).all()
+    return {rowid: relevancia for rowid, relevancia in linhas}
+
+
+def _detalhar(db: Session, sql: str, consulta: str, relevancias: Dict[int, float], **tipos) -> List[Dict]:
+    if not relevancias:
+        return []
+
+    linhas = db.execute(
+        text(sql).bindparams(bindparam("ids", expanding=True)).columns(**tipos),
+        {"consulta": consulta, "ids": list(relevancias), "inicio": MARCA_INICIO, "fim": MARCA_FIM}
+    ).mappings().all()
+
+    resultados = [{**linha, "relevancia": relevancias[linha["id"]]} for linha in linhas]
+    resultados.sort(key=lambda r: r["relevancia"])
+    return resultados
+
+
+def pesquisar_processos(db: Session, termos: str, limite: int, offset: int = 0) -> List[Dict]:
+    consulta = montar_consulta(termos)
+    relevancias = _ranquear(db, "processos_fts", PESOS_PROCESSOS, consulta, limite, offset)
+
+    return _detalhar(
+        db,
+        "SELECT p.id, p.numero_processo, p.autor, p.reu, p.assunto, p.ultimo_evento, "
+        "p.link_processo, p.parte_id, p.atualizado_em, "
+        f"snippet(processos_fts, -1, :inicio, :fim, '…', {TOKENS_SNIPPET}) AS trecho "
+        "FROM processos_fts JOIN processos p ON p.id = processos_fts.rowid "
+        "WHERE processos_fts MATCH :consulta AND processos_fts.rowid IN :ids",
+        consulta,
+        relevancias,
+        atualizado_em=DateTime
+    )
+
+
+def pesquisar_partes(db: Session, termos: str, limite: int, offset: int = 0) -> List[Dict]:
+    consulta = montar_consulta(termos)
+    relevancias = _ranquear(db, "partes_fts", PESOS_PARTES, consulta, limite, offset)
+
+    return _detalhar(
+        db,
+        "SELECT p.id, p.nome, p.ultima_coleta_em, "
+        "highlight(partes_fts, 0, :inicio, :fim) AS trecho "
+        "FROM partes_fts JOIN partes p ON p.id = partes_fts.rowid "
+        "WHERE partes_fts MATCH :consulta AND partes_fts.rowid IN :ids",
+        consulta,
+        relevancias,
+        ultima_coleta_em=DateTime
+    )
+
+
+def sugerir_partes(db: Session, termo: str, limite: int) -> List[Dict]:
+    chave = chave_nome(termo)
+    if not chave:
+        raise ConsultaInvalidaError(f"Consulta sem termos pesquisáveis: {termo!r}")
+
+    por_prefixo = (
+        db.query(Parte.id, Parte.nome)
+        .filter(Parte.nome_normalizado >= chave, Parte.nome_normalizado < chave + FIM_PREFIXO)
+        .order_by(Parte.nome_normalizado)
+        .limit(limite)
+        .all()
+    )
+    sugestoes = [{"id": id_, "nome": nome, "correspondencia": "prefixo"} for id_, nome in por_prefixo]
+
+    if len(sugestoes) >= limite or len(chave) < MINIMO_TRIGRAMA or not suportado(db.connection()):
+        return sugestoes
+
+    vistos = {sugestao["id"] for sugestao in sugestoes}
+    por_trecho = db.execute(text(
+        "SELECT p.id, p.nome FROM partes_trigrama JOIN partes p ON p.id = partes_trigrama.rowid "
+        "WHERE partes_trigrama MATCH :consulta ORDER BY rank LIMIT :limite"
+    ), {"consulta": '"' + chave.replace('"', '""') + '"', "limite": limite + len(vistos)}).all()
+
+    for id_, nome in por_trecho:
+        if id_ not in vistos and len(sugestoes) < limite:
+            sugestoes.append({"id": id_, "nome": nome, "correspondencia": "trecho"})
+
+    return sugestoes
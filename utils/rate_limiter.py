@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import case, update
+from sqlalchemy.exc import IntegrityError
+
+RATE_LIMIT_INTERVALO = float(os.getenv("RATE_LIMIT_INTERVALO", "0.5"))
+RATE_LIMIT_RAJADA = int(os.getenv("RATE_LIMIT_RAJADA", "1"))
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memoria").lower()
+RATE_LIMIT_CHAVE = "tjmg"
+
+
+class RateLimiter:
+
+    def __init__(self, intervalo_minimo: float = RATE_LIMIT_INTERVALO, rajada: int = RATE_LIMIT_RAJADA):
+        self.intervalo_minimo = intervalo_minimo
+        self.rajada = max(1, rajada)
+        self._lock = threading.Lock()
+        self._fichas = float(self.rajada)
+        self._atualizado = time.monotonic()
+
+    def _reservar(self, fichas: float = 1) -> float:
+        with self._lock:
+            agora = time.monotonic()
+            self._fichas = min(self.rajada, self._fichas + (agora - self._atualizado) / self.intervalo_minimo)
+            self._atualizado = agora
+            self._fichas -= fichas
+            return max(0.0, -self._fichas * self.intervalo_minimo)
+
+    def consumir(self, fichas: float = 1) -> float:
+        if self.intervalo_minimo <= 0:
+            return 0
+        return self._reservar(fichas)
+
+    def aguardar(self) -> float:
+        espera = self.consumir()
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+
+class RateLimiterBanco(RateLimiter):
+
+    def __init__(
+        self,
+        intervalo_minimo: float = RATE_LIMIT_INTERVALO,
+        rajada: int = RATE_LIMIT_RAJADA,
+        session_factory: Optional[Callable] = None,
+        chave: str = RATE_LIMIT_CHAVE
+    ):
+        super().__init__(intervalo_minimo, rajada)
+        if session_factory is None:
+            from config.database import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.chave = chave
+
+    def _reservar(self, fichas: float = 1) -> float:
+        from models import LimiteTaxa
+
+        db = self.session_factory()
+        try:
+            agora = time.time()
+            repostas = LimiteTaxa.fichas + (agora - LimiteTaxa.atualizado_em) / self.intervalo_minimo
+            restantes = db.execute(
+                update(LimiteTaxa)
+                .where(LimiteTaxa.chave == self.chave)
+                .values(
+                    fichas=case((repostas > self.rajada, self.rajada), else_=repostas) - fichas,
+                    atualizado_em=agora
+                )
+                .returning(LimiteTaxa.fichas)
+            ).scalar()
+
+            if restantes is None:
+                restantes = self.rajada - fichas
+                try:
+                    db.add(LimiteTaxa(chave=self.chave, fichas=restantes, atualizado_em=agora))
+                    db.commit()
+                except IntegrityError:
+                    db.rollback()
+                    return self._reservar(fichas)
+            else:
+                db.commit()
+            return max(0.0, -restantes * self.intervalo_minimo)
+        finally:
+            db.close()
+
+
+def criar_rate_limiter(backend: str = RATE_LIMIT_BACKEND) -> RateLimiter:
+    if backend == "banco":
+        return RateLimiterBanco()
+    if backend == "memoria":
+        return RateLimiter()
+    raise ValueError(f"RATE_LIMIT_BACKEND desconhecido: {backend}")
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+
+    if _limiter is None:
+        _limiter = criar_rate_limiter()
+
+    return _limiter
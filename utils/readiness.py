@@ -0,0 +1,66 @@
+import os
+import time
+from typing import Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.eproc_parser import AREA_TABELA_ID, TABELA_CLASSE
+
+TIMEOUT_FORMULARIO = float(os.getenv("TIMEOUT_FORMULARIO", "15"))
+TIMEOUT_RESULTADOS = float(os.getenv("TIMEOUT_RESULTADOS", "20"))
+TIMEOUT_PROCESSOS = float(os.getenv("TIMEOUT_PROCESSOS", "20"))
+INTERVALO_POLL = float(os.getenv("INTERVALO_POLL", "0.2"))
+
+SCRIPT_ESTADO_TABELA = """
+const area = document.getElementById(arguments[0]);
+const tabela = area ? area.getElementsByClassName(arguments[1])[0] : null;
+if (!tabela) return null;
+return [document.readyState, tabela.rows.length, tabela.innerHTML.length];
+"""
+
+SCRIPT_ESTADO_TABELA_ID = """
+const tabela = document.getElementById(arguments[0]);
+if (!tabela) return null;
+return [document.readyState, tabela.rows.length, tabela.innerHTML.length];
+"""
+
+
+def aguardar_elemento(driver, elemento_id: str, timeout: float = TIMEOUT_FORMULARIO):
+    return WebDriverWait(driver, timeout, poll_frequency=INTERVALO_POLL).until(
+        EC.element_to_be_clickable((By.ID, elemento_id))
+    )
+
+
+def aguardar_tabela_estavel(
+    driver,
+    timeout: float,
+    intervalo: float = INTERVALO_POLL,
+    leituras_estaveis: int = 2,
+    tabela_id: Optional[str] = None
+) -> int:
+    limite = time.monotonic() + timeout
+    anterior = None
+    iguais = 0
+
+    while True:
+        if tabela_id:
+            estado = driver.execute_script(SCRIPT_ESTADO_TABELA_ID, tabela_id)
+        else:
+            estado = driver.execute_script(SCRIPT_ESTADO_TABELA, AREA_TABELA_ID, TABELA_CLASSE)
+
+        if estado is not None and estado[0] == "complete":
+            assinatura = tuple(estado[1:])
+            iguais = iguais + 1 if assinatura == anterior else 1
+            anterior = assinatura
+            if iguais >= leituras_estaveis:
+                return assinatura[0]
+        else:
+            anterior = None
+            iguais = 0
+
+        if time.monotonic() + intervalo > limite:
+            raise TimeoutException(f"Tabela não estabilizou em {timeout:.0f}s")
+        time.sleep(intervalo)
@@ -0,0 +1,11 @@
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+
+from utils.metricas import ETAPA_SEGUNDOS
+
+
+class RespostaJSON(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        with ETAPA_SEGUNDOS.labels(etapa="serializar_json").time():
+            return super().render(content)
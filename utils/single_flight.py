@@ -0,0 +1,165 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, TypeVar
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+from config.database import SessionLocal
+from models import Lease
+
+COALESCING_LEASE_SEGUNDOS = int(os.getenv("COALESCING_LEASE_SEGUNDOS", "600"))
+COALESCING_POLL_INTERVALO = float(os.getenv("COALESCING_POLL_INTERVALO", "0.5"))
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class _Chamada:
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+        self.erro: Optional[BaseException] = None
+        self.aguardando = 0
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chamadas: Dict[str, _Chamada] = {}
+
+    def executar(self, chave: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            chamada = self._chamadas.get(chave)
+            lider = chamada is None
+            if lider:
+                chamada = self._chamadas[chave] = _Chamada()
+            else:
+                chamada.aguardando += 1
+
+        if not lider:
+            logger.info("Aguardando consulta em andamento para %s", chave)
+            chamada.evento.wait()
+            if chamada.erro is not None:
+                raise chamada.erro
+            return chamada.resultado
+
+        try:
+            chamada.resultado = fn()
+            return chamada.resultado
+        except BaseException as e:
+            chamada.erro = e
+            raise
+        finally:
+            with self._lock:
+                del self._chamadas[chave]
+            chamada.evento.set()
+
+    def em_andamento(self) -> int:
+        with self._lock:
+            return len(self._chamadas)
+
+
+class LeaseDistribuido:
+
+    def __init__(
+        self,
+        chave: str,
+        session_factory: Callable = SessionLocal,
+        duracao_segundos: int = COALESCING_LEASE_SEGUNDOS
+    ):
+        self.chave = chave
+        self.session_factory = session_factory
+        self.duracao_segundos = duracao_segundos
+        self.dono = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def adquirir(self) -> bool:
+        agora = datetime.utcnow()
+        expira_em = agora + timedelta(seconds=self.duracao_segundos)
+        db = self.session_factory()
+
+        try:
+            db.add(Lease(chave=self.chave, dono=self.dono, expira_em=expira_em))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+        finally:
+            db.close()
+
+        db = self.session_factory()
+        try:
+            assumido = db.execute(
+                update(Lease)
+                .where(Lease.chave == self.chave, Lease.expira_em < agora)
+                .values(dono=self.dono, expira_em=expira_em, criado_em=agora)
+            )
+            db.commit()
+            return assumido.rowcount == 1
+        finally:
+            db.close()
+
+    def liberar(self):
+        db = self.session_factory()
+        try:
+            db.execute(delete(Lease).where(Lease.chave == self.chave, Lease.dono == self.dono))
+            db.commit()
+        finally:
+            db.close()
+
+    def ativo(self) -> bool:
+        db = self.session_factory()
+        try:
+            return db.query(Lease.chave).filter(
+                Lease.chave == self.chave,
+                Lease.expira_em >= datetime.utcnow()
+            ).first() is not None
+        finally:
+            db.close()
+
+    def aguardar_liberacao(self, timeout: float, intervalo: float = COALESCING_POLL_INTERVALO) -> bool:
+        limite = time.monotonic() + timeout
+        while self.ativo():
+            if time.monotonic() >= limite:
+                return False
+            time.sleep(intervalo)
+        return True
+
+
+class Coalescedor:
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        duracao_lease: int = COALESCING_LEASE_SEGUNDOS
+    ):
+        self.session_factory = session_factory
+        self.duracao_lease = duracao_lease
+        self._local = SingleFlight()
+
+    def executar(self, chave: str, fn: Callable[[], T], recuperar: Callable[[], Optional[T]]) -> T:
+        return self._local.executar(chave, lambda: self._executar_com_lease(chave, fn, recuperar))
+
+    def _executar_com_lease(self, chave: str, fn: Callable[[], T], recuperar: Callable[[], Optional[T]]) -> T:
+        lease = LeaseDistribuido(chave, self.session_factory, self.duracao_lease)
+
+        while True:
+            if lease.adquirir():
+                try:
+                    return fn()
+                finally:
+                    lease.liberar()
+
+            logger.info("Consulta para %s em andamento em outro worker", chave)
+            lease.aguardar_liberacao(self.duracao_lease)
+
+            resultado = recuperar()
+            if resultado is not None:
+                return resultado
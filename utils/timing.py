@@ -0,0 +1,44 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List
+
+from utils.metricas import ETAPA_SEGUNDOS
+
+
+class Cronometro:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.etapas: Dict[str, List[float]] = defaultdict(list)
+
+    @contextmanager
+    def medir(self, etapa: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio)
+
+    def registrar(self, etapa: str, duracao: float):
+        with self._lock:
+            self.etapas[etapa].append(duracao)
+        ETAPA_SEGUNDOS.labels(etapa=etapa).observe(duracao)
+
+    def resumo(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                etapa: {
+                    "chamadas": len(duracoes),
+                    "total_ms": round(sum(duracoes) * 1000, 1),
+                    "max_ms": round(max(duracoes) * 1000, 1)
+                }
+                for etapa, duracoes in self.etapas.items()
+            }
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f"{etapa};dur={dados['total_ms']}"
+            for etapa, dados in self.resumo().items()
+        )
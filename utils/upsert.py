@@ -0,0 +1,130 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import bindparam, insert as insert_generico, update
+from sqlalchemy.orm import Session
+
+from models import Processo
+
+UPSERT_LOTE = 500
+
+
+@dataclass
+class ResultadoUpsert:
+    inseridos: List[str] = field(default_factory=list)
+    atualizados: List[str] = field(default_factory=list)
+    inalterados: int = 0
+
+    @property
+    def escritos(self) -> int:
+        return len(self.inseridos) + len(self.atualizados)
+
+    def contagem(self) -> Dict[str, int]:
+        return {
+            "inseridos": len(self.inseridos),
+            "atualizados": len(self.atualizados),
+            "inalterados": self.inalterados
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            **self.contagem(),
+            "numeros_inseridos": self.inseridos,
+            "numeros_atualizados": self.atualizados
+        }
+
+
+def insert_do_dialeto(dialeto: str):
+    if dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    return None
+
+
+def _deduplicar(parte_id: int, processos_data: List[Dict]) -> List[Dict]:
+    por_numero = {}
+    for proc_data in processos_data:
+        linha = {
+            "parte_id": parte_id,
+            "numero_processo": proc_data["numero_processo"],
+            **{campo: proc_data.get(campo) for campo in Processo.CAMPOS_COLETADOS}
+        }
+        linha["hash_conteudo"] = Processo.calcular_hash(linha)
+        por_numero[linha["numero_processo"]] = linha
+    return list(por_numero.values())
+
+
+def upsert_processos(db: Session, parte_id: int, processos_data: List[Dict]) -> ResultadoUpsert:
+    resultado = ResultadoUpsert()
+    linhas = _deduplicar(parte_id, processos_data)
+    if not linhas:
+        return resultado
+
+    existentes = dict(
+        db.query(Processo.numero_processo, Processo.hash_conteudo)
+        .filter(Processo.parte_id == parte_id)
+    )
+
+    novas, alteradas = [], []
+    for linha in linhas:
+        numero = linha["numero_processo"]
+        if numero not in existentes:
+            novas.append(linha)
+            resultado.inseridos.append(numero)
+        elif existentes[numero] != linha["hash_conteudo"]:
+            alteradas.append(linha)
+            resultado.atualizados.append(numero)
+        else:
+            resultado.inalterados += 1
+
+    if novas or alteradas:
+        _gravar(db, novas, alteradas)
+
+    return resultado
+
+
+def _gravar(db: Session, novas: List[Dict], alteradas: List[Dict]):
+    agora = datetime.utcnow()
+    linhas = [{**linha, "criado_em": agora, "atualizado_em": agora} for linha in novas + alteradas]
+    conexao = db.connection()
+
+    insert = insert_do_dialeto(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(Processo)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Processo.parte_id, Processo.numero_processo],
+            set_={
+                **{campo: stmt.excluded[campo] for campo in Processo.CAMPOS_COLETADOS},
+                "hash_conteudo": stmt.excluded.hash_conteudo,
+                "atualizado_em": agora
+            },
+            where=Processo.hash_conteudo.is_distinct_from(stmt.excluded.hash_conteudo)
+        )
+        for inicio in range(0, len(linhas), UPSERT_LOTE):
+            conexao.execute(stmt, linhas[inicio:inicio + UPSERT_LOTE])
+        return
+
+    if novas:
+        conexao.execute(insert_generico(Processo), linhas[:len(novas)])
+
+    if alteradas:
+        colunas = Processo.CAMPOS_COLETADOS + ("hash_conteudo",)
+        stmt = (
+            update(Processo)
+            .where(
+                Processo.parte_id == bindparam("b_parte_id"),
+                Processo.numero_processo == bindparam("b_numero_processo")
+            )
+            .values(
+                **{coluna: bindparam(f"b_{coluna}") for coluna in colunas},
+                atualizado_em=agora
+            )
+        )
+        conexao.execute(stmt, [
+            {f"b_{chave}": valor for chave, valor in linha.items()}
+            for linha in alteradas
+        ])